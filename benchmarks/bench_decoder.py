@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Board decoder benchmark on synthetic scans with realistic noise: sub-pixel
+row jitter and background percentages rounded to 3 or 4 decimals
+(33.333% next to 33.3333%). Compares the old row loop + set() mapping
+against board.decode_grid, for time and for whether the grid came out right.
+
+    python3 benchmarks/bench_decoder.py [--sizes 5 10 20 40 70] [--repeats 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.board import ROW_TOLERANCE_PX, decode_grid
+
+TILE = 64
+
+
+def synthetic_scan(n, rng, tile=TILE):
+    """Shuffled n x n board as the scan script would return it (numbers only)."""
+    homes = list(range(n * n))
+    rng.shuffle(homes)
+    rows = []
+    for slot, home in enumerate(homes):
+        col, row = home % n, home // n
+        pct = lambda k: k / (n - 1) * 100 if n > 1 else 0.0
+        digits = rng.choice((3, 4))
+        rows.append({
+            "element": slot,
+            "rect_x": (slot % n) * (tile + 2) + rng.uniform(-0.4, 0.4),
+            "rect_y": (slot // n) * (tile + 2) + rng.uniform(-0.4, 0.4),
+            "rect_h": tile,
+            "bg_x": round(pct(col), digits),
+            "bg_y": round(pct(row), digits),
+            "home": home,
+        })
+    return rows
+
+
+def legacy_decode(raw):
+    """Old PuzzleSolver.build_pieces + _calculate_grid_targets, numbers only."""
+    pieces = sorted(raw, key=lambda p: p["rect_y"])
+    rows = []
+    current_row = [pieces[0]]
+    current_y = pieces[0]["rect_y"]
+    for p in pieces[1:]:
+        if abs(p["rect_y"] - current_y) < ROW_TOLERANCE_PX:
+            current_row.append(p)
+        else:
+            rows.append(current_row)
+            current_row = [p]
+            current_y = p["rect_y"]
+    rows.append(current_row)
+    ordered = []
+    for r in rows:
+        r.sort(key=lambda p: p["rect_x"])
+        ordered.extend(r)
+
+    x_map = {v: i for i, v in enumerate(sorted(set(p["bg_x"] for p in ordered)))}
+    y_map = {v: i for i, v in enumerate(sorted(set(p["bg_y"] for p in ordered)))}
+    cols = len(x_map)
+    targets = [y_map[p["bg_y"]] * cols + x_map[p["bg_x"]] for p in ordered]
+    return [p["element"] for p in ordered], targets, cols
+
+
+def new_decode(raw):
+    layout = decode_grid([p["rect_x"] for p in raw], [p["rect_y"] for p in raw],
+                         [p["bg_x"] for p in raw], [p["bg_y"] for p in raw],
+                         [p["rect_h"] for p in raw])
+    order = layout.order.tolist()
+    targets = (layout.target_row * layout.cols + layout.target_col)[layout.order].tolist()
+    return [raw[i]["element"] for i in order], targets, layout.cols
+
+
+def correct(raw, n, result):
+    order, targets, cols = result
+    home = {p["element"]: p["home"] for p in raw}
+    return cols == n and order == list(range(n * n)) and targets == [home[e] for e in order]
+
+
+def bench(fn, raw, repeats):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(raw)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20, 40, 70])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(1234)
+
+    print(f"{'board':>7} | {'pieces':>6} | {'legacy ms':>9} | {'legacy ok':>9} | {'numpy ms':>8} | {'numpy ok':>8} | {'decode_grid ms':>14}")
+    print("-" * 82)
+    for n in args.sizes:
+        raw = synthetic_scan(n, rng)
+        t_old, old = bench(legacy_decode, raw, args.repeats)
+        t_new, new = bench(new_decode, raw, args.repeats)
+        # decode_grid alone, on columns already pulled out of the scan rows
+        cols = [np.array([p[k] for p in raw], dtype=float) for k in ("rect_x", "rect_y", "bg_x", "bg_y", "rect_h")]
+        t_core, _ = bench(lambda _: decode_grid(*cols), None, args.repeats)
+        print(f"{n:>3}x{n:<3} | {n * n:>6} | {t_old * 1000:>9.3f} | {str(correct(raw, n, old)):>9} | "
+              f"{t_new * 1000:>8.3f} | {str(correct(raw, n, new)):>8} | {t_core * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Cost per GlobalLogger call in the caller's thread: the old open/append/close
+per line vs the queued logger (INFO lines written, DEBUG lines filtered out),
+with 1 and 8 threads logging at once.
+
+    python3 benchmarks/bench_logger.py [--calls 20000] [--threads 1 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.config import Config
+from src.logger import GlobalLogger
+
+
+def legacy_log(component, message):
+    # What GlobalLogger.log did before: one open/append/close per line
+    timestamp = time.strftime('%H:%M:%S')
+    line = f"[{timestamp}] [{component}] {message}\n"
+    try:
+        with open(Config.LOG_FILE_PATH, "a", encoding="utf-8") as f:
+            f.write(line)
+    except:
+        pass
+
+
+def run(name, fn, calls, threads):
+    per_thread = calls // threads
+
+    def body(tid):
+        for i in range(per_thread):
+            fn("Bench", f"thread {tid} line {i} pairs=12 board=5x5")
+
+    workers = [threading.Thread(target=body, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers: w.start()
+    for w in workers: w.join()
+    elapsed = time.perf_counter() - start
+    us = elapsed / (per_thread * threads) * 1e6
+    print(f"{name:>16} | {threads:>7} | {per_thread * threads:>7} | {us:>10.2f} | {elapsed * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="tb_log_")
+    Config.LOG_FILE_PATH = os.path.join(tmp, "loginfo.txt")
+    Config.LOG_LEVEL = "INFO"
+    GlobalLogger.setup()
+
+    print(f"{'mode':>16} | {'threads':>7} | {'calls':>7} | {'us / call':>10} | {'total ms':>9}")
+    print("-" * 62)
+    for threads in args.threads:
+        run("open-per-line", legacy_log, args.calls, threads)
+        run("queued INFO", GlobalLogger.log, args.calls, threads)
+        run("queued DEBUG off", GlobalLogger.debug, args.calls, threads)
+
+    start = time.perf_counter()
+    GlobalLogger.flush_and_stop(timeout=30)
+    print(f"\nWriter drained the backlog in {(time.perf_counter() - start) * 1000:.0f}ms after the last call; "
+          f"{GlobalLogger.written} lines written, {GlobalLogger.dropped} filtered, {GlobalLogger.rotations} rotations.")
+
+
+if __name__ == "__main__":
+    main()
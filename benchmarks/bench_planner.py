@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Planner benchmark on synthetic shuffled boards.
+Compares the old selection-sort planner (linear scan per slot, rescan every
+25 swaps) against the cycle-decomposition SwapPlan.
+
+    python3 benchmarks/bench_planner.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.planner import SwapPlan, count_cycles
+
+BATCH_SIZE = 25
+SIZES = [4, 6, 8, 10, 15, 20, 25, 30]
+REPEATS = 5
+
+
+def legacy_plan(targets):
+    """Old PuzzleSolver.solve logic: for each slot, scan forward for its piece."""
+    layout = list(targets)
+    swaps = []
+    for i in range(len(layout)):
+        if layout[i] == i: continue
+        for j in range(i + 1, len(layout)):
+            if layout[j] == i:
+                swaps.append((j, i))
+                layout[i], layout[j] = layout[j], layout[i]
+                break
+    return swaps
+
+
+def legacy_scans(n_swaps):
+    # One scan per 25-swap batch, plus the final scan that finds nothing to do
+    return n_swaps // BATCH_SIZE + 1 + (1 if n_swaps % BATCH_SIZE else 0)
+
+
+def cycle_scans(n_swaps):
+    # One scan to plan, one to confirm the board is done
+    return 2 if n_swaps else 1
+
+
+def bench(fn, targets):
+    best = float("inf")
+    result = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn(targets)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    rng = random.Random(1234)
+    print(f"{'board':>7} | {'pieces':>6} | {'legacy ms':>9} | {'cycle ms':>8} | {'swaps old/new':>13} | {'cycles':>6} | {'scans old/new':>13}")
+    print("-" * 82)
+    for size in SIZES:
+        n = size * size
+        targets = list(range(n))
+        rng.shuffle(targets)
+
+        t_old, old = bench(legacy_plan, targets)
+        t_new, plan = bench(lambda t: SwapPlan.from_targets(t), targets)
+        cycles = count_cycles(targets)
+        assert plan.total == n - cycles
+
+        print(f"{size:>3}x{size:<3} | {n:>6} | {t_old * 1000:>9.3f} | {t_new * 1000:>8.3f} | "
+              f"{len(old):>6}/{plan.total:<6} | {cycles:>6} | {legacy_scans(len(old)):>6}/{cycle_scans(plan.total):<6}")
+
+
+if __name__ == "__main__":
+    main()
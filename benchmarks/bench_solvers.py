@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+End-to-end solver benchmark against the local game replicas in
+benchmarks/replica/ (served from localhost, no live site needed).
+
+Runs PuzzleSolver and MemorySolver under headless Chrome the way GameWorker
+drives them (solve until done, then click through "Go next" / the level
+dialog) and reports, per board size: time per level, WebDriver calls per
+level, board scans per level and puzzle swaps per second. Replica
+bookkeeping calls made by this script are not counted. A puzzle level
+should take one scan; more means the board model and the page disagreed
+after a batch (wrong tiles dragged, or drags the page dropped).
+
+--record DIR saves each board's WebDriver traffic (src/replay.py). --replay DIR
+runs the same loop against those recordings without Chrome or the replica
+server: time per level is then Python-side only, and --strict exits non-zero
+when the solvers make calls the recording doesn't have (new round trips) or
+calls that only match a recorded one by command name (reordered / changed).
+
+    python3 benchmarks/bench_solvers.py [--sizes 3 5 8 12] [--pairs 6 8 12] [--levels 3]
+                                        [--backend w3c_batch] [--games puzzle memory]
+                                        [--record DIR | --replay DIR [--strict]]
+"""
+import argparse
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+
+from src import metrics
+from src.browser import resolve_driver_path
+from src.config import Config
+from src.memory import MemorySolver
+from src.puzzle import PuzzleSolver
+from src.replay import record, replay_driver
+from src.state import GamePhase, probe_state
+from src.transport import instrument
+
+REPLICA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replica")
+LEVEL_TIMEOUT = 120
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_replicas():
+    handler = functools.partial(QuietHandler, directory=REPLICA_DIR)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+def launch():
+    options = Options()
+    if Config.get_chrome_path():
+        options.binary_location = Config.CHROME_BINARY_PATH
+    w, h = Config.HEADLESS_WINDOW_SIZE
+    options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={w},{h}")
+    options.add_argument("--force-device-scale-factor=0.80")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"--user-data-dir={tempfile.mkdtemp(prefix='tb_bench_')}")
+    driver_path, _ = resolve_driver_path()
+    return webdriver.Chrome(service=Service(driver_path), options=options)
+
+
+class Session:
+    """One driver per board: live Chrome (optionally recorded) or a replay."""
+    def __init__(self, args, name):
+        self.recorder = None
+        self.replay = bool(args.replay)
+        if self.replay:
+            self.driver = replay_driver(os.path.join(args.replay, f"{name}.jsonl"))
+            return
+        self.driver = launch()
+        if args.record:
+            os.makedirs(args.record, exist_ok=True)
+            self.recorder = record(self.driver, os.path.join(args.record, f"{name}.jsonl"))
+
+    def close(self):
+        self.driver.quit()
+        if self.recorder:
+            self.recorder.close()
+        return self.driver.command_executor.report() if self.replay else None
+
+
+class Harness:
+    """Replica reads/clicks that shouldn't count as solver traffic."""
+    def __init__(self, driver, stats):
+        self.driver = driver
+        self.stats = stats
+        self.calls = 0
+
+    def _counted(self, fn, *args):
+        before = self.stats.count
+        try:
+            return fn(*args)
+        finally:
+            self.calls += self.stats.count - before
+
+    def replica(self):
+        return self._counted(self.driver.execute_script, "return window.__replica")
+
+    def click_go_next(self):
+        # Same lookup as GameWorker._check_puzzle_next
+        def click():
+            for btn in self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Go next')]"):
+                if btn.is_displayed():
+                    self.driver.execute_script("arguments[0].click();", btn)
+                    return True
+            return False
+        return self._counted(click)
+
+    def solver_calls(self, since):
+        return self.stats.count - since - self.calls
+
+
+def scans(wm):
+    hist = wm.histograms.get(("scan_seconds", ()))
+    return hist.count if hist else 0
+
+
+def run_levels(name, size, driver, stats, step, advance):
+    """step() = one solver turn; advance() = click through to the next level. Returns per-level rows."""
+    harness = Harness(driver, stats)
+    wm = metrics.WorkerMetrics()
+    metrics.bind(wm) # the solvers report their scans through metrics.current()
+    rows = []
+    state = harness.replica()
+    while not state["done"]:
+        level = state["level"]
+        started, calls0, scans0, harness.calls = time.perf_counter(), stats.count, scans(wm), 0
+        swaps0 = state.get("swaps", 0)
+        deadline = time.time() + LEVEL_TIMEOUT
+        replayed = getattr(driver.command_executor, "exhausted", None) is not None
+        while time.time() < deadline:
+            if not step() and advance(harness):
+                break
+            if replayed and driver.command_executor.exhausted:
+                break # diverged from the recording, nothing left to answer with
+        elapsed = time.perf_counter() - started
+        state = harness.replica()
+        if state["level"] == level and not state["done"]:
+            print(f"{name:>7} | {size:>5} | level {level} did not finish")
+            break
+        rows.append((level, elapsed, harness.solver_calls(calls0), state.get("swaps", 0) - swaps0, scans(wm) - scans0))
+    metrics.bind(metrics.NULL)
+    return rows
+
+
+def bench_puzzle(args, base):
+    results = []
+    for n in args.sizes:
+        session = Session(args, f"puzzle_{n}")
+        driver = session.driver
+        try:
+            stats = instrument(driver)
+            driver.get(f"{base}/puzzle.html?n={n}&levels={args.levels}&seed={n}")
+            solver = PuzzleSolver(driver, args.backend)
+
+            def advance(harness):
+                if not harness.click_go_next():
+                    return False
+                solver.reset() # like GameWorker on ADVANCE
+                return True
+
+            rows = run_levels(
+                "puzzle", f"{n}x{n}", driver, stats,
+                step=lambda: solver.solve(),
+                advance=advance)
+        finally:
+            replayed = session.close()
+        results.append(("puzzle", f"{n}x{n}", rows, replayed))
+    return results
+
+
+def bench_memory(args, base):
+    results = []
+    for pairs in args.pairs:
+        session = Session(args, f"memory_{pairs}")
+        driver = session.driver
+        try:
+            stats = instrument(driver)
+            driver.get(f"{base}/memory.html?pairs={pairs}&levels={args.levels}&seed={pairs}")
+            solver = MemorySolver(SimpleNamespace(driver=driver))
+
+            def step():
+                # One turn = scan + match every visible pair, like GameWorker's SOLVE state
+                return probe_state(driver) == GamePhase.PLAYING and solver.solve_level()
+
+            def advance(_):
+                return solver.wait_for_next_level()
+
+            rows = run_levels("memory", f"{pairs * 2}", driver, stats, step, advance)
+        finally:
+            replayed = session.close()
+        results.append(("memory", f"{pairs * 2} cards", rows, replayed))
+    return results
+
+
+def report(results):
+    print(f"{'game':>7} | {'board':>9} | {'levels':>6} | {'s/level':>8} | {'calls/level':>11} | {'scans/level':>11} | {'swaps/level':>11} | {'swaps/s':>8}")
+    print("-" * 92)
+    for game, size, rows, _ in results:
+        if not rows:
+            print(f"{game:>7} | {size:>9} | no completed levels")
+            continue
+        t = sum(r[1] for r in rows)
+        calls = sum(r[2] for r in rows)
+        swaps = sum(r[3] for r in rows)
+        scanned = sum(r[4] for r in rows)
+        sps = f"{swaps / t:8.1f}" if game == "puzzle" and t > 0 else f"{'-':>8}"
+        swaps_col = f"{swaps / len(rows):11.1f}" if game == "puzzle" else f"{'-':>11}"
+        print(f"{game:>7} | {size:>9} | {len(rows):>6} | {t / len(rows):8.2f} | {calls / len(rows):11.1f} | {scanned / len(rows):11.1f} | {swaps_col} | {sps}")
+
+    replays = [(game, size, r) for game, size, _, r in results if r]
+    if replays:
+        print("\nreplay: calls / recorded / loose (params differ) / unrecorded (new round trips) / unused")
+        for game, size, r in replays:
+            print(f"{game:>7} | {size:>9} | {r['calls']:>6} | {r['recorded']:>6} | {r['loose']:>6} | "
+                  f"{r['unrecorded']:>6} | {r['unused']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", nargs="+", default=["puzzle", "memory"], choices=["puzzle", "memory"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 5, 8, 12], help="puzzle grid sides")
+    parser.add_argument("--pairs", type=int, nargs="+", default=[6, 8, 12], help="memory pairs per board")
+    parser.add_argument("--levels", type=int, default=3)
+    parser.add_argument("--backend", default=Config.PUZZLE_INPUT_BACKEND, help="puzzle input backend")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="DIR", help="save WebDriver traffic per board")
+    mode.add_argument("--replay", metavar="DIR", help="replay saved traffic instead of running Chrome")
+    parser.add_argument("--strict", action="store_true", help="with --replay: fail on unrecorded or loosely matched calls")
+    args = parser.parse_args()
+
+    httpd, base = (None, "http://replica") if args.replay else serve_replicas()
+    try:
+        results = []
+        if "puzzle" in args.games:
+            results += bench_puzzle(args, base)
+        if "memory" in args.games:
+            results += bench_memory(args, base)
+        print(f"\nbackend: {args.backend}, memory click mode: {Config.MEMORY_CLICK_MODE}"
+              f"{', replayed (Python-side time only)' if args.replay else ''}\n")
+        report(results)
+    finally:
+        if httpd: httpd.shutdown()
+
+    if args.strict and any(r and (r["unrecorded"] or r["loose"]) for *_, r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
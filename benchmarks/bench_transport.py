@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Per-command WebDriver latency, default transport vs pooled keep-alive transport,
+with 1, 8 and 32 concurrent workers (one headless Chrome per worker, like GameWorker).
+
+Each worker runs a chatty loop (execute_script + find_elements + element reads)
+against about:blank while a second thread on the same driver polls a cheap
+script, the way the dashboard/watchdog side does.
+
+    python3 benchmarks/bench_transport.py [--workers 1 8 32] [--commands 300]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from webdriver_manager.chrome import ChromeDriverManager
+
+from src.config import Config
+from src.transport import apply_pooled_transport, instrument
+
+PAGE = "data:text/html," + "".join(f"<div class='c'>{i}</div>" for i in range(50))
+
+
+def launch(driver_path, profile_dir):
+    options = Options()
+    if Config.get_chrome_path():
+        options.binary_location = Config.CHROME_BINARY_PATH
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    return webdriver.Chrome(service=Service(driver_path), options=options)
+
+
+def chatty_loop(driver, commands, stop):
+    done = 0
+    while done < commands and not stop.is_set():
+        driver.execute_script("return document.querySelectorAll('.c').length")
+        els = driver.find_elements(By.CSS_SELECTOR, ".c")
+        els[done % len(els)].get_attribute("class")
+        done += 3
+
+
+def side_poller(driver, stop):
+    while not stop.is_set():
+        try:
+            driver.execute_script("return 1")
+        except Exception:
+            return
+        time.sleep(0.05)
+
+
+def run(mode, workers, commands, driver_path):
+    tmp = tempfile.mkdtemp(prefix="tb_bench_")
+    drivers = []
+    try:
+        for i in range(workers):
+            d = launch(driver_path, os.path.join(tmp, f"p{i}"))
+            if mode == "pooled":
+                apply_pooled_transport(d, Config.DRIVER_POOL_SIZE, Config.DRIVER_COMMAND_TIMEOUT)
+            d.get(PAGE)
+            drivers.append((d, instrument(d)))
+
+        stop = threading.Event()
+        threads = []
+        for d, _ in drivers:
+            threads.append(threading.Thread(target=chatty_loop, args=(d, commands, stop)))
+            threads.append(threading.Thread(target=side_poller, args=(d, stop), daemon=True))
+        start = time.perf_counter()
+        for t in threads: t.start()
+        for t in threads[::2]: t.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+
+        lat = sorted(x for _, s in drivers for x in s.recent)
+        total = sum(s.count for _, s in drivers)
+        p = lambda q: lat[min(len(lat) - 1, int(q / 100 * (len(lat) - 1)))] * 1000 if lat else 0.0
+        print(f"{mode:>8} | {workers:>7} | {total:>8} | {p(50):>8.2f} | {p(95):>8.2f} | {p(99):>8.2f} | {total / elapsed:>9.0f}")
+    finally:
+        for d, _ in drivers:
+            try: d.quit()
+            except Exception: pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--commands", type=int, default=300, help="commands per worker")
+    args = parser.parse_args()
+
+    driver_path = ChromeDriverManager().install()
+    print(f"{'mode':>8} | {'workers':>7} | {'commands':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'cmds/s':>9}")
+    print("-" * 74)
+    for workers in args.workers:
+        for mode in ("default", "pooled"):
+            run(mode, workers, args.commands, driver_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,16 @@ import threading
 import select
 import time
 from .config import Config
-from .worker import GameWorker
+from .logger import GlobalLogger
+from .resources import format_usage
 
 class App:
     def __init__(self):
         self.workers = []
         self.next_worker_id = 1
+        self.supervisor = None
+        self.startup_summary = None
+        self.metrics_server = None
         
     def clear_screen(self):
         print("\033[H\033[J", end="") 
@@ -21,17 +25,34 @@ class App:
             print("       COMMAND CENTER v3.3 - AUTO DASHBOARD (10s)")
             print("="*50)
             print(f" ACTIVE WORKERS: {len(self.workers)}")
+            if self.startup_summary:
+                print(f" {self.startup_summary}")
             print("-" * 50)
             
             if not self.workers:
                 print(" [No active workers]")
             else:
+                fleet_mb = fleet_cpu = 0.0
                 for w in self.workers:
                     status_str = w.status
                     if "RUNNING" in status_str: status_str = f"\033[92m{status_str}\033[0m"
                     elif "ERROR" in status_str: status_str = f"\033[91m{status_str}\033[0m"
                     
                     print(f" [ID: {w.worker_id}] {w.game_type:<8} | {w.difficulty:<8} | Solved: {w.items_solved:<3} | {status_str}")
+                    print(f"          time: {w.state_breakdown()}")
+                    if hasattr(w, "pacer"):
+                        print(f"          pacing: {w.pacer.summary()}")
+                    if Config.NETWORK_FILTER and hasattr(w, "netstats"):
+                        print(f"          {w.netstats.summary()}")
+                    if hasattr(w, "resource_usage"):
+                        usage = w.resource_usage()
+                        print(f"          {format_usage(usage)}")
+                        if usage:
+                            share = usage.get("shared", 1)
+                            fleet_mb += usage["rss_mb"] / share
+                            fleet_cpu += usage["cpu"] / share
+                if fleet_mb:
+                    print(f" FLEET: mem {fleet_mb:.0f}MB | cpu {fleet_cpu:.0f}% ({Config.BROWSER_PROFILE})")
             
             print("-" * 50)
             print(" [A] Add Puzzle Worker")
@@ -83,15 +104,61 @@ class App:
         
         self.spawn_worker(game_type="PUZZLE", difficulty=diff)
 
-    def spawn_worker(self, game_type, difficulty):
-        print(f"Launching Worker {self.next_worker_id} ({game_type} - {difficulty})...")
+    def spawn_worker(self, game_type, difficulty, quiet=False):
+        if not quiet:
+            print(f"Launching Worker {self.next_worker_id} ({game_type} - {difficulty})...")
         
-        worker = GameWorker(worker_id=self.next_worker_id, game_type=game_type, difficulty=difficulty)
-        worker.start()
+        if Config.WORKER_ENGINE == "async":
+            from .engine import AsyncEngine
+            worker = AsyncEngine.instance().spawn(self.next_worker_id, game_type, difficulty)
+        elif Config.WORKER_ENGINE == "process":
+            if self.supervisor is None:
+                from .supervisor import ProcessSupervisor
+                self.supervisor = ProcessSupervisor()
+            worker = self.supervisor.spawn(self.next_worker_id, game_type, difficulty)
+        else:
+            from .worker import GameWorker # pulls in Selenium, so only on first use
+            worker = GameWorker(worker_id=self.next_worker_id, game_type=game_type, difficulty=difficulty)
+            worker.start()
         
         self.workers.append(worker)
         self.next_worker_id += 1
-        time.sleep(1) # Visual feedback
+        return worker
+
+    def launch_fleet(self):
+        """Starts Config.STARTUP_WORKERS concurrently and prints where the time went."""
+        t0 = time.perf_counter()
+        if Config.WORKER_ENGINE == "thread":
+            from .worker import GameWorker # noqa: F401 -- timed on its own below
+        imports = time.perf_counter() - t0
+
+        fleet = [self.spawn_worker(g, d, quiet=True) for g, d in Config.STARTUP_WORKERS]
+        print(f"Launching {len(fleet)} workers (max {Config.LAUNCH_CONCURRENCY} Chromes at once)...")
+
+        # Only thread workers report readiness; other engines start in the background
+        tracked = [w for w in fleet if hasattr(w, "ready_after")]
+        deadline = time.time() + Config.PAGE_LOAD_TIMEOUT + 30 * (1 + len(tracked) // Config.LAUNCH_CONCURRENCY)
+        while time.time() < deadline and any(w.ready_after is None and w.is_running for w in tracked):
+            time.sleep(0.1)
+        total = time.perf_counter() - t0
+
+        lines = [f"Startup: {len(fleet)} workers in {total:.1f}s (imports {imports:.2f}s, concurrency {Config.LAUNCH_CONCURRENCY})"]
+        for w in tracked:
+            t = w.browser.timings
+            if w.ready_after is None:
+                lines.append(f"  [ID {w.worker_id}] {w.game_type:<8} not ready ({w.status})")
+                continue
+            parts = []
+            if "profile" in t: parts.append(f"profile {t['profile']:.2f}s")
+            if "driver" in t: parts.append(f"driver {t['driver']:.2f}s ({'cached' if t['driver_cached'] else 'resolved'})")
+            if "queued" in t: parts.append(f"queued {t['queued']:.2f}s")
+            if "chrome" in t: parts.append(f"chrome {t['chrome']:.2f}s")
+            lines.append(f"  [ID {w.worker_id}] {w.game_type:<8} ready {w.ready_after:.2f}s | " + " | ".join(parts or ["pooled"]))
+
+        for line in lines:
+            print(line)
+            GlobalLogger.log("Startup", line.strip())
+        self.startup_summary = lines[0]
 
     def stop_worker_menu(self):
         if not self.workers:
@@ -119,6 +186,15 @@ class App:
     def run(self):
         try:
             Config.validate()
+            if Config.METRICS_ENABLED:
+                from .metrics import MetricsServer
+                self.metrics_server = MetricsServer()
+                self.metrics_server.start()
+            if Config.POOL_SIZE > 0 and Config.WORKER_ENGINE == "thread":
+                from .pool import BrowserPool
+                BrowserPool.instance() # start warming before the first worker is added
+            if Config.STARTUP_WORKERS:
+                self.launch_fleet()
             self.home_menu()
         except KeyboardInterrupt:
             self.clean_up()
@@ -130,4 +206,17 @@ class App:
         for w in self.workers:
             w.stop()
         self.workers.clear()
+        if Config.WORKER_ENGINE == "async":
+            from .engine import AsyncEngine
+            if AsyncEngine.running():
+                AsyncEngine.instance().shutdown()
+        if self.supervisor:
+            self.supervisor.shutdown()
+            self.supervisor = None
+        from .pool import BrowserPool
+        if BrowserPool.running():
+            BrowserPool.instance().shutdown()
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
         print("Clean up complete.")
@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+from typing import List
+import numpy as np
+
+# Fallback row tolerance when the scan has no piece heights
+ROW_TOLERANCE_PX = 15
+# Row tolerance as a fraction of the median piece height
+ROW_TOLERANCE_FRACTION = 0.5
+# Fallback background-position tolerance (percent) when the grid size can't be inferred
+BG_TOLERANCE_PCT = 0.5
+
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+# Reads the board in the same visual order as PuzzleSolver.scan_board
+# (same filters, same gap-based row grouping) and hashes the background-position
+# strings with 32-bit FNV-1a. Returns a single number.
+CHECKSUM_SCRIPT = """
+const tol = arguments[0];
+const items = [];
+for (const div of document.querySelectorAll('div[style*="background-position"]')) {
+    if (div.offsetParent === null) continue;
+    const rect = div.getBoundingClientRect();
+    if (rect.width < 10 || rect.height < 10) continue;
+    const bg = div.style.backgroundPosition;
+    if (!bg) continue;
+    items.push({x: rect.x + window.scrollX, y: rect.y + window.scrollY, bg: bg});
+}
+items.sort((a, b) => a.y - b.y);
+
+const ordered = [];
+let row = [];
+let prevY = null;
+for (const it of items) {
+    if (prevY === null || it.y - prevY < tol) {
+        row.push(it);
+    } else {
+        row.sort((a, b) => a.x - b.x);
+        ordered.push(...row);
+        row = [it];
+    }
+    prevY = it.y;
+}
+row.sort((a, b) => a.x - b.x);
+ordered.push(...row);
+
+let h = 0x811C9DC5;
+const text = ordered.map(it => it.bg).join('|');
+for (let i = 0; i < text.length; i++) {
+    h = Math.imul(h ^ text.charCodeAt(i), 0x01000193) >>> 0;
+}
+return h;
+"""
+
+
+def gap_clusters(values, k=None, tol=None):
+    """
+    1-D clustering: sort, then start a new cluster wherever the gap to the
+    previous value is >= tol. Labels are numbered in ascending value order.
+    Without a tol, it's half the (k-1)th largest gap, i.e. the smallest gap
+    that still separates k clusters; rounding noise sits far below that.
+    Returns (labels, cluster count, tol used).
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return np.zeros(0, dtype=np.int64), 0, tol
+    order = np.argsort(values)
+    gaps = np.diff(values[order])
+    if tol is None:
+        if not k or k <= 1 or gaps.size < k - 1:
+            tol = np.inf
+        else:
+            cut = gaps.size - (k - 1)
+            tol = max(np.partition(gaps, cut)[cut] / 2, 1e-9)
+    sorted_labels = np.empty(values.size, dtype=np.int64)
+    sorted_labels[0] = 0
+    np.cumsum(gaps >= tol, out=sorted_labels[1:])
+    labels = np.empty_like(sorted_labels)
+    labels[order] = sorted_labels
+    return labels, int(sorted_labels[-1]) + 1, tol
+
+
+@dataclass
+class GridLayout:
+    order: np.ndarray # scan indices in visual order (rows top-down, left-right within a row)
+    target_col: np.ndarray # per scan index
+    target_row: np.ndarray
+    rows: int
+    cols: int
+    row_tol: float # px, also what CHECKSUM_SCRIPT has to group with
+    exact: bool # rows * cols == pieces and the background clusters agree
+
+
+def decode_grid(xs, ys, bg_x, bg_y, heights=None) -> GridLayout:
+    """
+    Vectorized board decoder.
+    Visual rows come from clustering the piece tops (tolerance = half the
+    median piece height), the grid size from pieces / rows, and target
+    columns/rows from clustering the background percentages into that many
+    groups, so 33.333 and 33.3333 land in the same column.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    n = xs.size
+    row_tol = float(ROW_TOLERANCE_PX)
+    if heights is not None and n:
+        h = float(np.median(heights))
+        if h > 0: row_tol = h * ROW_TOLERANCE_FRACTION
+
+    row_labels, rows, _ = gap_clusters(ys, tol=row_tol)
+    # One argsort on (row, x) folded into a single key, cheaper than lexsort
+    if n:
+        span = xs.max() - xs.min() + 1
+        order = np.argsort(row_labels * span + (xs - xs.min()))
+    else:
+        order = np.zeros(0, dtype=np.int64)
+
+    cols = n // rows if rows else 0
+    exact = rows > 0 and rows * cols == n
+    if exact:
+        target_col, n_cols, _ = gap_clusters(bg_x, k=cols)
+        target_row, n_rows, _ = gap_clusters(bg_y, k=rows)
+        exact = n_cols == cols and n_rows == rows
+    if not exact:
+        # Odd piece count (overlay, half-rendered board): fixed tolerance instead
+        target_col, n_cols, _ = gap_clusters(bg_x, tol=BG_TOLERANCE_PCT)
+        target_row, n_rows, _ = gap_clusters(bg_y, tol=BG_TOLERANCE_PCT)
+        rows, cols = n_rows, n_cols
+    return GridLayout(order, target_col, target_row, rows, cols, row_tol, exact)
+
+
+def fnv1a(text: str) -> int:
+    h = FNV_OFFSET
+    for ch in text:
+        h = ((h ^ ord(ch)) * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+class BoardModel:
+    """
+    Python-side copy of the puzzle board (slot -> piece), kept in sync by
+    applying our own swaps instead of rescanning the DOM after every batch.
+    A swap moves the two tile elements (the game reorders the nodes), so a
+    piece keeps its element and its bg_position wherever it goes.
+    """
+    def __init__(self, pieces: List, row_tol: float = ROW_TOLERANCE_PX):
+        self.pieces = list(pieces)
+        self.cols = max(p.target_col for p in self.pieces) + 1 if self.pieces else 0
+        self.row_tol = row_tol
+
+    def targets(self) -> List[int]:
+        return [p.target_row * self.cols + p.target_col for p in self.pieces]
+
+    def apply_swap(self, a: int, b: int):
+        self.pieces[a], self.pieces[b] = self.pieces[b], self.pieces[a]
+
+    def checksum(self) -> int:
+        return fnv1a("|".join(p.bg_position for p in self.pieces))
+
+    def matches(self, driver) -> bool:
+        """One small execute_script: does the page still look like our model?"""
+        try:
+            page_hash = driver.execute_script(CHECKSUM_SCRIPT, self.row_tol)
+        except Exception:
+            return False
+        return page_hash == self.checksum()
+
+    def __len__(self):
+        return len(self.pieces)
@@ -1,17 +1,62 @@
 import shutil
 import os
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import threading
+import time
 from .config import Config
+from .resources import TreeSampler
+# Selenium / webdriver_manager / urllib3 are imported inside start() so the
+# dashboard comes up without paying for them.
+
+# Caps how many Chromes start at the same time (a fleet launch would otherwise thrash the CPU)
+_launch_slots = threading.BoundedSemaphore(Config.LAUNCH_CONCURRENCY)
+_driver_lock = threading.Lock()
+_driver_path = None
+
+
+def resolve_driver_path(refresh=False):
+    """
+    Chromedriver path, resolved once and persisted in Config.DRIVER_CACHE_FILE.
+    ChromeDriverManager (version check, maybe network) only runs when there is
+    no cached binary on disk or the cached one failed to start Chrome.
+    Returns (path, cached).
+    """
+    global _driver_path
+    with _driver_lock:
+        if not refresh:
+            if _driver_path and os.path.exists(_driver_path):
+                return _driver_path, True
+            try:
+                with open(Config.DRIVER_CACHE_FILE, encoding="utf-8") as f:
+                    path = f.read().strip()
+                if path and os.path.exists(path):
+                    _driver_path = path
+                    return path, True
+            except OSError:
+                pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        _driver_path = ChromeDriverManager().install()
+        try:
+            with open(Config.DRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+                f.write(_driver_path)
+        except OSError:
+            pass
+        return _driver_path, False
+
 
 class BrowserManager:
     def __init__(self, worker_id=1):
         self.worker_id = worker_id
         self.driver = None
         self.profile_prepared = False
+        self.command_stats = None
+        self.warm_url = None # set by BrowserPool when parked on a game page
+        self.timings = {} # startup breakdown: profile / driver / queued / chrome
+        self.sampler = None
+        self.net_filtered = None # game type whose block list is on the window
+        self.recorder = None
+        self.deadlines = None
         self.setup_logging()
 
     def setup_logging(self):
@@ -83,6 +128,7 @@ class BrowserManager:
             return False
 
     def get_options(self):
+        from selenium.webdriver.chrome.options import Options
         options = Options()
         options.binary_location = Config.CHROME_BINARY_PATH
         
@@ -95,10 +141,22 @@ class BrowserManager:
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
+        if Config.NETWORK_FILTER:
+            # Network events only: netfilter.py counts blocked/loaded requests from these
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
         
         options.add_argument("--remote-allow-origins=*")
         options.add_argument("--disable-infobars")
-        options.add_argument("--start-maximized")
+        headless = Config.BROWSER_PROFILE == "headless"
+        if headless:
+            # Fixed geometry instead of "maximized", so card/piece coordinates
+            # (and the coordinate dedup in memory.py) match the headed layout
+            w, h = Config.HEADLESS_WINDOW_SIZE
+            options.add_argument("--headless=new")
+            options.add_argument(f"--window-size={w},{h}")
+        else:
+            options.add_argument("--start-maximized")
         
         # KEY LINUX FIXES
         options.add_argument("--no-sandbox")
@@ -111,7 +169,11 @@ class BrowserManager:
         options.add_argument("--disable-renderer-backgrounding")
         
         # New "God Mode" Background Flags
-        options.add_argument("--disable-features=CalculateNativeWinOcclusion,IsolateOrigins,site-per-process")
+        # (Chrome only honours the last --disable-features, so everything goes in one list)
+        disabled = ["CalculateNativeWinOcclusion", "IsolateOrigins", "site-per-process"]
+        if headless:
+            disabled += ["Translate", "MediaRouter", "OptimizationHints", "AutofillServerCommunication"]
+        options.add_argument(f"--disable-features={','.join(disabled)}")
         options.add_argument("--disable-visibility-tracking")
         options.add_argument("--window-position=0,0") # Ensure not off-screen considered hidden
         
@@ -121,6 +183,16 @@ class BrowserManager:
         options.add_argument("--force-device-scale-factor=0.80")
         options.add_argument("--high-dpi-support=1")
         
+        if headless:
+            # LOW FOOTPRINT: no audio, no background services, no extensions
+            # (the keepalive extension only matters for visible windows)
+            for flag in ("--mute-audio", "--disable-extensions", "--disable-component-update",
+                         "--disable-background-networking", "--disable-sync", "--disable-default-apps",
+                         "--disable-breakpad", "--metrics-recording-only", "--no-pings",
+                         "--renderer-process-limit=2"):
+                options.add_argument(flag)
+            return options
+
         # KEEPALIVE EXTENSION (The Nuclear Option)
         ext_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "extension"))
         if os.path.exists(ext_path):
@@ -128,14 +200,54 @@ class BrowserManager:
             
         return options
 
+    def _launch(self, options, driver_path):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        return webdriver.Chrome(service=Service(driver_path), options=options)
+
+    def recording_path(self, directory):
+        return os.path.join(directory, f"worker_{self.worker_id}.jsonl")
+
     def start(self):
+        from .transport import instrument, apply_pooled_transport, apply_deadlines
+        if Config.WEBDRIVER_REPLAY_DIR:
+            return self._start_replay()
         try:
             self.logger.info("Initializing Browser...")
+            t = time.perf_counter()
             self.prepare_profile()
+            self.timings["profile"] = time.perf_counter() - t
+
+            t = time.perf_counter()
             options = self.get_options()
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
+            driver_path, cached = resolve_driver_path()
+            self.timings["driver"] = time.perf_counter() - t
+            self.timings["driver_cached"] = cached
+
+            t = time.perf_counter()
+            with _launch_slots:
+                self.timings["queued"] = time.perf_counter() - t
+                t = time.perf_counter()
+                try:
+                    self.driver = self._launch(options, driver_path)
+                except Exception as e:
+                    if not cached: raise
+                    # Chrome probably updated under the cached driver: resolve again once
+                    self.logger.info(f"Cached driver failed ({str(e)[:60]}), refreshing...")
+                    driver_path, _ = resolve_driver_path(refresh=True)
+                    self.driver = self._launch(options, driver_path)
+                self.timings["chrome"] = time.perf_counter() - t
+
+            if Config.DRIVER_TRANSPORT == "pooled":
+                if apply_pooled_transport(self.driver, Config.DRIVER_POOL_SIZE, Config.DRIVER_COMMAND_TIMEOUT) \
+                        and Config.COMMAND_DEADLINE:
+                    self.deadlines = apply_deadlines(self.driver, Config.COMMAND_DEADLINE)
+            self.command_stats = instrument(self.driver)
+            if Config.WEBDRIVER_RECORD_DIR:
+                from .replay import record
+                os.makedirs(Config.WEBDRIVER_RECORD_DIR, exist_ok=True)
+                self.recorder = record(self.driver, self.recording_path(Config.WEBDRIVER_RECORD_DIR))
+            self.sampler = TreeSampler(self.driver.service.process.pid)
             self.driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
             
             # Position windows nicely?
@@ -148,18 +260,59 @@ class BrowserManager:
             self.logger.error(f"Failed start: {e}")
             return False
 
+    def _start_replay(self):
+        from .replay import replay_driver
+        from .transport import instrument
+        path = self.recording_path(Config.WEBDRIVER_REPLAY_DIR)
+        try:
+            self.driver = replay_driver(path)
+        except Exception as e:
+            self.logger.error(f"Failed replay start ({path}): {e}")
+            return False
+        self.command_stats = instrument(self.driver)
+        self.logger.info(f"Replaying {path} (no Chrome).")
+        return True
+
     def stop(self):
         if self.driver:
             logging.getLogger("urllib3").setLevel(logging.CRITICAL)
             logging.getLogger("selenium").setLevel(logging.CRITICAL)
+            driver, self.driver = self.driver, None
             try:
-                self.driver.quit()
+                driver.quit()
             except:
                 pass
-            self.driver = None
+            if self.recorder:
+                self.recorder.close()
+                self.recorder = None
+            if self.sampler and self.sampler.peak_rss:
+                self.logger.info(f"Peak process-tree RSS: {self.sampler.peak_rss / 2**20:.0f}MB")
+            if self.command_stats:
+                self.logger.info(f"WebDriver transport ({Config.DRIVER_TRANSPORT}): {self.command_stats.summary()}")
+            if Config.WEBDRIVER_REPLAY_DIR:
+                self.logger.info(f"Replay: {driver.command_executor.summary()}")
             self.logger.info("Browser Closed.")
 
+    def resource_usage(self):
+        """RSS / CPU of chromedriver + the Chrome tree behind it (see resources.py)."""
+        if not self.driver or not self.sampler:
+            return None
+        return self.sampler.sample()
+
     def navigate_to(self, url):
         if self.driver:
             self.driver.get(url)
 
+    def reopen_window(self):
+        """Moves to a fresh window and closes the old one (a hung renderer goes with it)."""
+        driver = self.driver
+        old = driver.current_window_handle
+        driver.switch_to.new_window("window")
+        new = driver.current_window_handle
+        try:
+            driver.switch_to.window(old)
+            driver.close()
+        except Exception:
+            pass
+        driver.switch_to.window(new)
+        self.net_filtered = None # the block list was on the old target
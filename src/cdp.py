@@ -0,0 +1,144 @@
+import asyncio
+import itertools
+import json
+from .logger import GlobalLogger
+
+
+class CDPError(Exception):
+    pass
+
+
+class CDPConnection:
+    """
+    Minimal asyncio Chrome DevTools Protocol client over the browser websocket.
+    One connection per Chrome; page targets are multiplexed on it as flat
+    sessions (Target.attachToTarget with flatten=True).
+    """
+    def __init__(self, ws_url):
+        self.ws_url = ws_url
+        self.ws = None
+        self.ids = itertools.count(1)
+        self.pending = {} # id -> Future
+        self.listeners = {} # (session_id, method) -> [callbacks]
+        self.reader = None
+
+    async def connect(self):
+        import websockets # Only the async engine needs it
+        self.ws = await websockets.connect(self.ws_url, max_size=None, ping_interval=None)
+        self.reader = asyncio.get_running_loop().create_task(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            async for raw in self.ws:
+                msg = json.loads(raw)
+                if "id" in msg:
+                    fut = self.pending.pop(msg["id"], None)
+                    if fut and not fut.done():
+                        if "error" in msg:
+                            fut.set_exception(CDPError(msg["error"].get("message", str(msg["error"]))))
+                        else:
+                            fut.set_result(msg.get("result", {}))
+                    continue
+                for cb in self.listeners.get((msg.get("sessionId"), msg.get("method")), []):
+                    try:
+                        cb(msg.get("params", {}))
+                    except Exception as e:
+                        GlobalLogger.log("CDP", f"Listener error on {msg.get('method')}: {e}")
+        except Exception as e:
+            GlobalLogger.log("CDP", f"Connection closed: {e}")
+        finally:
+            for fut in self.pending.values():
+                if not fut.done():
+                    fut.set_exception(CDPError("connection closed"))
+            self.pending.clear()
+
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        msg_id = next(self.ids)
+        msg = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id:
+            msg["sessionId"] = session_id
+        fut = asyncio.get_running_loop().create_future()
+        self.pending[msg_id] = fut
+        await self.ws.send(json.dumps(msg))
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        finally:
+            self.pending.pop(msg_id, None)
+
+    def on(self, method, callback, session_id=None):
+        self.listeners.setdefault((session_id, method), []).append(callback)
+
+    async def new_page(self, url="about:blank"):
+        target = await self.send("Target.createTarget", {"url": url})
+        attached = await self.send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True})
+        return CDPPage(self, target["targetId"], attached["sessionId"])
+
+    async def close(self):
+        if self.reader:
+            self.reader.cancel()
+        if self.ws:
+            await self.ws.close()
+
+
+class CDPPage:
+    """
+    One page target. run()/run_async() take the same script bodies we send
+    through Selenium's execute_script / execute_async_script (using
+    `arguments`), so page-side logic is shared between both engines.
+    """
+    def __init__(self, conn, target_id, session_id):
+        self.conn = conn
+        self.target_id = target_id
+        self.session_id = session_id
+        self.commands = 0
+
+    async def send(self, method, params=None, timeout=30):
+        self.commands += 1
+        return await self.conn.send(method, params, session_id=self.session_id, timeout=timeout)
+
+    async def evaluate(self, expression, timeout=30):
+        res = await self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": True,
+        }, timeout=timeout)
+        if "exceptionDetails" in res:
+            details = res["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description") or details.get("text", "JS error"))
+        return res.get("result", {}).get("value")
+
+    async def run(self, body, *args, prelude="", timeout=30):
+        """execute_script equivalent. `prelude` may rewrite `args` (e.g. map indexes to elements)."""
+        expr = f"(() => {{ let args = {json.dumps(list(args))}; {prelude}\nreturn (function() {{{body}\n}}).apply(null, args); }})()"
+        return await self.evaluate(expr, timeout=timeout)
+
+    async def run_async(self, body, *args, prelude="", timeout=30):
+        """execute_async_script equivalent: the script gets a done-callback as its last argument."""
+        expr = (f"(() => {{ let args = {json.dumps(list(args))}; {prelude}\n"
+                f"return new Promise(resolve => (function() {{{body}\n}}).apply(null, args.concat([resolve]))); }})()")
+        return await self.evaluate(expr, timeout=timeout)
+
+    async def navigate(self, url, timeout=30):
+        await self.send("Page.navigate", {"url": url})
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            try:
+                if await self.evaluate("document.readyState", timeout=5) == "complete":
+                    return True
+            except CDPError:
+                pass # Context swapped mid-navigation
+            await asyncio.sleep(0.1)
+        return False
+
+    async def mouse(self, kind, x, y, buttons=0):
+        params = {"type": kind, "x": x, "y": y, "button": "left", "buttons": buttons, "clickCount": 1}
+        if kind == "mouseMoved":
+            params["button"] = "left" if buttons else "none"
+        await self.send("Input.dispatchMouseEvent", params)
+
+    async def close(self):
+        try:
+            await self.conn.send("Target.closeTarget", {"targetId": self.target_id}, timeout=5)
+        except Exception:
+            pass
@@ -9,8 +9,13 @@ class Config:
     # Where to copy it for the bot (avoids lock conflicts)
     CLONE_PROFILE_DIR = os.path.expanduser("~/tarabean_bot_profile")
     
+    # headed (maximized + keepalive extension) | headless (fixed window, low-footprint flags)
+    BROWSER_PROFILE = "headed"
+    HEADLESS_WINDOW_SIZE = (1920, 1080) # keep equal to the headed maximized size
+
     # Target URL
     PUZZLE_URL = "https://tarabean.com/puzzle"
+    MEMORY_URL = "https://tarabean.com/memory"
     
     # Timing (Seconds) - ULTRA TURBO MODE
     MAX_JITTER = 0.02
@@ -18,6 +23,82 @@ class Config:
     REFRESH_INTERVAL = 1800 # 30 Minutes
     STUCK_TIMEOUT = 60 # 1 Minute (Reload if nothing happens)
     LOG_FILE_PATH = "loginfo.txt"
+    LOG_LEVEL = "INFO" # DEBUG adds per-scan / per-click / per-batch lines
+    LOG_FLUSH_INTERVAL = 0.5 # writer thread batches lines for up to this long
+    LOG_MAX_BYTES = 10 * 2**20 # rotate to loginfo.txt.1, .2, ... (0 = never)
+    LOG_BACKUPS = 3
+
+    # Worker engine: thread (GameWorker + Selenium) | async (asyncio + raw CDP, src/engine.py)
+    #                | process (GameWorkers in supervised child processes, src/supervisor.py)
+    WORKER_ENGINE = "thread"
+    ASYNC_TABS_PER_BROWSER = 1 # async sessions sharing one Chrome
+    ASYNC_POLL_INTERVAL = 0.1 # seconds between phase probes (one websocket message each)
+    WORKERS_PER_PROCESS = 1 # process engine: workers sharing one child process
+    SUPERVISOR_MAX_WORKERS = 64 # shared-memory status slots
+    SUPERVISOR_HEARTBEAT_TIMEOUT = 15 # restart a child that stops publishing for this long
+
+    # Startup: workers launched concurrently when the app starts, e.g.
+    # [("PUZZLE", "RANDOM"), ("MEMORY", "N/A")]. At most LAUNCH_CONCURRENCY Chromes start at once.
+    STARTUP_WORKERS = []
+    LAUNCH_CONCURRENCY = 4
+    DRIVER_CACHE_FILE = ".chromedriver_path" # resolved chromedriver, reused offline across runs
+
+    # Game sessions per Chrome (src/tabs.py). >1 = workers share a browser and
+    # profile, one window each; the warm pool is bypassed in this mode.
+    TABS_PER_BROWSER = 1
+
+    # Network filtering (src/netfilter.py): per-game Network.setBlockedURLs deny lists.
+    # The solvers read background-position / img src only, never the bytes.
+    NETWORK_FILTER = True
+    NETWORK_BLOCK_COMMON = [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*googlesyndication.com*", "*adservice.google.*", "*facebook.net*", "*hotjar.com*",
+        "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+    ]
+    NETWORK_BLOCK = {
+        "PUZZLE": ["*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif", "*.avif"],
+        "MEMORY": ["*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif", "*.avif"],
+    }
+    # Rough size per blocked resource type, for the "saved" estimate
+    NETWORK_BYTES_ESTIMATE = {"Image": 80_000, "Font": 40_000, "Media": 500_000,
+                              "Script": 60_000, "Stylesheet": 20_000, "Other": 5_000}
+
+    # Prometheus-style metrics (src/metrics.py): GET http://METRICS_HOST:METRICS_PORT/metrics
+    # In process mode each worker process serves on METRICS_PORT + its group number.
+    METRICS_ENABLED = False
+    METRICS_HOST = "127.0.0.1"
+    METRICS_PORT = 9464
+
+    # Warm browser pool (src/pool.py): Chromes kept launched and parked on a game page
+    # so new workers and recoveries skip the cold start. 0 = off (workers keep their own
+    # logged-in profile slot). Thread engine only: profile slots aren't shared across processes.
+    POOL_SIZE = 0
+    POOL_WARM_GAME = "PUZZLE" # refills follow the last game type checked out
+
+    # WebDriver transport: default (Selenium's urllib3 pool) | pooled (src/transport.py)
+    DRIVER_TRANSPORT = "pooled"
+    DRIVER_POOL_SIZE = 4 # keep-alive sockets per driver
+    DRIVER_COMMAND_TIMEOUT = None # seconds per HTTP command, None = Selenium default
+    # Stall detection (seconds). COMMAND_DEADLINE caps every WebDriver command on the pooled
+    # transport (navigation / async scripts: the browser's own timeout + 5); None = off.
+    COMMAND_DEADLINE = 10
+    HEARTBEAT_TIMEOUT = 5 # no animation frames and no DOM mutations for this long = page frozen
+    STALL_TIMEOUT = 10 # SOLVE with a board that hasn't changed for this long = not reacting
+    RELOAD_DEADLINE = 15 # soft reload during recovery; slower than this escalates
+    # Record / replay WebDriver traffic (src/replay.py): one worker_<id>.jsonl per browser.
+    # REPLAY answers every command from the recording instead of starting Chrome.
+    WEBDRIVER_RECORD_DIR = None
+    WEBDRIVER_REPLAY_DIR = None
+
+    # Puzzle drag backend: actions | w3c_batch | cdp | js_events
+    # (see src/input_backend.py, swaps/s is reported in the log per batch)
+    PUZZLE_INPUT_BACKEND = "w3c_batch"
+
+    # Memory pair clicking: scheduled (in-page, animation-aware) | sequential (Selenium clicks + sleeps)
+    MEMORY_CLICK_MODE = "scheduled"
+    # Upper bound (ms) for the first / second card flip in scheduled mode (= the old fixed sleeps)
+    MEMORY_FLIP_CAPS_MS = (400, 600)
     
     @staticmethod
     def get_chrome_path():
@@ -0,0 +1,92 @@
+from . import metrics
+
+# Hot XPath lookups shared by GameWorker and the solvers, by name.
+# (The Memory grid is cached in-page by MemoryCache, the puzzle pieces by BoardModel.)
+SELECTORS = {
+    "go_next": "//*[contains(text(), 'Go next')]",
+    "dialog_buttons": "//div[@role='dialog']//button",
+    "board": "//div[contains(@style, 'background-position')]",
+}
+
+CONNECTED_SCRIPT = "return arguments[0].every(e => e.isConnected);"
+
+
+def xpath_for(name):
+    if name.startswith("difficulty:"):
+        kw = name.split(":", 1)[1]
+        return f"//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{kw}')]"
+    return SELECTORS[name]
+
+
+class ElementCache:
+    """
+    Resolved WebElements per selector for one game session (one window).
+    Cached handles are trusted until using them raises
+    StaleElementReferenceException, or (check=True) until they're no longer
+    in the DOM; then the selector is looked up again. A negative answer from
+    live handles is just an answer, it costs no second lookup.
+    Empty results are never cached.
+    """
+    def __init__(self, driver):
+        self.driver = driver
+        self.entries = {} # name -> [WebElement]
+        self.stats = {} # name -> [hits, misses, stale]
+
+    def _count(self, name, result):
+        self.stats.setdefault(name, [0, 0, 0])[("hit", "miss", "stale").index(result)] += 1
+        metrics.current().inc("element_lookups_total", selector=name, result=result)
+
+    def _lookup(self, name):
+        from selenium.webdriver.common.by import By
+        self._count(name, "miss")
+        elements = self.driver.find_elements(By.XPATH, xpath_for(name))
+        if elements:
+            self.entries[name] = elements
+        else:
+            self.entries.pop(name, None)
+        return elements
+
+    def find_all(self, name, check=False):
+        """Cached elements for `name`; check=True confirms they're still in the DOM first (one execute_script)."""
+        elements = self.entries.get(name)
+        if elements and (not check or self._connected(name, elements)):
+            self._count(name, "hit")
+            return elements
+        return self._lookup(name)
+
+    def _connected(self, name, elements):
+        from selenium.common.exceptions import StaleElementReferenceException
+        try:
+            if self.driver.execute_script(CONNECTED_SCRIPT, elements):
+                return True
+        except StaleElementReferenceException:
+            pass
+        self.invalidate(name, stale=True)
+        return False
+
+    def use(self, name, fn, check=False):
+        """
+        Returns fn(elements) using the cached lookup. If the cached handles turn
+        out stale, looks up once more and retries.
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+        cached = bool(self.entries.get(name))
+        try:
+            return fn(self.find_all(name, check))
+        except StaleElementReferenceException:
+            if not cached: raise
+            self.invalidate(name, stale=True)
+        return fn(self._lookup(name))
+
+    def invalidate(self, name=None, stale=False):
+        if name is None:
+            self.entries.clear()
+            return
+        self.entries.pop(name, None)
+        if stale:
+            self._count(name, "stale")
+
+    def summary(self) -> str:
+        if not self.stats: return "Element cache: unused."
+        parts = [f"{name} {h}/{h + m} hits ({s} stale)" for name, (h, m, s) in sorted(self.stats.items())]
+        return "Element cache: " + ", ".join(parts)
@@ -0,0 +1,442 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from .browser import BrowserManager
+from .board import BoardModel, CHECKSUM_SCRIPT
+from .cdp import CDPConnection
+from .config import Config
+from .input_backend import CDPInputBackend, DRAG_PAUSE
+from .logger import GlobalLogger
+from . import metrics
+from .netfilter import NetworkStats, blocked_urls
+from .memory import CARD_CLASS, GRID_CLASS, SCAN_SCRIPT as MEMORY_SCAN_SCRIPT, SCHEDULE_SCRIPT, group_pairs
+from .planner import SwapPlan
+from .puzzle import PuzzleSolver
+from .state import GamePhase, PROBE_SCRIPT, parse_phase
+
+# The CDP engine can't hold element handles across calls, so the scans stash
+# their elements in the page and hand back indexes instead.
+STASH_PIECES_SCRIPT = """
+const r = (function() {""" + PuzzleSolver.SCAN_SCRIPT + """
+}).apply(null, arguments);
+window.__tbPieces = r.map(p => p.element);
+return r.map((p, i) => Object.assign({}, p, {element: i}));
+"""
+
+STASH_CARDS_SCRIPT = """
+const r = (function() {""" + MEMORY_SCAN_SCRIPT + """
+}).apply(null, arguments);
+if (r) delete r.grid; // element handle, only meaningful to the Selenium-side cache
+if (r && r.slots) {
+    window.__tbCards = r.slots.map(s => s.element);
+    r.slots = r.slots.map((s, i) => Object.assign({}, s, {element: i}));
+}
+return r;
+"""
+
+PIECES_PRELUDE = "args[0] = args[0].map(i => window.__tbPieces[i]);"
+CARD_PAIRS_PRELUDE = "args[0] = args[0].map(([a, b]) => [window.__tbCards[a], window.__tbCards[b]]);"
+
+# Clicks the first visible element whose text matches, trying words in order.
+CLICK_TEXT_SCRIPT = """
+const selector = arguments[0], words = arguments[1];
+const visible = el => !!el.getClientRects().length;
+const els = Array.from(document.querySelectorAll(selector)).filter(visible);
+for (const w of words) {
+    for (const el of els) {
+        if (el.textContent.toLowerCase().includes(w)) { el.click(); return el.textContent.trim(); }
+    }
+}
+return null;
+"""
+
+GO_NEXT_SCRIPT = """
+const it = document.evaluate("//*[contains(text(), 'Go next')]", document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < it.snapshotLength; i++) {
+    const el = it.snapshotItem(i);
+    if (el.getClientRects().length) { el.click(); return true; }
+}
+return false;
+"""
+
+BOARD_CENTRE_SCRIPT = """
+const el = document.querySelector('div[style*="background-position"]');
+if (!el) return null;
+const r = el.getBoundingClientRect();
+return [r.left + r.width / 2, r.top + r.height / 2];
+"""
+
+DIFFICULTY_KEYWORDS = {
+    "Easy": ["easy"],
+    "Normal": ["normal", "medium", "regular"],
+    "Hard": ["hard", "expert"],
+}
+NEXT_LEVEL_WORDS = ["next", "play again", "ready", "close", "try again"]
+
+
+class ChromeProcess:
+    """A Chrome launched with --remote-debugging-port, shared by up to N sessions."""
+    def __init__(self, slot_id):
+        self.slot_id = slot_id
+        self.proc = None
+        self.conn = None
+        self.pages = 0
+
+    async def launch(self):
+        manager = BrowserManager(worker_id=self.slot_id)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, manager.prepare_profile)
+
+        profile_dir = f"{Config.CLONE_PROFILE_DIR}_{self.slot_id}"
+        port_file = os.path.join(profile_dir, "DevToolsActivePort")
+        if os.path.exists(port_file):
+            os.remove(port_file)
+
+        args = manager.get_options().arguments + ["--remote-debugging-port=0", "about:blank"]
+        self.proc = await asyncio.create_subprocess_exec(
+            Config.CHROME_BINARY_PATH, *args,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+
+        deadline = loop.time() + Config.PAGE_LOAD_TIMEOUT
+        while not os.path.exists(port_file):
+            if loop.time() > deadline or self.proc.returncode is not None:
+                raise RuntimeError(f"Chrome (slot {self.slot_id}) did not expose a debugging port")
+            await asyncio.sleep(0.05)
+        # File is written in one go, but give it a tick to be complete
+        await asyncio.sleep(0.05)
+        with open(port_file) as f:
+            port, path = f.read().split("\n")[:2]
+
+        self.conn = CDPConnection(f"ws://127.0.0.1:{port.strip()}{path.strip()}")
+        await self.conn.connect()
+        GlobalLogger.log("Engine", f"Chrome slot {self.slot_id} ready on port {port.strip()}.")
+
+    async def close(self):
+        if self.conn:
+            await self.conn.close()
+        if self.proc and self.proc.returncode is None:
+            self.proc.terminate()
+            try:
+                await asyncio.wait_for(self.proc.wait(), 10)
+            except asyncio.TimeoutError:
+                self.proc.kill()
+
+
+class AsyncSession:
+    """
+    One game session running as a coroutine on the engine loop.
+    Exposes the same fields App's dashboard reads from GameWorker.
+    """
+    BATCH_SIZE = PuzzleSolver.BATCH_SIZE
+
+    def __init__(self, engine, worker_id, game_type, difficulty):
+        self.engine = engine
+        self.worker_id = worker_id
+        self.game_type = game_type
+        self.difficulty = difficulty
+        self.status = "IDLE"
+        self.items_solved = 0
+        self.last_activity = time.time()
+        self.is_running = False
+        self.future = None
+        self.time_in_phase = {}
+        self.netstats = NetworkStats()
+        self.metrics = metrics.WorkerMetrics(worker=worker_id, game=game_type, difficulty=difficulty)
+
+    # --- Dashboard / App interface ---
+    def start(self):
+        self.is_running = True
+        self.status = "STARTING"
+        metrics.register(self.metrics)
+        self.future = asyncio.run_coroutine_threadsafe(self.run(), self.engine.loop)
+
+    def stop(self):
+        if not self.is_running: return
+        self.status = "STOPPING"
+        if self.future:
+            self.future.cancel()
+        metrics.unregister(self.metrics)
+        self.is_running = False
+        self.status = "STOPPED"
+
+    def state_breakdown(self):
+        total = sum(self.time_in_phase.values())
+        if total <= 0: return "-"
+        return " | ".join(f"{k} {v / total:.0%}" for k, v in
+                          sorted(self.time_in_phase.items(), key=lambda kv: -kv[1]))
+
+    # --- Coroutines ---
+    async def run(self):
+        name = f"Async-{self.worker_id}"
+        chrome = page = None
+        try:
+            self.status = "LAUNCHING"
+            chrome, page = await self.engine.acquire_page(self.worker_id)
+            if Config.NETWORK_FILTER:
+                await self._filter_network(page)
+            GlobalLogger.log(name, f"Started {self.game_type} routine.")
+            while True:
+                try:
+                    if self.game_type == "PUZZLE":
+                        await self._puzzle(page)
+                    else:
+                        await self._memory(page)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Routine restarts from navigation
+                    self.status = f"ERROR: {str(e)[:20]}"
+                    GlobalLogger.log(name, f"Routine error, restarting: {e}")
+                    await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.status = f"ERROR: {str(e)[:20]}"
+            GlobalLogger.log(name, f"CRASH: {e}")
+        finally:
+            if page:
+                await page.close()
+                await self.engine.release_page(chrome)
+            self.is_running = False
+            GlobalLogger.log(name, f"Stopped. Time per phase: {self.state_breakdown()}")
+
+    async def _filter_network(self, page):
+        # Same deny lists as netfilter.py; events arrive on the websocket, no log polling needed
+        for method in ("Network.requestWillBeSent", "Network.loadingFinished", "Network.loadingFailed"):
+            page.conn.on(method, lambda params, m=method: self.netstats.record(m, params), session_id=page.session_id)
+        await page.send("Network.enable")
+        await page.send("Network.setBlockedURLs", {"urls": blocked_urls(self.game_type)})
+
+    async def _phase(self, page):
+        return parse_phase(await page.run(PROBE_SCRIPT))
+
+    def _account(self, phase, started):
+        self.time_in_phase[phase.name] = self.time_in_phase.get(phase.name, 0.0) + time.time() - started
+
+    async def _watchdog(self, page):
+        if time.time() - self.last_activity > Config.STUCK_TIMEOUT:
+            self.status = "STUCK REFRESH"
+            self.metrics.inc("stuck_reloads_total")
+            await page.send("Page.reload")
+            self.last_activity = time.time()
+            await asyncio.sleep(1)
+            return True
+        return False
+
+    async def _puzzle(self, page):
+        self.status = "NAVIGATING"
+        await page.navigate(Config.PUZZLE_URL)
+        helper = PuzzleSolver(None) # only for build_pieces
+        board = plan = None
+        nudged = False
+
+        while True:
+            if await self._watchdog(page):
+                board = plan = None
+                continue
+            started = time.time()
+            phase = await self._phase(page)
+
+            if phase == GamePhase.DIFFICULTY_SELECT:
+                self.status = "SELECTING"
+                if await page.run(CLICK_TEXT_SCRIPT, "button", self._difficulty_words()):
+                    self.last_activity = time.time()
+
+            elif phase == GamePhase.LEVEL_COMPLETE:
+                self.status = "WAITING"
+                if await page.run(GO_NEXT_SCRIPT):
+                    self.items_solved += 1
+                    self.metrics.inc("levels_solved_total", level=self.difficulty)
+                    self.last_activity = time.time()
+                    board = plan = None
+                    nudged = False
+
+            elif phase == GamePhase.GAME_OVER:
+                self.status = "RESTARTING"
+                if not await page.run(CLICK_TEXT_SCRIPT, "[role='dialog'] button", [""]):
+                    await page.send("Page.reload")
+                self.last_activity = time.time()
+                board = plan = None
+                nudged = False
+
+            elif phase == GamePhase.PLAYING:
+                self.status = "RUNNING"
+                if board is not None and await page.run(CHECKSUM_SCRIPT, board.row_tol) != board.checksum():
+                    board = plan = None
+                if board is None:
+                    t = time.perf_counter()
+                    pieces = helper.build_pieces(await page.run(STASH_PIECES_SCRIPT))
+                    self.metrics.observe("scan_seconds", time.perf_counter() - t)
+                    board = BoardModel(pieces, helper.row_tol) if pieces else None
+                    plan = None
+                if board is not None and not plan:
+                    plan = SwapPlan.from_targets(board.targets())
+
+                if plan:
+                    await self._swap_batch(page, board, plan)
+                    self.last_activity = time.time()
+                    nudged = False
+                    self._account(phase, started)
+                    continue
+                if board is not None and not nudged:
+                    await self._nudge(page)
+                    nudged = True
+
+            await asyncio.sleep(Config.ASYNC_POLL_INTERVAL)
+            self._account(phase, started)
+
+    async def _swap_batch(self, page, board, plan):
+        slots = plan.take(self.BATCH_SIZE)
+        indexes = sorted({board.pieces[i].element for pair in slots for i in pair})
+        centres = await page.run(CDPInputBackend.RECTS_SCRIPT, indexes, prelude=PIECES_PRELUDE)
+        pos = dict(zip(indexes, centres))
+        for src, dst in slots:
+            a, b = board.pieces[src].element, board.pieces[dst].element
+            (sx, sy), (dx, dy) = pos[a], pos[b]
+            await page.mouse("mouseMoved", sx, sy)
+            await page.mouse("mousePressed", sx, sy, buttons=1)
+            await asyncio.sleep(DRAG_PAUSE)
+            await page.mouse("mouseMoved", dx, dy, buttons=1)
+            await asyncio.sleep(DRAG_PAUSE)
+            await page.mouse("mouseReleased", dx, dy)
+            pos[a], pos[b] = pos[b], pos[a]
+            board.apply_swap(src, dst)
+            self.metrics.inc("swaps_total")
+
+    async def _nudge(self, page):
+        # Hover trick, same as GameWorker._hover_board
+        centre = await page.run(BOARD_CENTRE_SCRIPT)
+        if centre:
+            x, y = centre
+            for dx in (0, 10, 0):
+                await page.mouse("mouseMoved", x + dx, y)
+
+    def _difficulty_words(self):
+        if self.difficulty in DIFFICULTY_KEYWORDS:
+            return DIFFICULTY_KEYWORDS[self.difficulty]
+        names = list(DIFFICULTY_KEYWORDS)
+        random.shuffle(names)
+        return [w for n in names for w in DIFFICULTY_KEYWORDS[n]]
+
+    async def _memory(self, page):
+        self.status = "NAVIGATING"
+        await page.navigate(Config.MEMORY_URL)
+        first_cap, second_cap = Config.MEMORY_FLIP_CAPS_MS
+        # Stability check as in MemorySolver.scan_board: play once there are >10 cards,
+        # the count repeats, or 1 s has passed since the first scan
+        last_count = settle_until = None
+
+        while True:
+            await self._watchdog(page)
+            started = time.time()
+            phase = await self._phase(page)
+            if phase != GamePhase.PLAYING:
+                last_count = settle_until = None
+
+            if phase == GamePhase.PLAYING:
+                self.status = "SCANNING"
+                t = time.perf_counter()
+                scan = await page.run(STASH_CARDS_SCRIPT, GRID_CLASS, CARD_CLASS)
+                self.metrics.observe("scan_seconds", time.perf_counter() - t)
+                count = scan["filtered"] if scan and scan.get("slots") else 0
+                if settle_until is None:
+                    settle_until = time.time() + 1.0
+                ready = count and (count > 10 or count == last_count or time.time() >= settle_until)
+                last_count = count
+                if ready:
+                    last_count = settle_until = None
+                    pairs = [cards[:2] for cards in group_pairs(scan["slots"]).values() if len(cards) >= 2]
+                    if pairs:
+                        self.status = "MATCHING"
+                        budget = len(pairs) * (first_cap + second_cap) / 1000.0 + 5
+                        result = await page.run_async(SCHEDULE_SCRIPT, pairs, first_cap, second_cap,
+                                                      prelude=CARD_PAIRS_PRELUDE, timeout=budget)
+                        self.metrics.inc("pair_clicks_total", len((result or {}).get("timings") or []))
+                        self.last_activity = time.time()
+                        self._account(phase, started)
+                        continue
+
+            elif phase == GamePhase.LEVEL_COMPLETE:
+                self.status = "WAITING"
+                if await page.run(CLICK_TEXT_SCRIPT, "[role='dialog'] button", NEXT_LEVEL_WORDS):
+                    self.items_solved += 1
+                    self.metrics.inc("levels_solved_total", level=self.difficulty)
+                    self.last_activity = time.time()
+
+            elif phase == GamePhase.GAME_OVER:
+                self.status = "RESTARTING"
+                if not await page.run(CLICK_TEXT_SCRIPT, "[role='dialog'] button", [""]):
+                    await page.send("Page.reload")
+                self.last_activity = time.time()
+
+            await asyncio.sleep(Config.ASYNC_POLL_INTERVAL)
+            self._account(phase, started)
+
+
+class AsyncEngine:
+    """
+    Runs every async session on one asyncio loop in a background thread,
+    talking CDP directly to Chrome instead of going through chromedriver.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = AsyncEngine()
+            return cls._instance
+
+    @classmethod
+    def running(cls):
+        return cls._instance is not None
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.browsers = []
+        self.browser_lock = None
+        self.thread = threading.Thread(target=self._run_loop, name="AsyncEngine", daemon=True)
+        self.thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.browser_lock = asyncio.Lock()
+        self.loop.run_forever()
+
+    def spawn(self, worker_id, game_type, difficulty):
+        session = AsyncSession(self, worker_id, game_type, difficulty)
+        session.start()
+        return session
+
+    async def acquire_page(self, worker_id):
+        async with self.browser_lock:
+            chrome = next((b for b in self.browsers if b.pages < Config.ASYNC_TABS_PER_BROWSER), None)
+            if chrome is None:
+                chrome = ChromeProcess(slot_id=worker_id)
+                await chrome.launch()
+                self.browsers.append(chrome)
+            chrome.pages += 1
+        return chrome, await chrome.conn.new_page()
+
+    async def release_page(self, chrome):
+        async with self.browser_lock:
+            chrome.pages -= 1
+            if chrome.pages <= 0:
+                self.browsers.remove(chrome)
+                await chrome.close()
+
+    def shutdown(self):
+        async def _close_all():
+            for chrome in list(self.browsers):
+                await chrome.close()
+            self.browsers.clear()
+        try:
+            asyncio.run_coroutine_threadsafe(_close_all(), self.loop).result(timeout=15)
+        except Exception as e:
+            GlobalLogger.log("Engine", f"Shutdown error: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        with AsyncEngine._lock:
+            AsyncEngine._instance = None
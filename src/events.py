@@ -0,0 +1,231 @@
+import time
+from .logger import GlobalLogger
+from .state import PROBE_FN, parse_phase
+from .transport import DEADLINE_GRACE, deadline
+from . import pacing
+
+# Page-side event channel. A MutationObserver re-evaluates the page on DOM
+# changes and pushes typed, edge-triggered events into window.__tbEvents:
+#   dialog      - a [role=dialog] became visible
+#   go_next     - a "Go next" element became visible
+#   difficulty  - difficulty buttons became visible
+#   board       - the puzzle board container was replaced / piece count changed
+#   phase       - the GamePhase (state.PROBE_FN) changed
+# __tbState keeps the current (level-triggered) snapshot with element refs, and
+# __tbState.beat the heartbeat: animation frames and DOM mutations seen so far.
+INSTALL_SCRIPT = """
+if (window.__tbEvents) return true;
+const KEYWORDS = ['easy', 'normal', 'medium', 'regular', 'hard', 'expert'];
+const queue = window.__tbEvents = [];
+const waiters = window.__tbWaiters = [];
+const state = window.__tbState = {dialog: false, go_next: null, difficulty: [], board: null, pieces: 0, phase: null,
+                                   beat: {frames: 0, mutations: 0}};
+const probe = %s;
+const tick = () => { state.beat.frames++; requestAnimationFrame(tick); };
+requestAnimationFrame(tick);
+
+function visible(el) {
+    return !!(el && el.isConnected && el.getClientRects().length && getComputedStyle(el).visibility !== 'hidden');
+}
+function push(type, data) {
+    queue.push({type: type, t: performance.now(), data: data || null});
+    if (queue.length > 100) queue.splice(0, queue.length - 100);
+    while (waiters.length) { try { waiters.shift()(); } catch (e) {} }
+}
+function evaluate() {
+    const dialog = Array.from(document.querySelectorAll('[role="dialog"]')).some(visible);
+    if (dialog && !state.dialog) {
+        const texts = Array.from(document.querySelectorAll('[role="dialog"] button')).map(b => b.textContent.trim());
+        push('dialog', {buttons: texts});
+    }
+    state.dialog = dialog;
+
+    let next = null;
+    const it = document.evaluate("//*[contains(text(), 'Go next')]", document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < it.snapshotLength; i++) {
+        if (visible(it.snapshotItem(i))) { next = it.snapshotItem(i); break; }
+    }
+    if (next && !state.go_next) push('go_next');
+    state.go_next = next;
+
+    const diff = [];
+    for (const b of document.querySelectorAll('button')) {
+        const label = b.textContent.trim().toLowerCase();
+        if (KEYWORDS.some(k => label.includes(k)) && visible(b)) diff.push([label, b]);
+    }
+    if (diff.length && !state.difficulty.length) push('difficulty', {labels: diff.map(d => d[0])});
+    state.difficulty = diff;
+
+    const pieces = document.querySelectorAll('div[style*="background-position"]');
+    const board = pieces.length ? pieces[0].parentElement : null;
+    if (board !== state.board || pieces.length !== state.pieces) {
+        if (board) push('board', {pieces: pieces.length});
+        state.board = board;
+        state.pieces = pieces.length;
+    }
+
+    const phase = probe();
+    if (phase !== state.phase) {
+        push('phase', {phase: phase});
+        state.phase = phase;
+    }
+}
+
+let scheduled = false;
+const observer = new MutationObserver(records => {
+    state.beat.mutations += records.length;
+    if (scheduled) return;
+    scheduled = true;
+    setTimeout(() => { scheduled = false; evaluate(); }, 0);
+});
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, characterData: true,
+    attributes: true, attributeFilter: ['style', 'class', 'role', 'hidden', 'aria-hidden']
+});
+evaluate();
+return true;
+""" % PROBE_FN
+
+# Drains the queue and returns the current snapshot (+ GamePhase value from
+# state.PROBE_FN, so no separate probe call is needed). null if the channel is
+# missing (fresh page load) so the caller can re-install.
+DRAIN_SCRIPT = """
+if (!window.__tbEvents) return null;
+const s = window.__tbState;
+return {
+    events: window.__tbEvents.splice(0),
+    dialog: s.dialog,
+    go_next: s.go_next,
+    difficulty: s.difficulty,
+    beat: s.beat,
+    phase: (%s)()
+};
+""" % PROBE_FN
+
+# Same as DRAIN_SCRIPT, but blocks (async) until an event arrives or timeout ms pass.
+WAIT_SCRIPT = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+if (!window.__tbEvents) { done(null); return; }
+const snapshot = () => {
+    const s = window.__tbState;
+    return {events: window.__tbEvents.splice(0), dialog: s.dialog, go_next: s.go_next, difficulty: s.difficulty,
+            beat: s.beat, phase: (%s)()};
+};
+if (window.__tbEvents.length) { done(snapshot()); return; }
+let finished = false;
+const finish = () => { if (!finished) { finished = true; done(snapshot()); } };
+window.__tbWaiters.push(finish);
+setTimeout(finish, timeoutMs);
+""" % PROBE_FN
+
+
+class Heartbeat:
+    """
+    Page liveness from the snapshot counters. A counter that moved since the
+    last snapshot is a beat (that includes the reset after a reload). Ages
+    only grow between snapshots, so a slow step on our side never reads as
+    a quiet page.
+    """
+    def __init__(self):
+        self.frames = self.mutations = None
+        self.sampled_at = self.frame_at = self.mutation_at = time.time()
+
+    def update(self, page):
+        beat = page.get("beat") if page else None
+        if not beat: return
+        self.sampled_at = now = time.time()
+        if beat.get("frames") != self.frames:
+            self.frames, self.frame_at = beat.get("frames"), now
+        if beat.get("mutations") != self.mutations:
+            self.mutations, self.mutation_at = beat.get("mutations"), now
+
+    def quiet_for(self) -> float:
+        """Seconds without DOM mutations."""
+        return self.sampled_at - self.mutation_at
+
+    def frozen_for(self) -> float:
+        """Seconds without animation frames or DOM mutations."""
+        return self.sampled_at - max(self.frame_at, self.mutation_at)
+
+
+class PageEvents:
+    """
+    Python side of the MutationObserver channel.
+    drain() and wait() each cost exactly one WebDriver call (plus a re-install
+    after a page load) and return None only if the channel can't be set up.
+    blocking=False (windows sharing a Chrome, see tabs.py): wait() drains every
+    POLL_INTERVAL instead of parking an async script, which would hold the
+    host's command lock for the whole wait.
+    """
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, driver, blocking=True):
+        self.driver = driver
+        self.blocking = blocking
+        self.installs = 0
+        self.heartbeat = Heartbeat()
+
+    def install(self) -> bool:
+        try:
+            ok = bool(self.driver.execute_script(INSTALL_SCRIPT))
+        except Exception as e:
+            GlobalLogger.log("Events", f"Install failed: {e}")
+            return False
+        if ok:
+            self.installs += 1
+        return ok
+
+    def drain(self):
+        return self._call(lambda: self.driver.execute_script(DRAIN_SCRIPT))
+
+    def wait(self, timeout: float = 1.0):
+        start = time.perf_counter()
+        try:
+            if not self.blocking:
+                return self._poll(timeout)
+            with deadline(timeout + DEADLINE_GRACE):
+                return self._call(lambda: self.driver.execute_async_script(WAIT_SCRIPT, int(timeout * 1000)))
+        finally:
+            pacing.current().idle(time.perf_counter() - start)
+
+    def _poll(self, timeout):
+        until = time.time() + timeout
+        while True:
+            page = self.drain()
+            remaining = until - time.time()
+            if page is None or page.get("events") or remaining <= 0:
+                return page
+            time.sleep(min(self.POLL_INTERVAL, remaining))
+
+    def _call(self, fn):
+        page = fn()
+        if page is None:
+            if not self.install():
+                return None
+            page = fn()
+        self.heartbeat.update(page)
+        return page
+
+    def wait_for_phase(self, phases, timeout: float, stop_event=None):
+        """
+        Blocks on the event channel until the page reaches one of `phases`
+        or `timeout` seconds pass. Returns the last snapshot (or None).
+        """
+        until = time.time() + timeout
+        page = self.drain()
+        while page is not None and parse_phase(page.get("phase")) not in phases:
+            remaining = until - time.time()
+            if remaining <= 0 or (stop_event is not None and stop_event.is_set()):
+                break
+            page = self.wait(min(remaining, 1.0))
+        return page
+
+    @staticmethod
+    def phase(page):
+        return parse_phase(page.get("phase")) if page else None
+
+    @staticmethod
+    def types(page) -> set:
+        if not page: return set()
+        return {e.get("type") for e in page.get("events") or []}
@@ -0,0 +1,211 @@
+import time
+from selenium.webdriver.common.action_chains import ActionChains
+from .logger import GlobalLogger
+
+# Pause used between press/move/release. 10ms is the bare minimum for the game
+# to register the drag (same value the original perform_swap used).
+DRAG_PAUSE = 0.01
+
+
+class InputBackend:
+    """
+    Base class for the drag backends used by PuzzleSolver.
+    A swap is a (piece_from, piece_to) tuple: piece_from gets dragged onto piece_to.
+    """
+    name = "base"
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.drag_pause = DRAG_PAUSE # PuzzleSolver tunes this through pacing
+        self.swaps_done = 0
+        self.busy_time = 0.0
+
+    def perform_swaps(self, swaps) -> int:
+        """Runs a batch of swaps. Returns how many of them were performed."""
+        if not swaps: return 0
+        start = time.perf_counter()
+        done = 0
+        try:
+            done = self._perform(swaps)
+        except Exception as e:
+            GlobalLogger.log("Input", f"{self.name} batch failed: {e}")
+        finally:
+            self.busy_time += time.perf_counter() - start
+            self.swaps_done += done
+        return done
+
+    def _perform(self, swaps) -> int:
+        raise NotImplementedError
+
+    @property
+    def swaps_per_second(self) -> float:
+        if self.busy_time <= 0: return 0.0
+        return self.swaps_done / self.busy_time
+
+    def report(self) -> str:
+        return f"{self.name}: {self.swaps_done} swaps in {self.busy_time:.2f}s ({self.swaps_per_second:.1f} swaps/s)"
+
+
+class ActionChainsBackend(InputBackend):
+    """Original behaviour: one ActionChains.perform() (one HTTP round trip) per swap."""
+    name = "actions"
+
+    def _perform(self, swaps) -> int:
+        done = 0
+        for src, dst in swaps:
+            try:
+                ActionChains(self.driver)\
+                    .click_and_hold(src.element)\
+                    .pause(self.drag_pause)\
+                    .move_to_element(dst.element)\
+                    .pause(self.drag_pause)\
+                    .release().perform()
+            except Exception:
+                break
+            done += 1
+        return done
+
+
+class W3CBatchBackend(InputBackend):
+    """
+    Chains every drag of the batch into a single W3C actions payload.
+    Element origins are resolved by the driver when each action runs, so
+    pieces that moved earlier in the same batch are still targeted correctly.
+    """
+    name = "w3c_batch"
+
+    def _perform(self, swaps) -> int:
+        actions = ActionChains(self.driver)
+        for src, dst in swaps:
+            actions.click_and_hold(src.element)\
+                   .pause(self.drag_pause)\
+                   .move_to_element(dst.element)\
+                   .pause(self.drag_pause)\
+                   .release()
+        try:
+            actions.perform()
+        except Exception:
+            # All-or-nothing: we can't tell how far the payload got
+            return 0
+        return len(swaps)
+
+
+class CDPInputBackend(InputBackend):
+    """
+    Drives Input.dispatchMouseEvent through driver.execute_cdp_cmd.
+    Piece centres are read once per batch; after each drag the two pieces
+    trade places, so we swap their cached centres instead of re-reading them.
+    """
+    name = "cdp"
+
+    RECTS_SCRIPT = """
+    return arguments[0].map(el => {
+        const r = el.getBoundingClientRect();
+        return [r.left + r.width / 2, r.top + r.height / 2];
+    });
+    """
+
+    def _mouse(self, kind, x, y, buttons=0):
+        params = {"type": kind, "x": x, "y": y, "button": "left", "buttons": buttons, "clickCount": 1}
+        if kind == "mouseMoved":
+            params["button"] = "left" if buttons else "none"
+        self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", params)
+
+    def _perform(self, swaps) -> int:
+        elements = {}
+        for src, dst in swaps:
+            elements[src.element.id] = src.element
+            elements[dst.element.id] = dst.element
+        ids = list(elements.keys())
+        centres = self.driver.execute_script(self.RECTS_SCRIPT, [elements[i] for i in ids])
+        pos = dict(zip(ids, centres))
+
+        done = 0
+        for src, dst in swaps:
+            sx, sy = pos[src.element.id]
+            dx, dy = pos[dst.element.id]
+            try:
+                self._mouse("mouseMoved", sx, sy)
+                self._mouse("mousePressed", sx, sy, buttons=1)
+                time.sleep(self.drag_pause)
+                self._mouse("mouseMoved", dx, dy, buttons=1)
+                time.sleep(self.drag_pause)
+                self._mouse("mouseReleased", dx, dy)
+            except Exception:
+                break
+            pos[src.element.id], pos[dst.element.id] = pos[dst.element.id], pos[src.element.id]
+            done += 1
+        return done
+
+
+class JSEventBackend(InputBackend):
+    """
+    Fires the pointer/mouse drag sequence inside the page, whole batch in one
+    execute_async_script. Waits drag_pause after the press and after the move,
+    like the other backends, so the game can re-render.
+    Returns the number of swaps dispatched.
+    """
+    name = "js_events"
+
+    SCRIPT = """
+    const pairs = arguments[0];
+    const pauseMs = arguments[1];
+    const done = arguments[arguments.length - 1];
+    const tick = () => new Promise(r => setTimeout(r, pauseMs));
+
+    function fire(el, type, x, y, buttons) {
+        const init = {bubbles: true, cancelable: true, composed: true, view: window,
+                      clientX: x, clientY: y, button: 0, buttons: buttons};
+        if (type.startsWith('pointer')) {
+            el.dispatchEvent(new PointerEvent(type, Object.assign({pointerId: 1, pointerType: 'mouse', isPrimary: true}, init)));
+        } else {
+            el.dispatchEvent(new MouseEvent(type, init));
+        }
+    }
+    function centre(el) {
+        const r = el.getBoundingClientRect();
+        return [r.left + r.width / 2, r.top + r.height / 2];
+    }
+
+    (async () => {
+        let count = 0;
+        try {
+            for (const [src, dst] of pairs) {
+                if (!src.isConnected || !dst.isConnected) break;
+                const [sx, sy] = centre(src);
+                const [dx, dy] = centre(dst);
+                fire(src, 'pointerover', sx, sy, 0);
+                fire(src, 'pointerdown', sx, sy, 1);
+                fire(src, 'mousedown', sx, sy, 1);
+                await tick();
+                fire(dst, 'pointermove', dx, dy, 1);
+                fire(dst, 'mousemove', dx, dy, 1);
+                await tick();
+                fire(dst, 'pointerup', dx, dy, 0);
+                fire(dst, 'mouseup', dx, dy, 0);
+                count++;
+            }
+        } catch (e) {}
+        done(count);
+    })();
+    """
+
+    def _perform(self, swaps) -> int:
+        pairs = [[src.element, dst.element] for src, dst in swaps]
+        return int(self.driver.execute_async_script(self.SCRIPT, pairs, int(self.drag_pause * 1000)) or 0)
+
+
+INPUT_BACKENDS = {
+    ActionChainsBackend.name: ActionChainsBackend,
+    W3CBatchBackend.name: W3CBatchBackend,
+    CDPInputBackend.name: CDPInputBackend,
+    JSEventBackend.name: JSEventBackend,
+}
+
+
+def create_input_backend(name, driver) -> InputBackend:
+    cls = INPUT_BACKENDS.get(name)
+    if cls is None:
+        GlobalLogger.log("Input", f"Unknown input backend '{name}', falling back to {ActionChainsBackend.name}.")
+        cls = ActionChainsBackend
+    return cls(driver)
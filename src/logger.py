@@ -1,22 +1,153 @@
-import logging
+import atexit
+import os
+import queue
+import threading
 import time
 from .config import Config
 
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
+
 class GlobalLogger:
+    """
+    Callers only put a tuple on a SimpleQueue; one writer thread formats,
+    batches and writes to Config.LOG_FILE_PATH, flushing every
+    Config.LOG_FLUSH_INTERVAL and rotating at Config.LOG_MAX_BYTES.
+    Lines below Config.LOG_LEVEL are dropped in the caller.
+    """
     _instance = None
+    _queue = queue.SimpleQueue()
+    _writer = None
+    _start_lock = threading.Lock()
+    _level = INFO
+    _STOP = object()
+    _atexit = False
+
+    # Stats
+    written = 0
+    dropped = 0 # below level
+    rotations = 0
 
     @staticmethod
-    def setup():
-        # Clean/Overwrite log file on startup
-        with open(Config.LOG_FILE_PATH, "w", encoding="utf-8") as f:
+    def setup(path=None, truncate=True):
+        # Clean/Overwrite log file on startup (truncate=False appends, e.g. a restarted worker process)
+        # Lines queued so far belong to the old file: write them out before switching
+        GlobalLogger.flush_and_stop()
+        if path:
+            Config.LOG_FILE_PATH = path
+        with open(Config.LOG_FILE_PATH, "w" if truncate else "a", encoding="utf-8") as f:
             f.write(f"=== TARABEAN SOLVER SESSION LOG {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-    
-    @staticmethod
-    def log(component, message):
-        timestamp = time.strftime('%H:%M:%S')
-        line = f"[{timestamp}] [{component}] {message}\n"
-        try:
-            with open(Config.LOG_FILE_PATH, "a", encoding="utf-8") as f:
-                f.write(line)
-        except:
-            pass # Don't crash on log error
+        GlobalLogger.set_level(Config.LOG_LEVEL)
+        GlobalLogger._ensure_writer()
+
+    @staticmethod
+    def set_level(level):
+        if isinstance(level, str):
+            level = {v: k for k, v in LEVEL_NAMES.items()}.get(level.upper().replace("WARNING", "WARN"), INFO)
+        GlobalLogger._level = level
+
+    @staticmethod
+    def log(component, message, level=INFO):
+        if level < GlobalLogger._level:
+            GlobalLogger.dropped += 1
+            return
+        writer = GlobalLogger._writer
+        if writer is None or not writer.is_alive():
+            GlobalLogger._ensure_writer()
+        GlobalLogger._queue.put((time.time(), level, component, message))
+
+    @staticmethod
+    def debug(component, message):
+        """Hot-path detail (per scan / click / batch). Off unless Config.LOG_LEVEL = "DEBUG"."""
+        if DEBUG < GlobalLogger._level:
+            GlobalLogger.dropped += 1
+            return
+        GlobalLogger.log(component, message, DEBUG)
+
+    @staticmethod
+    def error(component, message):
+        GlobalLogger.log(component, message, ERROR)
+
+    @staticmethod
+    def _ensure_writer():
+        with GlobalLogger._start_lock:
+            if GlobalLogger._writer is None or not GlobalLogger._writer.is_alive():
+                GlobalLogger._writer = threading.Thread(target=GlobalLogger._write_loop, name="LogWriter", daemon=True)
+                GlobalLogger._writer.start()
+                if not GlobalLogger._atexit:
+                    atexit.register(GlobalLogger.flush_and_stop)
+                    GlobalLogger._atexit = True
+
+    @staticmethod
+    def _format(item):
+        ts, level, component, message = item
+        prefix = f"[{time.strftime('%H:%M:%S', time.localtime(ts))}]"
+        if level != INFO:
+            prefix += f" [{LEVEL_NAMES.get(level, level)}]"
+        return f"{prefix} [{component}] {message}\n"
+
+    @staticmethod
+    def _rotate(f):
+        f.close()
+        path = Config.LOG_FILE_PATH
+        for i in range(Config.LOG_BACKUPS - 1, 0, -1):
+            if os.path.exists(f"{path}.{i}"):
+                os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+        if Config.LOG_BACKUPS > 0:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+        GlobalLogger.rotations += 1
+        return open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _write_loop():
+        q = GlobalLogger._queue
+        f = None
+        stop = False
+        while not stop:
+            try:
+                batch = [q.get(timeout=Config.LOG_FLUSH_INTERVAL)]
+            except queue.Empty:
+                continue
+            # Collect for up to one flush interval: one write + flush per batch
+            deadline = time.monotonic() + Config.LOG_FLUSH_INTERVAL
+            while len(batch) < 1000 and batch[-1] is not GlobalLogger._STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0: break
+                try:
+                    batch.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if GlobalLogger._STOP in batch:
+                stop = True
+                batch = [b for b in batch if b is not GlobalLogger._STOP]
+            try:
+                if f is not None and f.name != Config.LOG_FILE_PATH:
+                    f.close() # path changed under us
+                    f = None
+                if f is None:
+                    f = open(Config.LOG_FILE_PATH, "a", encoding="utf-8")
+                f.write("".join(GlobalLogger._format(item) for item in batch))
+                f.flush()
+                GlobalLogger.written += len(batch)
+                if Config.LOG_MAX_BYTES and f.tell() > Config.LOG_MAX_BYTES:
+                    f = GlobalLogger._rotate(f)
+            except Exception:
+                # Don't crash on log error; reopen next time
+                try:
+                    if f: f.close()
+                except Exception:
+                    pass
+                f = None
+        if f: f.close()
+
+    @staticmethod
+    def flush_and_stop(timeout=2.0):
+        """Write out everything queued so far (called at exit)."""
+        writer = GlobalLogger._writer
+        if writer is None or not writer.is_alive():
+            return
+        GlobalLogger._queue.put(GlobalLogger._STOP)
+        writer.join(timeout)
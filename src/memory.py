@@ -1,169 +1,377 @@
 import time
 import random
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from .logger import GlobalLogger
+from . import metrics
+from . import pacing
+from .config import Config
+from .state import GamePhase, probe_state
+from .elements import ElementCache
+
+GRID_CLASS = "MemoryGame-module__k2AJWG__grid"
+CARD_CLASS = "MemoryGame-module__k2AJWG__card"
+
+# Single-round-trip board extraction. Mirrors the old Selenium logic:
+# best grid = visible, opacity >= 0.5, highest z-index (last wins on ties);
+# cards = descendants with the card class minus Inner/Front/Back parts;
+# dedup by document coordinates, keeping the last card per slot.
+# Optional cache args (MemoryCache): the grid picked last time, reused while it
+# is still attached, usable and the grid count hasn't changed; and the known
+# back srcs, stripped in-page so face-down cards only send their face.
+SCAN_SCRIPT = """
+const gridClass = arguments[0], cardClass = arguments[1];
+const cachedGrid = arguments[2] || null, backs = new Set(arguments[3] || []), gridCount = arguments[4];
+const visible = el => !!(el.getClientRects().length) && getComputedStyle(el).visibility !== 'hidden';
+const usable = g => visible(g) && parseFloat(getComputedStyle(g).opacity || '1') >= 0.5;
+
+const grids = document.querySelectorAll('div[class*="' + gridClass + '"]');
+let best = null, reused = false;
+if (cachedGrid && cachedGrid.isConnected && grids.length === gridCount && usable(cachedGrid)) {
+    best = cachedGrid;
+    reused = true;
+} else {
+    let maxZ = -1;
+    for (const g of grids) {
+        if (!usable(g)) continue;
+        let z = parseInt(getComputedStyle(g).zIndex, 10);
+        if (isNaN(z)) z = 0;
+        if (z >= maxZ) { maxZ = z; best = g; }
+    }
+}
+if (!best) return {grids: grids.length, slots: null};
+
+const raw = best.querySelectorAll('div[class*="' + cardClass + '"]');
+const cards = [];
+for (const c of raw) {
+    const cls = c.getAttribute('class') || '';
+    if (!cls.includes('Inner') && !cls.includes('Front') && !cls.includes('Back')) cards.push(c);
+}
+
+const slots = new Map();
+for (const c of cards) {
+    if (!visible(c)) continue;
+    const r = c.getBoundingClientRect();
+    const key = Math.trunc(r.x + window.scrollX) + ',' + Math.trunc(r.y + window.scrollY);
+    slots.set(key, c);
+}
+
+let imgCount = 0, divCount = 0, backsSeen = 0;
+const out = [];
+for (const [key, card] of slots) {
+    const srcs = new Set();
+    for (const img of card.querySelectorAll('img')) {
+        imgCount++;
+        if (img.src) srcs.add(img.src);
+    }
+    for (const div of card.querySelectorAll('div')) {
+        divCount++;
+        const bg = getComputedStyle(div).backgroundImage;
+        if (bg && bg.includes('url')) srcs.add(bg);
+    }
+    let hasBack = false;
+    for (const b of backs) if (srcs.delete(b)) hasBack = true;
+    if (hasBack) backsSeen++;
+    out.push({key: key, element: card, srcs: Array.from(srcs)});
+}
+return {grids: grids.length, raw: raw.length, filtered: cards.length,
+        slots: out, counts: {imgs: imgCount, divs: divCount},
+        grid: best, grid_reused: reused, backs_seen: backsSeen};
+"""
+
+# In-page pair scheduler. For each pair: click card 1, wait for its flip to
+# settle, click card 2, wait again. "Settled" = CSS transitions/animations in
+# the card finished, or a class/style change with nothing left animating;
+# each wait is capped (firstCap / secondCap ms). Stops early if a dialog opens.
+SCHEDULE_SCRIPT = """
+const pairs = arguments[0], firstCap = arguments[1], secondCap = arguments[2];
+const done = arguments[arguments.length - 1];
+
+function dialogOpen() {
+    return Array.from(document.querySelectorAll('[role="dialog"]')).some(d => d.getClientRects().length);
+}
+function settle(card, cap) {
+    const start = performance.now();
+    return new Promise(resolve => {
+        let finished = false;
+        const finish = via => {
+            if (finished) return;
+            finished = true;
+            observer.disconnect();
+            card.removeEventListener('transitionend', onEnd, true);
+            card.removeEventListener('animationend', onEnd, true);
+            clearTimeout(timer);
+            resolve({ms: performance.now() - start, via: via});
+        };
+        const onEnd = () => {
+            const running = card.getAnimations ? card.getAnimations({subtree: true}) : [];
+            if (!running.length) finish('transition');
+        };
+        const observer = new MutationObserver(() => {
+            setTimeout(() => {
+                const running = card.getAnimations ? card.getAnimations({subtree: true}) : [];
+                if (!running.length) finish('mutation');
+                else Promise.all(running.map(a => a.finished)).then(() => finish('transition'), () => {});
+            }, 0);
+        });
+        observer.observe(card, {attributes: true, subtree: true, attributeFilter: ['class', 'style']});
+        card.addEventListener('transitionend', onEnd, true);
+        card.addEventListener('animationend', onEnd, true);
+        const timer = setTimeout(() => finish('timeout'), cap);
+    });
+}
+async function clickAndSettle(card, cap) {
+    card.scrollIntoView({block: 'center'});
+    const settled = settle(card, cap);
+    card.click();
+    return settled;
+}
+
+(async () => {
+    const timings = [];
+    try {
+        for (const [a, b] of pairs) {
+            if (dialogOpen()) { done({timings: timings, stopped: 'dialog'}); return; }
+            if (!a.isConnected || !b.isConnected) continue;
+            const first = await clickAndSettle(a, firstCap);
+            const second = await clickAndSettle(b, secondCap);
+            timings.push({first_ms: first.ms, first_via: first.via, second_ms: second.ms, second_via: second.via});
+        }
+    } catch (e) {
+        done({timings: timings, stopped: 'error', error: String(e)});
+        return;
+    }
+    done({timings: timings, stopped: dialogOpen() ? 'dialog' : null});
+})();
+"""
+
+def back_images(slots):
+    """The back image is whatever src shows up on more than 40% of the cards."""
+    all_src_counts = {}
+    for slot in slots:
+        for s in set(slot["srcs"]):
+            all_src_counts[s] = all_src_counts.get(s, 0) + 1
+    threshold = len(slots) * 0.4
+    back_srcs = {s for s, count in all_src_counts.items() if count > threshold}
+    if back_srcs:
+        GlobalLogger.debug("Memory", f"Identified Back Image patterns: {len(back_srcs)}")
+    return back_srcs
+
+
+def group_pairs(slots, back_srcs=None):
+    """
+    Groups scanned slots ({"element", "srcs"}) into {face_src: [elements]}.
+    back_srcs: known back images, derived from this board when not given.
+    """
+    if back_srcs is None:
+        back_srcs = back_images(slots)
+
+    pairs = {}
+    for slot in slots:
+        unique_faces = set(slot["srcs"]) - back_srcs
+        if len(unique_faces) >= 1:
+            face = sorted(unique_faces)[0]
+            if face not in pairs: pairs[face] = []
+            pairs[face].append(slot["element"])
+
+    GlobalLogger.debug("Memory", f"Pairs Analysis: Found {len(pairs)} unique faces.")
+    return pairs
+
+
+class MemoryCache:
+    """
+    What one session learns about the board and keeps across levels:
+    the chosen grid element, the card-back srcs and a face src -> small int
+    table. Each entry is dropped (and logged) as soon as the page disagrees.
+    """
+    MAX_FACE_IDS = 1024
+
+    def __init__(self):
+        self.grid = None
+        self.grid_count = None
+        self.card_count = None # cards on the last board that scanned stable
+        self.back_srcs = set()
+        self.face_ids = {}
+        self.hits = {"grid": 0, "backs": 0, "faces": 0}
+        self.invalidations = {"grid": 0, "backs": 0, "faces": 0}
+
+    def script_args(self):
+        return [self.grid, sorted(self.back_srcs), self.grid_count]
+
+    def invalidate(self, what, reason):
+        GlobalLogger.log("Memory", f"Cache invalidated: {what} ({reason}).")
+        self.invalidations[what] += 1
+        if what == "grid":
+            self.grid = self.grid_count = self.card_count = None
+        elif what == "backs":
+            self.back_srcs = set()
+        elif what == "faces":
+            self.face_ids = {}
+
+    def note_grid(self, scan):
+        if scan["grid_reused"]:
+            self.hits["grid"] += 1
+            return
+        if self.grid is not None:
+            self.invalidate("grid", "handle detached, hidden or grid count changed")
+        self.grid = scan["grid"]
+        self.grid_count = scan["grids"]
+
+    def settled(self, scan):
+        """Same grid and same card count as a board we already saw settle: no need to wait."""
+        return scan["grid_reused"] and scan["filtered"] == self.card_count
+
+    def group(self, scan):
+        """group_pairs with cached backs, keyed by face id instead of src."""
+        slots = scan["slots"]
+        self.card_count = scan["filtered"]
+        if self.back_srcs:
+            if scan.get("backs_seen"):
+                self.hits["backs"] += 1
+            else:
+                self.invalidate("backs", "no card shows the known back image")
+        if not self.back_srcs:
+            self.back_srcs = back_images(slots)
+
+        grouped = group_pairs(slots, self.back_srcs)
+        # Make room before numbering: a reset mid-loop would hand out ids already used in `pairs`
+        unknown = sum(face not in self.face_ids for face in grouped)
+        if len(self.face_ids) + unknown > self.MAX_FACE_IDS:
+            self.invalidate("faces", f"more than {self.MAX_FACE_IDS} faces")
+
+        pairs = {}
+        new = 0
+        for face, elements in grouped.items():
+            fid = self.face_ids.get(face)
+            if fid is None:
+                fid = self.face_ids[face] = len(self.face_ids)
+                new += 1
+            else:
+                self.hits["faces"] += 1
+            pairs[fid] = elements
+        if new:
+            GlobalLogger.debug("Memory", f"{new} new faces, {len(self.face_ids)} known.")
+        return pairs
+
+    def summary(self) -> str:
+        parts = [f"{k} {self.hits[k]} hits/{self.invalidations[k]} inv" for k in self.hits]
+        return f"Cache: {', '.join(parts)}, {len(self.face_ids)} face ids."
 
 class MemorySolver:
-    def __init__(self, browser_manager):
+    TAB_SCHEDULE_PAIRS = 2 # pairs per scheduled script when sharing a Chrome
+
+    def __init__(self, browser_manager, elements: ElementCache = None):
         self.browser = browser_manager
+        self._script_timeout = 30 # Selenium default for async scripts
+        self.cache = MemoryCache()
+        self.elements = elements or ElementCache(browser_manager.driver)
+
+    def _scan(self, driver):
+        try:
+            return driver.execute_script(SCAN_SCRIPT, GRID_CLASS, CARD_CLASS, *self.cache.script_args())
+        except StaleElementReferenceException:
+            self.cache.invalidate("grid", "handle went stale")
+            return driver.execute_script(SCAN_SCRIPT, GRID_CLASS, CARD_CLASS, *self.cache.script_args())
 
     def scan_board(self):
         try:
-            # 1. Find all potential grid containers
             driver = self.browser.driver
-            grids = driver.find_elements(By.XPATH, "//div[contains(@class, 'MemoryGame-module__k2AJWG__grid')]")
-            GlobalLogger.log("Memory", f"Found {len(grids)} potential grids.")
-            
-            best_grid = None
-            max_z = -1
-            
-            # 2. Select the "best" grid (Highest Z-Index/DOM order + Visible)
-            for grid in grids:
-                if not grid.is_displayed(): continue
-                
-                # Check Opacity
-                op = grid.value_of_css_property("opacity") or "1"
-                if float(op) < 0.5: continue
-                
-                # Z-Index check
-                try: z = int(grid.value_of_css_property("z-index"))
-                except: z = 0
-                
-                if z >= max_z:
-                    max_z = z
-                    best_grid = grid
 
-            if not best_grid:
-                GlobalLogger.log("Memory", "No valid best_grid found.")
-                return None
+            # Grid pick, card filter, coordinate dedup and src extraction all
+            # happen in-page: one round trip per stability attempt.
+            # The cache lets the page skip the grid pick and drop back srcs.
+            # Re-scan with backoff (50ms, 100ms, ...) within the old 1s budget
+            scan = None
+            backoff = pacing.Backoff(start=0.05, cap=0.5)
+            deadline = time.time() + 1.0
+            while True:
+                scan = self._scan(driver)
+                if scan is None or scan["slots"] is None:
+                    GlobalLogger.log("Memory", f"Found {scan['grids'] if scan else 0} potential grids. No valid best_grid found.")
+                    return None
+                self.cache.note_grid(scan)
 
-            # 3. Find cards with STABILITY CHECK
-            cards = []
-            for _ in range(3):
-                raw_cards = best_grid.find_elements(By.XPATH, ".//div[contains(@class, 'MemoryGame-module__k2AJWG__card')]")
-                
-                # Filter strict
-                cards = []
-                for c in raw_cards:
-                    try:
-                        cls = c.get_attribute("class")
-                        if "Inner" not in cls and "Front" not in cls and "Back" not in cls:
-                            cards.append(c)
-                    except: pass
-                    
-                count = len(cards)
-                GlobalLogger.log("Memory", f"Scan Attempt: Raw={len(raw_cards)}, Filtered={count}")
-                if count > 10: 
-                    GlobalLogger.log("Memory", f"Stability check pass: {count} cards (Filtered).")
-                    break 
-                GlobalLogger.log("Memory", f"Stability check wait... ({count} cards)")
-                time.sleep(0.5)
-            
-            if not cards: 
+                count = scan["filtered"]
+                GlobalLogger.debug("Memory", f"Scan Attempt: Grids={scan['grids']}, Raw={scan['raw']}, Filtered={count}")
+                if count > 10 or self.cache.settled(scan):
+                    GlobalLogger.debug("Memory", f"Stability check pass: {count} cards (Filtered).")
+                    break
+                if time.time() >= deadline:
+                    break
+                GlobalLogger.debug("Memory", f"Stability check wait... ({count} cards)")
+                pacing.current().sleep(min(backoff.next(), deadline - time.time()))
+
+            if not scan["filtered"]:
                 GlobalLogger.log("Memory", "Scan failed: No cards found after stability check.")
                 return None
 
-            # --- CHEAT LOGIC: COORDINATE DEDUPLICATION ---
-            slots = {} # "x,y" -> list of elements
-            
-            for card in cards:
-                if not card.is_displayed(): continue
-                rect = card.rect
-                x, y = int(rect['x']), int(rect['y'])
-                key = f"{x},{y}"
-                if key not in slots: slots[key] = []
-                slots[key].append(card)
-                
-            GlobalLogger.log("Memory", f"Coordinate Dedup: Found {len(slots)} unique slots from {len(cards)} elements.")
-            
-            card_data = [] 
-            all_src_counts = {}
-            
-            for key, slot_cards in slots.items():
-                active_card = slot_cards[-1]
-                srcs = set()
-                
-                # Image Tags
-                imgs = active_card.find_elements(By.TAG_NAME, "img")
-                for img in imgs:
-                    s = img.get_attribute("src")
-                    if s: 
-                        srcs.add(s)
-                        all_src_counts[s] = all_src_counts.get(s, 0) + 1
-                
-                # Background Images
-                divs = active_card.find_elements(By.TAG_NAME, "div")
-                for div in divs:
-                    bg = div.value_of_css_property("background-image")
-                    if bg and "url" in bg:
-                        s = bg
-                        srcs.add(s)
-                        all_src_counts[s] = all_src_counts.get(s, 0) + 1
-                
-                card_data.append({"element": active_card, "srcs": srcs})
-
-            # Identify Back Image
-            threshold = len(card_data) * 0.4 
-            back_srcs = {s for s, count in all_src_counts.items() if count > threshold}
-            if back_srcs:
-                GlobalLogger.log("Memory", f"Identified Back Image patterns: {len(back_srcs)}")
-            
-            # Group Pairs
-            pairs = {}
-            for item in card_data:
-                unique_faces = item["srcs"] - back_srcs
-                if len(unique_faces) >= 1:
-                    face = list(unique_faces)[0]
-                    if face not in pairs: pairs[face] = []
-                    pairs[face].append(item["element"])
-
-            GlobalLogger.log("Memory", f"Pairs Analysis: Found {len(pairs)} unique faces.")
-            return pairs
+            slots = scan["slots"]
+            GlobalLogger.debug("Memory", f"Coordinate Dedup: Found {len(slots)} unique slots from {scan['filtered']} elements.")
+            GlobalLogger.debug("Memory", f"Scan used 1 round trip instead of ~{self._legacy_round_trips(scan)}.")
+
+            return self.cache.group(scan)
 
         except Exception as e:
             GlobalLogger.log("Memory", f"CRASH in scan_board: {e}")
             return None
 
+    @staticmethod
+    def _legacy_round_trips(scan):
+        """
+        WebDriver calls the old per-element scan would have made for the same board:
+        find grids + 3 checks per grid, find cards + class read per card,
+        is_displayed + rect per card, and per slot two finds + one read per img/div.
+        """
+        c = scan["counts"]
+        return (1 + 3 * scan["grids"]
+                + 1 + scan["raw"]
+                + 2 * scan["filtered"]
+                + 2 * len(scan["slots"]) + c["imgs"] + c["divs"])
+
     def solve_level(self):
-        GlobalLogger.log("Memory", "Starting solve_level()...")
+        GlobalLogger.debug("Memory", "Starting solve_level()...")
+        started = time.perf_counter()
         pairs = self.scan_board()
+        metrics.current().observe("scan_seconds", time.perf_counter() - started)
         
         if not pairs:
             GlobalLogger.log("Memory", "Abort: No pairs returned from scan.")
             return False
 
+        # scan_board only returns displayed cards, no need to re-check each one
         active_pairs = {}
-        for src, cards in pairs.items():
-            valid_cards = [c for c in cards if c.is_displayed()] 
-            if len(valid_cards) >= 2:
-                active_pairs[src] = valid_cards[:2]
+        for face_id, cards in pairs.items():
+            if len(cards) >= 2:
+                active_pairs[face_id] = cards[:2]
         
         if not active_pairs:
             GlobalLogger.log("Memory", "Abort: No active pairs found (all filtered or single).")
             return False
 
-        GlobalLogger.log("Memory", f"Action: Matching {len(active_pairs)} pairs.")
+        GlobalLogger.debug("Memory", f"Action: Matching {len(active_pairs)} pairs.")
+        if Config.MEMORY_CLICK_MODE == "scheduled":
+            return self._click_pairs_scheduled(list(active_pairs.values()))
+
         from selenium.common.exceptions import ElementClickInterceptedException
 
+        # Blind sleeps: nothing tells us whether a flip had settled, so these stay fixed
+        first_pause, second_pause = (ms / 1000.0 for ms in Config.MEMORY_FLIP_CAPS_MS)
         for i, (src, cards) in enumerate(active_pairs.items()):
             try:
                 card1, card2 = cards
-                GlobalLogger.log("Memory", f"Clicking Pair {i+1}: {card1.location} & {card2.location}")
+                GlobalLogger.debug("Memory", f"Clicking Pair {i+1}: {card1.location} & {card2.location}")
                 
                 self.browser.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", card1)
                 card1.click()
-                time.sleep(0.4) 
+                pacing.current().sleep(first_pause)
                 
                 self.browser.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", card2)
                 card2.click()
-                time.sleep(0.6) 
+                metrics.current().inc("pair_clicks_total")
+                pacing.current().sleep(second_pause)
                 
             except ElementClickInterceptedException:
+                # Leave the dialog to the worker's ADVANCE state (it counts the level)
                 GlobalLogger.log("Memory", "Click Intercepted! Dialog might be open.")
-                if self.wait_for_next_level(): return True
                 return False
             except Exception as e:
                 GlobalLogger.log("Memory", f"Match Error: {e}")
@@ -171,37 +379,91 @@ class MemorySolver:
         
         return True
 
-    def wait_for_next_level(self):
+    def _click_pairs_scheduled(self, pairs):
+        """
+        Sends the whole match plan to the page in one execute_async_script.
+        The page clicks each card as soon as the previous flip has settled
+        (transition/animation end or class change), capped per flip.
+        The caps are learned from the measured settle times (recent peak +
+        25%); a flip that runs into the cap is a failure (cap doubles, up to
+        Config.MEMORY_FLIP_CAPS_MS).
+        With windows sharing a Chrome (Config.TABS_PER_BROWSER > 1) the plan
+        goes out TAB_SCHEDULE_PAIRS at a time, so other windows get the
+        host's command lock in between.
+        """
+        pacer = pacing.current()
+        first_cap = pacer.value("memory.flip_first") * 1000
+        second_cap = pacer.value("memory.flip_second") * 1000
+        chunk = self.TAB_SCHEDULE_PAIRS if Config.TABS_PER_BROWSER > 1 else max(1, len(pairs))
+        # Worst case every flip hits its cap; leave slack for scrolling
+        budget = min(chunk, len(pairs)) * sum(Config.MEMORY_FLIP_CAPS_MS) / 1000.0 + 5
+        timings = []
+        result = {}
         try:
-            xpath = "//div[@role='dialog']//button"
-            GlobalLogger.log("Memory", "Checking for Next Level dialog...")
-            
-            # Short wait check
-            try:
-                WebDriverWait(self.browser.driver, 2).until(
-                    EC.element_to_be_clickable((By.XPATH, xpath))
-                )
-            except:
-                pass # Just continue to check elements
-            
-            btns = self.browser.driver.find_elements(By.XPATH, xpath)
-            for btn in btns:
-                txt = btn.text.lower()
-                GlobalLogger.log("Memory", f"Dialog Button found: '{btn.text}'")
-                if "next" in txt or "play again" in txt or "ready" in txt or "close" in txt or "try again" in txt:
-                    GlobalLogger.log("Memory", f"CLICKING NEXT LEVEL: {btn.text}")
-                    btn.click()
-                    return True
-            
-            return False
+            if budget > self._script_timeout:
+                self.browser.driver.set_script_timeout(budget)
+                self._script_timeout = budget
+            for i in range(0, len(pairs), chunk):
+                result = self.browser.driver.execute_async_script(SCHEDULE_SCRIPT, pairs[i:i + chunk], first_cap, second_cap)
+                timings += result.get("timings") or []
+                if result.get("stopped"):
+                    break
         except Exception as e:
-            GlobalLogger.log("Memory", f"NextLevel Error: {e}")
+            GlobalLogger.log("Memory", f"Scheduled Match Error: {e}")
+            return True
+
+        metrics.current().inc("pair_clicks_total", len(timings))
+        for t in timings:
+            for key, flip in (("memory.flip_first", "first"), ("memory.flip_second", "second")):
+                if t[f"{flip}_via"] == "timeout":
+                    pacer.failure(key)
+                else:
+                    pacer.measured(key, t[f"{flip}_ms"] / 1000.0)
+        if timings:
+            total = sum(t["first_ms"] + t["second_ms"] for t in timings)
+            capped = sum((t["first_via"] == "timeout") + (t["second_via"] == "timeout") for t in timings)
+            GlobalLogger.log("Memory", f"Scheduled {len(timings)}/{len(pairs)} pairs in {total:.0f}ms "
+                                       f"(avg {total / len(timings):.0f}ms/pair, {capped} flips hit the cap).")
+        if result.get("stopped") == "dialog":
+            # Nothing left to click; ADVANCE takes the dialog from here
+            GlobalLogger.log("Memory", "Dialog opened mid-plan.")
             return False
+        return True
+
+    def probe_state(self) -> GamePhase:
+        return probe_state(self.browser.driver)
 
-    def is_game_over(self):
+    def wait_for_next_level(self, phase: GamePhase = None):
+        """
+        Clicks through the level-complete dialog.
+        Only touches the dialog buttons when the probe says one is open.
+        """
         try:
-            over = "TIME'S UP" in self.browser.driver.page_source
-            if over: GlobalLogger.log("Memory", "GAME OVER detected.")
-            return over
-        except:
+            if phase is None:
+                phase = self.probe_state()
+            if phase != GamePhase.LEVEL_COMPLETE:
+                return False
+
+            GlobalLogger.debug("Memory", "Checking for Next Level dialog...")
+            return self.elements.use("dialog_buttons", self._click_next_button)
+        except Exception as e:
+            GlobalLogger.log("Memory", f"NextLevel Error: {e}")
             return False
+
+    def _click_next_button(self, btns):
+        for btn in btns:
+            txt = btn.text.lower()
+            GlobalLogger.debug("Memory", f"Dialog Button found: '{btn.text}'")
+            if "next" in txt or "play again" in txt or "ready" in txt or "close" in txt or "try again" in txt:
+                GlobalLogger.log("Memory", f"CLICKING NEXT LEVEL: {btn.text}")
+                GlobalLogger.debug("Memory", self.cache.summary())
+                btn.click()
+                return True
+        return False
+
+    def is_game_over(self, phase: GamePhase = None):
+        if phase is None:
+            phase = self.probe_state()
+        over = phase == GamePhase.GAME_OVER
+        if over: GlobalLogger.log("Memory", "GAME OVER detected.")
+        return over
@@ -0,0 +1,175 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .config import Config
+from .logger import GlobalLogger
+
+# name -> (type, help)
+METRICS = {
+    "levels_solved_total": ("counter", "Levels completed."),
+    "swaps_total": ("counter", "Puzzle swaps performed."),
+    "pair_clicks_total": ("counter", "Memory pairs clicked."),
+    "stuck_reloads_total": ("counter", "Recoveries (state deadlines, stalls, repeated errors)."),
+    "browser_restarts_total": ("counter", "Browsers replaced after a failure."),
+    "recovery_steps_total": ("counter", "Recovery actions by step (reload / new_window / restart)."),
+    "stalls_total": ("counter", "Stalls caught by the page heartbeat, by reason."),
+    "command_timeouts_total": ("counter", "WebDriver commands that ran past their deadline."),
+    "scan_seconds": ("histogram", "Board scan duration."),
+    "webdriver_command_seconds": ("histogram", "WebDriver command round-trip latency."),
+    "element_lookups_total": ("counter", "Cached element lookups by selector and result (hit / miss / stale)."),
+    "idle_seconds_total": ("counter", "Time spent waiting (event channel, paced sleeps, backoff)."),
+    "last_activity_timestamp_seconds": ("gauge", "Unix time of the worker's last progress."),
+}
+PREFIX = "tarabean_"
+
+SCAN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+COMMAND_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+BUCKETS = {"scan_seconds": SCAN_BUCKETS, "webdriver_command_seconds": COMMAND_BUCKETS}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # last = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class WorkerMetrics:
+    """
+    Counters/histograms for one worker. Updates are plain attribute bumps
+    (no lock, no I/O); the HTTP thread renders a snapshot on scrape.
+    Extra labels (e.g. the difficulty actually picked) get their own series.
+    """
+    def __init__(self, **labels):
+        self.labels = labels
+        self.counters = {} # (name, extra labels) -> value
+        self.histograms = {}
+        self.gauges = {}
+
+    def inc(self, name, n=1, **extra):
+        key = (name, tuple(sorted(extra.items())))
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def observe(self, name, value, **extra):
+        key = (name, tuple(sorted(extra.items())))
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = Histogram(BUCKETS.get(name, SCAN_BUCKETS))
+        hist.observe(value)
+
+    def set(self, name, value):
+        self.gauges[(name, ())] = value
+
+
+class _NullMetrics(WorkerMetrics):
+    def inc(self, name, n=1, **extra): pass
+    def observe(self, name, value, **extra): pass
+    def set(self, name, value): pass
+
+
+NULL = _NullMetrics()
+_registry = []
+_registry_lock = threading.Lock()
+_local = threading.local()
+
+
+def register(wm):
+    with _registry_lock:
+        _registry.append(wm)
+    return wm
+
+
+def unregister(wm):
+    with _registry_lock:
+        if wm in _registry:
+            _registry.remove(wm)
+
+
+def bind(wm):
+    """Attach `wm` to the calling thread: solvers and the transport report through current()."""
+    _local.metrics = wm
+
+
+def current():
+    return getattr(_local, "metrics", NULL)
+
+
+def _labels(base, extra):
+    items = list(base.items()) + list(extra)
+    if not items: return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in items) + "}"
+
+
+def render():
+    """Prometheus text exposition format."""
+    with _registry_lock:
+        workers = list(_registry)
+    series = {name: [] for name in METRICS}
+    for wm in workers:
+        for (name, extra), value in list(wm.counters.items()) + list(wm.gauges.items()):
+            series.setdefault(name, []).append(f"{PREFIX}{name}{_labels(wm.labels, extra)} {value}")
+        for (name, extra), hist in list(wm.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(list(hist.buckets) + ["+Inf"], hist.counts):
+                cumulative += count
+                le = extra + (("le", bound),)
+                series[name].append(f"{PREFIX}{name}_bucket{_labels(wm.labels, le)} {cumulative}")
+            series[name].append(f"{PREFIX}{name}_sum{_labels(wm.labels, extra)} {hist.sum}")
+            series[name].append(f"{PREFIX}{name}_count{_labels(wm.labels, extra)} {hist.count}")
+
+    out = []
+    for name, lines in series.items():
+        kind, help_text = METRICS.get(name, ("untyped", ""))
+        out.append(f"# HELP {PREFIX}{name} {help_text}")
+        out.append(f"# TYPE {PREFIX}{name} {kind}")
+        out.extend(lines)
+    return "\n".join(out) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # scrapes every few seconds would flood the log
+
+
+class MetricsServer:
+    """GET http://<Config.METRICS_HOST>:<Config.METRICS_PORT>/metrics"""
+    def __init__(self, host=None, port=None):
+        self.host = host or Config.METRICS_HOST
+        self.port = Config.METRICS_PORT if port is None else port
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        try:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        except OSError as e:
+            GlobalLogger.log("Metrics", f"Could not bind {self.host}:{self.port}: {e}")
+            return False
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="Metrics", daemon=True)
+        self.thread.start()
+        GlobalLogger.log("Metrics", f"Serving on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
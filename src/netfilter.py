@@ -0,0 +1,96 @@
+import json
+import time
+from .config import Config
+from .logger import GlobalLogger
+
+
+def blocked_urls(game_type):
+    """Config.NETWORK_BLOCK_COMMON + the game's own deny list (Network.setBlockedURLs patterns)."""
+    return list(Config.NETWORK_BLOCK_COMMON) + list(Config.NETWORK_BLOCK.get(game_type, []))
+
+
+class NetworkStats:
+    """
+    Blocked vs loaded requests for one worker. Fed with raw CDP Network
+    events, from Selenium's performance log or the async engine's websocket.
+    Blocked requests never report a size, so "saved" is an estimate from
+    Config.NETWORK_BYTES_ESTIMATE per resource type.
+    """
+    def __init__(self):
+        self.types = {} # requestId -> resource type, until it finishes/fails
+        self.blocked = 0
+        self.blocked_bytes = 0
+        self.blocked_by_type = {}
+        self.loaded = 0
+        self.loaded_bytes = 0
+
+    def record(self, method, params):
+        if method == "Network.requestWillBeSent":
+            self.types[params.get("requestId")] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            self.types.pop(params.get("requestId"), None)
+            self.loaded += 1
+            self.loaded_bytes += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed":
+            rtype = self.types.pop(params.get("requestId"), None) or params.get("type", "Other")
+            if params.get("blockedReason"):
+                self.blocked += 1
+                self.blocked_by_type[rtype] = self.blocked_by_type.get(rtype, 0) + 1
+                est = Config.NETWORK_BYTES_ESTIMATE
+                self.blocked_bytes += est.get(rtype, est.get("Other", 0))
+
+    def summary(self):
+        return (f"net: blocked {self.blocked} (~{self.blocked_bytes / 2**20:.1f}MB saved) | "
+                f"loaded {self.loaded} ({self.loaded_bytes / 2**20:.1f}MB)")
+
+
+def attach(browser, game_type, stats):
+    """NetworkFilter for this browser's window; applies the block list unless it is already there."""
+    nf = NetworkFilter(browser.driver, game_type, stats)
+    if getattr(browser, "net_filtered", None) != game_type:
+        nf.apply()
+        browser.net_filtered = game_type
+    return nf
+
+
+class NetworkFilter:
+    """
+    Per-game request blocking on a Selenium driver (execute_cdp_cmd), with
+    counters read back from the performance log (BrowserManager turns it on
+    when Config.NETWORK_FILTER is set).
+
+    Only deny lists: allow-listing needs Fetch interception, which needs an
+    event stream execute_cdp_cmd doesn't give us. The block list lives on
+    the page target, so it survives reloads and is applied once per window.
+    """
+    COLLECT_INTERVAL = 5.0
+
+    def __init__(self, driver, game_type, stats):
+        self.driver = driver
+        self.game_type = game_type
+        self.stats = stats
+        self.last_collect = 0.0
+
+    def apply(self):
+        urls = blocked_urls(self.game_type)
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+        GlobalLogger.log("NetFilter", f"{self.game_type}: blocking {len(urls)} URL patterns.")
+
+    def collect(self, force=False):
+        """Drain the performance log into the stats (throttled; also keeps chromedriver's buffer small)."""
+        now = time.time()
+        if not force and now - self.last_collect < self.COLLECT_INTERVAL:
+            return
+        self.last_collect = now
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception:
+            return
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            if msg.get("method", "").startswith("Network."):
+                self.stats.record(msg["method"], msg.get("params", {}))
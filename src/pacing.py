@@ -0,0 +1,171 @@
+import random
+import threading
+import time
+from .config import Config
+from . import metrics
+
+
+def jitter():
+    return random.uniform(0, Config.MAX_JITTER) if Config.MAX_JITTER > 0 else 0.0
+
+
+class Backoff:
+    """Bounded exponential backoff: start, start*factor, ... up to cap. reset() after progress."""
+    def __init__(self, start=0.05, cap=0.5, factor=2.0):
+        self.start = start
+        self.cap = cap
+        self.factor = factor
+        self.current = start
+
+    def next(self) -> float:
+        delay = self.current
+        self.current = min(self.cap, self.current * self.factor)
+        return delay
+
+    def reset(self):
+        self.current = self.start
+
+
+class AdaptiveDelay:
+    """
+    A delay that learns how short it can be. Each success takes `step`
+    off it (additive decrease), each failure doubles it (multiplicative
+    increase), kept within [floor, ceiling].
+    A failure also remembers the value that failed; successes then stop
+    25% above it instead of walking straight back into it. That mark
+    decays every PROBE_AFTER successes, so the limit gets re-probed now
+    and then. Also keeps a smoothed failure rate.
+    Waits whose real length can be measured use measured() instead of
+    success(): the value then follows the recent peak plus the margin.
+    """
+    MARGIN = 1.25
+    PROBE_AFTER = 100
+    PEAK_DECAY = 0.98 # per measurement, so one slow outlier fades out
+
+    def __init__(self, initial, floor, ceiling, step=None):
+        self.value = initial
+        self.floor = floor
+        self.ceiling = ceiling
+        self.step = step if step is not None else initial * 0.05
+        self.failed_at = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.failure_rate = 0.0 # EWMA, alpha 0.1
+        self.peak = 0.0
+
+    def success(self):
+        self.successes += 1
+        self.failure_rate *= 0.9
+        if self.successes % self.PROBE_AFTER == 0:
+            self.failed_at *= 0.9
+        lowest = max(self.floor, self.failed_at * self.MARGIN)
+        self.value = max(lowest, self.value - self.step)
+
+    def measured(self, seconds):
+        """A wait that ended on its own after `seconds`: keep the value just above what it really takes."""
+        self.successes += 1
+        self.failure_rate *= 0.9
+        self.peak = max(seconds, self.peak * self.PEAK_DECAY)
+        self.value = min(self.ceiling, max(self.floor, self.peak * self.MARGIN))
+
+    def failure(self):
+        self.failures += 1
+        self.failure_rate = self.failure_rate * 0.9 + 0.1
+        self.failed_at = self.value
+        self.value = min(self.ceiling, self.value * 2)
+
+    def __repr__(self):
+        return f"{self.value * 1000:.0f}ms ({self.successes}/{self.failures} ok/fail, {self.failure_rate:.0%} recent)"
+
+
+def delay_limits(key):
+    """(initial, floor, ceiling) in seconds. Initial = the old fixed value."""
+    first_cap, second_cap = (ms / 1000.0 for ms in Config.MEMORY_FLIP_CAPS_MS)
+    return {
+        "puzzle.drag_pause": (0.01, 0.002, 0.1), # input_backend.DRAG_PAUSE
+        "memory.flip_first": (first_cap, 0.1, first_cap),
+        "memory.flip_second": (second_cap, 0.1, second_cap),
+    }[key]
+
+
+class Pacer:
+    """
+    Pacing for one worker: learned delays per key (game-prefixed, so each
+    worker learns each game separately), sleeps with Config.MAX_JITTER
+    added, and the share of wall-clock time spent waiting.
+    """
+    def __init__(self):
+        self.delays = {}
+        self.started = time.time()
+        self.idle_time = 0.0
+        self.lock = threading.Lock()
+
+    def delay(self, key) -> AdaptiveDelay:
+        d = self.delays.get(key)
+        if d is None:
+            d = self.delays[key] = AdaptiveDelay(*delay_limits(key))
+        return d
+
+    def value(self, key) -> float:
+        return self.delay(key).value
+
+    def success(self, key):
+        self.delay(key).success()
+
+    def measured(self, key, seconds):
+        self.delay(key).measured(seconds)
+
+    def failure(self, key):
+        self.delay(key).failure()
+
+    def sleep(self, seconds, stop_event=None):
+        seconds += jitter()
+        start = time.perf_counter()
+        if stop_event is not None:
+            stop_event.wait(seconds)
+        else:
+            time.sleep(seconds)
+        self.idle(time.perf_counter() - start)
+
+    def idle(self, seconds):
+        """Count time spent waiting elsewhere (event channel, page load)."""
+        with self.lock:
+            self.idle_time += seconds
+        metrics.current().inc("idle_seconds_total", seconds)
+
+    def idle_fraction(self) -> float:
+        wall = time.time() - self.started
+        return min(1.0, self.idle_time / wall) if wall > 0 else 0.0
+
+    def summary(self) -> str:
+        learned = ", ".join(f"{k} {d!r}" for k, d in sorted(self.delays.items()))
+        return f"idle {self.idle_fraction():.0%}" + (f"; {learned}" if learned else "")
+
+
+def poll(condition, timeout, backoff=None, stop_event=None):
+    """
+    Calls condition() until it returns something truthy or `timeout` passes,
+    sleeping with bounded exponential backoff in between (counted as idle).
+    Returns the last result.
+    """
+    backoff = backoff or Backoff()
+    deadline = time.time() + timeout
+    while True:
+        result = condition()
+        remaining = deadline - time.time()
+        if result or remaining <= 0 or (stop_event is not None and stop_event.is_set()):
+            return result
+        current().sleep(min(backoff.next(), remaining), stop_event)
+
+
+_local = threading.local()
+_default = Pacer()
+
+
+def bind(pacer):
+    """Attach `pacer` to the calling thread: solvers pace through current()."""
+    _local.pacer = pacer
+
+
+def current() -> Pacer:
+    return getattr(_local, "pacer", _default)
@@ -0,0 +1,81 @@
+from collections import deque
+from typing import List, Tuple
+
+
+def build_permutation(targets: List[int]) -> List[int]:
+    """
+    Turns a list of target slots (targets[slot] = where the piece in `slot` belongs)
+    into a valid permutation of range(n).
+    Out-of-range or duplicated targets (grid detection noise) are given the
+    leftover free slots in order, so the planner always terminates.
+    """
+    n = len(targets)
+    perm = [-1] * n
+    taken = [False] * n
+    for slot, t in enumerate(targets):
+        if 0 <= t < n and not taken[t]:
+            perm[slot] = t
+            taken[t] = True
+
+    free = (t for t in range(n) if not taken[t])
+    for slot in range(n):
+        if perm[slot] == -1:
+            perm[slot] = next(free)
+    return perm
+
+
+def plan_swaps(targets: List[int]) -> List[Tuple[int, int]]:
+    """
+    Cycle decomposition of the board permutation.
+    Returns the minimum list of (src_slot, dst_slot) swaps (n - cycles):
+    each swap sends the piece sitting in src_slot to its final place dst_slot.
+    """
+    perm = build_permutation(targets)
+    swaps = []
+    for start in range(len(perm)):
+        # Rotate the cycle through `start` until the piece parked there is home
+        while perm[start] != start:
+            dst = perm[start]
+            swaps.append((start, dst))
+            perm[start], perm[dst] = perm[dst], perm[start]
+    return swaps
+
+
+def count_cycles(targets: List[int]) -> int:
+    perm = build_permutation(targets)
+    seen = [False] * len(perm)
+    cycles = 0
+    for i in range(len(perm)):
+        if seen[i]: continue
+        cycles += 1
+        while not seen[i]:
+            seen[i] = True
+            i = perm[i]
+    return cycles
+
+
+class SwapPlan:
+    """
+    A full solve plan that survives batch boundaries.
+    The solver takes BATCH_SIZE swaps at a time instead of rescanning the DOM
+    and rebuilding the plan after every batch.
+    """
+    def __init__(self, swaps: List[Tuple[int, int]]):
+        self.pending = deque(swaps)
+        self.total = len(swaps)
+
+    @classmethod
+    def from_targets(cls, targets: List[int]) -> "SwapPlan":
+        return cls(plan_swaps(targets))
+
+    def take(self, count: int) -> List[Tuple[int, int]]:
+        batch = []
+        while self.pending and len(batch) < count:
+            batch.append(self.pending.popleft())
+        return batch
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __bool__(self):
+        return bool(self.pending)
@@ -0,0 +1,195 @@
+import threading
+import time
+from .browser import BrowserManager
+from .config import Config
+from .logger import GlobalLogger
+from .netfilter import NetworkStats, attach
+
+# Pool browsers get their own profile slots, clear of real worker ids
+POOL_PROFILE_BASE = 1000
+
+
+def game_url(game_type):
+    return Config.PUZZLE_URL if game_type == "PUZZLE" else Config.MEMORY_URL
+
+
+class BrowserPool:
+    """
+    Keeps Config.POOL_SIZE Chromes launched and parked on a game page.
+    checkout() hands one out straight away (cold launch only if the pool is
+    empty); checkin() returns it and a background thread resets it, health
+    checks it and tops the pool back up.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = BrowserPool()
+            return cls._instance
+
+    @classmethod
+    def running(cls):
+        return cls._instance is not None
+
+    def __init__(self, size=None):
+        self.size = Config.POOL_SIZE if size is None else size
+        self.ready = [] # parked BrowserManagers
+        self.returned = [] # checked in, waiting for reset
+        self.launching = 0
+        self.free_slots = []
+        self.next_slot = POOL_PROFILE_BASE + 1
+        self.warm_game = Config.POOL_WARM_GAME
+        self.cond = threading.Condition()
+        self.stop_event = threading.Event()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.netstats = NetworkStats() # warm-up traffic, not charged to any worker
+
+        self.thread = threading.Thread(target=self._refill_loop, name="BrowserPool", daemon=True)
+        self.thread.start()
+
+    def _slot(self):
+        with self.cond:
+            if self.free_slots:
+                return self.free_slots.pop()
+            slot = self.next_slot
+            self.next_slot += 1
+            return slot
+
+    def _launch(self, game_type):
+        """Cold path: profile + driver + Chrome + navigate."""
+        browser = BrowserManager(worker_id=self._slot())
+        if not browser.start():
+            self._discard(browser)
+            return None
+        try:
+            if Config.NETWORK_FILTER:
+                attach(browser, game_type, self.netstats)
+            browser.navigate_to(game_url(game_type))
+            browser.warm_url = game_url(game_type)
+        except Exception as e:
+            GlobalLogger.log("Pool", f"Warm navigate failed: {e}")
+        return browser
+
+    def _discard(self, browser):
+        browser.stop()
+        self.discarded += 1
+        with self.cond:
+            self.free_slots.append(browser.worker_id)
+
+    def _healthy(self, browser):
+        try:
+            return browser.driver is not None and browser.driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+
+    def _reset(self, browser):
+        """Back to a single tab on a warm game page. False = throw it away."""
+        try:
+            driver = browser.driver
+            handles = driver.window_handles
+            for h in handles[1:]:
+                driver.switch_to.window(h)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            if Config.NETWORK_FILTER:
+                attach(browser, self.warm_game, self.netstats).collect(force=True) # drop the last worker's log
+            driver.get(game_url(self.warm_game))
+            browser.warm_url = game_url(self.warm_game)
+            return True
+        except Exception as e:
+            GlobalLogger.log("Pool", f"Reset failed for slot {browser.worker_id}: {e}")
+            return False
+
+    def checkout(self, game_type):
+        """Returns a started BrowserManager, preferring one already parked on this game."""
+        url = game_url(game_type)
+        started = time.time()
+        with self.cond:
+            self.warm_game = game_type # refills follow what is being asked for
+            browser = next((b for b in self.ready if b.warm_url == url), None) or (self.ready[0] if self.ready else None)
+            if browser:
+                self.ready.remove(browser)
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.cond.notify_all()
+        if browser is None:
+            browser = self._launch(game_type)
+        GlobalLogger.log("Pool", f"Checkout {game_type} in {time.time() - started:.2f}s "
+                                 f"({'warm' if browser and browser.warm_url == url else 'cold'}), {self.summary()}")
+        return browser
+
+    def checkin(self, browser):
+        """Give a browser back. Resetting happens on the pool thread."""
+        if browser is None or browser.driver is None:
+            return
+        with self.cond:
+            self.returned.append(browser)
+            self.cond.notify_all()
+
+    def _refill_loop(self):
+        while not self.stop_event.is_set():
+            with self.cond:
+                self.cond.wait_for(lambda: self.stop_event.is_set() or self.returned or
+                                   len(self.ready) + self.launching < self.size, timeout=10)
+                if self.stop_event.is_set(): break
+                browser = self.returned.pop(0) if self.returned else None
+                need = browser is None and len(self.ready) + self.launching < self.size
+                if need: self.launching += 1
+                game = self.warm_game
+
+            if browser is not None:
+                if self._healthy(browser) and self._reset(browser):
+                    with self.cond:
+                        if len(self.ready) < self.size:
+                            self.ready.append(browser)
+                            browser = None
+                if browser is not None:
+                    self._discard(browser)
+            elif need:
+                parked = False
+                try:
+                    browser = self._launch(game)
+                finally:
+                    with self.cond:
+                        self.launching -= 1
+                        if browser and not self.stop_event.is_set():
+                            self.ready.append(browser)
+                            parked = True
+                if browser is None:
+                    self.stop_event.wait(5) # Chrome won't start, don't hammer it
+                elif not parked:
+                    browser.stop() # finished launching after shutdown
+            else:
+                # Idle: drop parked browsers that died
+                for b in list(self.ready):
+                    if not self._healthy(b):
+                        with self.cond:
+                            if b not in self.ready: continue # checked out meanwhile
+                            self.ready.remove(b)
+                        GlobalLogger.log("Pool", f"Parked browser {b.worker_id} died, replacing.")
+                        self._discard(b)
+
+    def summary(self):
+        return f"ready {len(self.ready)}/{self.size}, hits {self.hits}, misses {self.misses}, discarded {self.discarded}"
+
+    def shutdown(self):
+        self.stop_event.set()
+        with self.cond:
+            self.cond.notify_all()
+        self.thread.join(timeout=5)
+        with self.cond:
+            browsers = self.ready + self.returned
+            self.ready, self.returned = [], []
+        for b in browsers:
+            b.stop()
+        GlobalLogger.log("Pool", f"Shut down. {self.summary()}")
+        with BrowserPool._lock:
+            BrowserPool._instance = None
@@ -6,6 +6,13 @@ from typing import List, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from src.config import Config
+from src.input_backend import create_input_backend
+from src.planner import SwapPlan
+from src.board import BoardModel, ROW_TOLERANCE_PX, decode_grid
+from src.state import GamePhase, probe_state
+from src.logger import GlobalLogger
+from src import metrics
+from src import pacing
 
 @dataclass
 class PuzzlePiece:
@@ -18,15 +25,36 @@ class PuzzlePiece:
     # Grid coordinates derived from background-position
     target_col: int = -1
     target_row: int = -1
+
+    # Raw inline background-position string, used for the board checksum
+    bg_position: str = ""
     
     # For debugging
     def __repr__(self):
         return f"Piece(idx={self.current_index}, target=({self.target_col}, {self.target_row}))"
 
 class PuzzleSolver:
-    def __init__(self, driver: WebDriver):
+    # ROCKET MODE: 25 moves per batch.
+    # Keeps the worker loop responsive ("Go next", watchdog) between batches.
+    BATCH_SIZE = 25
+
+    def __init__(self, driver: WebDriver, input_backend: str = None):
         self.driver = driver
-        
+        self.input = create_input_backend(input_backend or Config.PUZZLE_INPUT_BACKEND, driver)
+        # Pending swap plan + our model of the board, verified by checksum
+        self.plan = None
+        self.board = None
+        # Row tolerance of the last decode; the checksum has to group rows the same way
+        self.row_tol = ROW_TOLERANCE_PX
+        # A batch went out since the last checksum: its result tunes the drag pause
+        self.paced = False
+
+    def reset(self):
+        """New level / new board: drop the model, the plan and the pending pacing feedback."""
+        self.board = None
+        self.plan = None
+        self.paced = False
+
     def _parse_percentage(self, val_str: str) -> float:
         if not val_str: return 0.0
         # Remove % using regex or string replace
@@ -36,13 +64,9 @@ class PuzzleSolver:
         except ValueError:
             return 0.0
 
-    def scan_board(self) -> List[PuzzlePiece]:
-        """
-        Scans the DOM to find puzzle pieces using a single JS call for maximum speed.
-        """
-        # Optimized JS payload to extract all piece data in one round-trip
-        # We look for divs with inline background-position which implies they are puzzle pieces
-        script = """
+    # Optimized JS payload to extract all piece data in one round-trip
+    # We look for divs with inline background-position which implies they are puzzle pieces
+    SCAN_SCRIPT = """
         const pieces = [];
         const allDivs = document.querySelectorAll('div[style*="background-position"]');
         
@@ -64,176 +88,141 @@ class PuzzleSolver:
                 element: div,
                 rect_x: rect.x + window.scrollX,
                 rect_y: rect.y + window.scrollY,
-                style_bg: style.backgroundPosition
+                rect_h: rect.height,
+                style_bg: style.backgroundPosition,
+                bg_x: parseFloat(style.backgroundPosition.split(' ')[0]) || 0,
+                bg_y: parseFloat(style.backgroundPosition.split(' ')[1]) || 0
             });
         }
         return pieces;
         """
-        
+
+    def scan_board(self) -> List[PuzzlePiece]:
+        """
+        Scans the DOM to find puzzle pieces using a single JS call for maximum speed.
+        """
         try:
-            raw_data = self.driver.execute_script(script)
+            raw_data = self.driver.execute_script(self.SCAN_SCRIPT)
         except Exception as e:
-            print(f"Error in JS scan: {e}")
+            GlobalLogger.log("Puzzle", f"Error in JS scan: {e}")
             return []
 
+        return self.build_pieces(raw_data)
+
+    def build_pieces(self, raw_data) -> List[PuzzlePiece]:
+        """
+        Turns the raw scan rows into PuzzlePieces in visual order with grid targets.
+        `element` is passed through untouched (WebElement, or an index for the CDP engine).
+        Row grouping and grid size come from board.decode_grid (NumPy, adaptive tolerances).
+        """
         if not raw_data:
             return []
 
-        pieces = []
-        for i, data in enumerate(raw_data):
-            el = data['element']
-            bg_pos = data['style_bg'] # e.g. "50% 20%"
-            
-            if not bg_pos: continue
-            
-            parts = bg_pos.split(' ')
-            if len(parts) >= 2:
-                x_pct = self._parse_percentage(parts[0])
-                y_pct = self._parse_percentage(parts[1])
-            else:
-                x_pct = self._parse_percentage(parts[0])
-                y_pct = 0.0
+        rows = [d for d in raw_data if d['style_bg']]
+        if not rows:
+            return []
 
+        bg = [self._split_bg(d) for d in rows]
+        heights = [d['rect_h'] for d in rows] if 'rect_h' in rows[0] else None
+        layout = decode_grid(
+            [d['rect_x'] for d in rows], [d['rect_y'] for d in rows],
+            [b[0] for b in bg], [b[1] for b in bg], heights)
+        self.row_tol = layout.row_tol
+        if not layout.exact:
+            GlobalLogger.log("Puzzle", f"{len(rows)} pieces don't fill a grid; decoded as {layout.cols}x{layout.rows} with fixed tolerances.")
+
+        pieces = []
+        cols, target_rows = layout.target_col.tolist(), layout.target_row.tolist()
+        for idx, i in enumerate(layout.order.tolist()):
+            d = rows[i]
             pieces.append(PuzzlePiece(
                 id=f"piece_{i}",
-                element=el,
-                current_index=-1, 
-                target_pos_x=x_pct,
-                target_pos_y=y_pct
+                element=d['element'],
+                current_index=idx,
+                target_pos_x=bg[i][0],
+                target_pos_y=bg[i][1],
+                target_col=cols[i],
+                target_row=target_rows[i],
+                bg_position=d['style_bg']
             ))
-            
-            # Inject cached rect data to avoid wire call if we needed to sort
-            # But the sorting logic below accesses .element.rect which calls wire.
-            # We should attach the rect data to the object to sort in Python without wire calls
-            pieces[-1]._cached_x = data['rect_x']
-            pieces[-1]._cached_y = data['rect_y']
-
-        # Sort pieces by current visual position (Top-Left to Bottom-Right)
-        # Using CACHED coordinates to avoid wire calls
-        if not pieces: return []
-            
-        # Determine rows
-        pieces.sort(key=lambda p: p._cached_y)
-        
-        rows = []
-        if pieces:
-            current_row = [pieces[0]]
-            current_y = pieces[0]._cached_y
-            
-            for p in pieces[1:]:
-                # 15px tolerance
-                if abs(p._cached_y - current_y) < 15: 
-                    current_row.append(p)
-                else:
-                    rows.append(current_row)
-                    current_row = [p]
-                    current_y = p._cached_y
-            rows.append(current_row)
-            
-        final_list = []
-        current_idx = 0
-        for r in rows:
-            r.sort(key=lambda p: p._cached_x)
-            for p in r:
-                p.current_index = current_idx
-                current_idx += 1
-            final_list.extend(r)
-            
-        self._calculate_grid_targets(final_list)
-        return final_list
+        return pieces
 
-    def _calculate_grid_targets(self, pieces: List[PuzzlePiece]):
-        if not pieces: return
-        
-        # Collect all unique target X and Y percentages to detect grid size
-        xs = sorted(list(set(p.target_pos_x for p in pieces)))
-        ys = sorted(list(set(p.target_pos_y for p in pieces)))
-        
-        # Simple mapping
-        x_map = {val: i for i, val in enumerate(xs)}
-        y_map = {val: i for i, val in enumerate(ys)}
-        
-        for p in pieces:
-            p.target_col = x_map.get(p.target_pos_x, 0)
-            p.target_row = y_map.get(p.target_pos_y, 0)
+    def _split_bg(self, data) -> Tuple[float, float]:
+        # The scan parses the percentages in-page; older rows only carry the string
+        if 'bg_x' in data:
+            return data['bg_x'] or 0.0, data['bg_y'] or 0.0
+        parts = data['style_bg'].split(' ')
+        x_pct = self._parse_percentage(parts[0])
+        y_pct = self._parse_percentage(parts[1]) if len(parts) >= 2 else 0.0
+        return x_pct, y_pct
 
-    def solve(self):
+    def solve(self, phase: GamePhase = None):
         """
         Main execution method.
+        The board model is checked against a one-number in-page checksum;
+        the full scan only runs when that check fails.
+        phase: GamePhase already probed by the caller; anything but PLAYING skips the turn.
         """
-        pieces = self.scan_board()
-        if not pieces:
+        if phase is not None and phase != GamePhase.PLAYING:
             return False
 
-        # Re-derive cols count from pieces data
-        if not pieces: return False
-        max_col = max(p.target_col for p in pieces)
-        cols = max_col + 1
-        
-        current_layout = list(pieces) 
-        
-        swaps_performed = 0
-        # ROCKET MODE: 25 moves per batch. 
-        # JS Scanning is fast, but we want to flow as much as possible.
-        BATCH_SIZE = 25 
-        
-        for i in range(len(current_layout)):
-            if swaps_performed >= BATCH_SIZE:
-                # print(f"  -> Batch limit {BATCH_SIZE}. Rescanning...")
-                return True
+        pacer = pacing.current()
+        if self.board is not None:
+            matches = self.board.matches(self.driver)
+            if self.paced:
+                # Did every drag of the last batch register? That's the drag pause's success signal.
+                # A mismatch only counts while it's still the same game: a finished level or a
+                # new board says nothing about the pause.
+                if matches:
+                    pacer.success("puzzle.drag_pause")
+                elif probe_state(self.driver) == GamePhase.PLAYING:
+                    pacer.failure("puzzle.drag_pause")
+                self.paced = False
+            if not matches:
+                GlobalLogger.log("Puzzle", "Board checksum mismatch. Rescanning.")
+                self.board = None
+                self.plan = None
 
-            target_r = i // cols
-            target_c = i % cols
-            
-            current_p = current_layout[i]
-            
-            if current_p.target_row == target_r and current_p.target_col == target_c:
-                continue 
-                
-            # Find the correct piece
-            candidate_idx = -1
-            for j in range(i + 1, len(current_layout)):
-                p = current_layout[j]
-                if p.target_row == target_r and p.target_col == target_c:
-                    candidate_idx = j
-                    break
-            
-            if candidate_idx != -1:
-                # print(f"AZIONE: Sposto pezzo da {candidate_idx} a {i}")
-                success = self.perform_swap(current_layout[i], current_layout[candidate_idx])
-                
-                if not success:
-                    print("  -> Errore scambio (Stale). Riscansione.")
-                    return True 
-                
-                current_layout[i], current_layout[candidate_idx] = current_layout[candidate_idx], current_layout[i]
-                swaps_performed += 1
-                
-                # NO SLEEP - Full speed ahead
-                # time.sleep(0.01)
-        
-        if swaps_performed == 0:
-            return False
-            
+        if self.board is None:
+            started = time.perf_counter()
+            pieces = self.scan_board()
+            metrics.current().observe("scan_seconds", time.perf_counter() - started)
+            if not pieces:
+                return False
+            self.board = BoardModel(pieces, self.row_tol)
+            self.plan = None
+
+        if not self.plan:
+            self.plan = SwapPlan.from_targets(self.board.targets())
+            if not self.plan:
+                return False
+            GlobalLogger.log("Puzzle", f"Planned {self.plan.total} swaps for {len(self.board)} pieces.")
+
+        slots = self.plan.take(self.BATCH_SIZE)
+        # Drag the piece in src onto slot dst (they trade places).
+        # Each pair has to see the board as the earlier swaps of the batch left it.
+        pieces = list(self.board.pieces)
+        batch = []
+        for src, dst in slots:
+            batch.append((pieces[src], pieces[dst]))
+            pieces[src], pieces[dst] = pieces[dst], pieces[src]
+
+        self.input.drag_pause = pacer.value("puzzle.drag_pause")
+        done = self.input.perform_swaps(batch)
+        self.paced = done > 0
+        metrics.current().inc("swaps_total", done)
+        for src, dst in slots[:done]:
+            self.board.apply_swap(src, dst)
+        if done < len(batch):
+            # The checksum tells us next time whether a rescan is needed
+            GlobalLogger.log("Puzzle", f"Swap batch interrupted ({done}/{len(batch)}). Replanning.")
+            self.plan = None
+        GlobalLogger.debug("Puzzle", self.input.report())
         return True
 
     def perform_swap(self, piece_a: PuzzlePiece, piece_b: PuzzlePiece) -> bool:
         """
-        Executes Drag and Drop from A to B using ActionChains.
+        Drags piece B onto piece A through the configured input backend.
         Returns True if successful, False if error.
-        ROCKET MODE: 10ms pauses. Just enough to register.
         """
-        from selenium.webdriver.common.action_chains import ActionChains
-        
-        try:
-            actions = ActionChains(self.driver)
-            # Click & Hold -> Pause -> Move -> Pause -> Release
-            # 0.01s (10ms) is the bare minimum for stability
-            actions.click_and_hold(piece_b.element)\
-                   .pause(0.01)\
-                   .move_to_element(piece_a.element)\
-                   .pause(0.01)\
-                   .release().perform()
-            return True
-        except Exception as e:
-            return False
+        return self.input.perform_swaps([(piece_b, piece_a)]) == 1
@@ -0,0 +1,221 @@
+import json
+import threading
+import time
+from collections import Counter
+from .logger import GlobalLogger
+
+# Recordings are JSONL, one object per line:
+#   {"type": "session", "capabilities": {...}}                      first line
+#   {"type": "command", "seq", "t", "thread", "command", "params", "response" | "error", "seconds"}
+#     "error" is "<ExceptionName>: <text>", with "error_type" / "error_msg" to raise it again
+#   {"type": "mark", "t", "label"}                                  optional, e.g. level boundaries
+# Commands are captured at the command_executor level, so params/responses are the
+# wire JSON (elements as {"element-6066-...": id}) and replay needs no live elements.
+
+
+class CommandRecorder:
+    """Tees every WebDriver command of one driver into a JSONL file."""
+    def __init__(self, driver, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.started = time.perf_counter()
+        self.file = open(path, "w", encoding="utf-8")
+        self._write({"type": "session", "capabilities": driver.caps or {}})
+
+        executor = driver.command_executor
+        self.executor = executor
+        self.original = executor.execute
+        executor.execute = self._execute
+
+    def _write(self, entry):
+        # Serialise inside the caller: selenium unwraps the response dict in place right after
+        line = json.dumps(entry, default=str)
+        with self.lock:
+            if self.file:
+                self.file.write(line + "\n")
+
+    def _execute(self, command, params):
+        start = time.perf_counter()
+        entry = {"type": "command", "t": round(start - self.started, 6),
+                 "thread": threading.current_thread().name, "command": command,
+                 "params": _strip_session(params)}
+        try:
+            response = self.original(command, params)
+            entry["response"] = response
+            return response
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            entry["error_type"] = type(e).__name__
+            entry["error_msg"] = getattr(e, "msg", None) or str(e) # selenium's str() adds "Message: "
+            raise
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 6)
+            with self.lock:
+                self.seq += 1
+                entry["seq"] = self.seq
+            self._write(entry)
+
+    def mark(self, label):
+        self._write({"type": "mark", "t": round(time.perf_counter() - self.started, 6), "label": label})
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+        self.executor.execute = self.original
+        GlobalLogger.log("Replay", f"Recorded {self.seq} commands to {self.path}")
+
+
+def record(driver, path) -> CommandRecorder:
+    return CommandRecorder(driver, path)
+
+
+def _strip_session(params):
+    if isinstance(params, dict) and "sessionId" in params:
+        params = {k: v for k, v in params.items() if k != "sessionId"}
+    return params
+
+
+def load(path):
+    """Returns (capabilities, command entries, marks)."""
+    caps, commands, marks = {}, [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip(): continue
+            entry = json.loads(line)
+            kind = entry.get("type")
+            if kind == "session":
+                caps = entry.get("capabilities") or {}
+            elif kind == "command":
+                commands.append(entry)
+            elif kind == "mark":
+                marks.append(entry)
+    return caps, commands, marks
+
+
+class ReplayExecutor:
+    """
+    Stand-in for selenium's RemoteConnection that answers from a recording.
+
+    Each call takes the next unused recorded entry for the same command,
+    preferring one with identical params, looking at most `window` entries
+    past the oldest unused one (threads interleave differently between runs,
+    and jittered drag offsets never match exactly). Calls with no recorded
+    counterpart get the last response seen for that command and are counted
+    as unrecorded: that's the number that grows when a change adds round trips.
+    """
+    def __init__(self, path, realtime=False, window=64):
+        self.path = path
+        self.caps, self.entries, self.marks = load(path)
+        self.realtime = realtime
+        self.window = window
+        self.lock = threading.Lock()
+        self.used = [False] * len(self.entries)
+        self.cursor = 0
+        self.last_response = {}
+        self.calls = Counter()
+        self.exact = 0
+        self.loose = 0
+        self.unrecorded = Counter()
+
+    def execute(self, command, params):
+        if command == "newSession":
+            return {"value": {"sessionId": "replay", "capabilities": self.caps}}
+        wanted = json.dumps(_strip_session(params), sort_keys=True, default=str)
+        with self.lock:
+            self.calls[command] += 1
+            idx = self._match(command, wanted)
+            if idx is None:
+                self.unrecorded[command] += 1
+                fallback = self.last_response.get(command)
+                return json.loads(fallback) if fallback else {"value": None}
+            self.used[idx] = True
+            while self.cursor < len(self.used) and self.used[self.cursor]:
+                self.cursor += 1
+            entry = self.entries[idx]
+
+        if self.realtime:
+            time.sleep(entry.get("seconds", 0))
+        if "error" in entry:
+            raise _replayed_error(entry)
+        raw = json.dumps(entry.get("response"))
+        self.last_response[command] = raw
+        return json.loads(raw) # fresh copy, selenium mutates it
+
+    def _match(self, command, wanted):
+        loose = None
+        end = min(len(self.entries), self.cursor + self.window)
+        for i in range(self.cursor, end):
+            if self.used[i]: continue
+            entry = self.entries[i]
+            if entry["command"] != command: continue
+            if json.dumps(entry.get("params"), sort_keys=True, default=str) == wanted:
+                self.exact += 1
+                return i
+            if loose is None:
+                loose = i
+        if loose is not None:
+            self.loose += 1
+        return loose
+
+    @property
+    def remaining(self):
+        return self.used.count(False)
+
+    @property
+    def exhausted(self):
+        return self.cursor >= len(self.entries)
+
+    def report(self) -> dict:
+        return {
+            "calls": sum(self.calls.values()),
+            "recorded": len(self.entries),
+            "exact": self.exact,
+            "loose": self.loose,
+            "unrecorded": sum(self.unrecorded.values()),
+            "unused": self.remaining,
+            "by_command": dict(self.calls),
+            "unrecorded_by_command": dict(self.unrecorded),
+        }
+
+    def summary(self) -> str:
+        r = self.report()
+        extra = ", ".join(f"{c} x{n}" for c, n in self.unrecorded.most_common(5))
+        return (f"{r['calls']} calls vs {r['recorded']} recorded ({r['exact']} exact, {r['loose']} loose), "
+                f"{r['unrecorded']} unrecorded{' (' + extra + ')' if extra else ''}, {r['unused']} unused")
+
+
+def _replayed_error(entry):
+    """The recorded selenium exception type (stale element, timeout, ...), else a WebDriverException."""
+    from selenium.common import exceptions
+    name = entry.get("error_type") or entry["error"].split(":", 1)[0] # older recordings: "error" only
+    cls = getattr(exceptions, name, None)
+    if isinstance(cls, type) and issubclass(cls, exceptions.WebDriverException):
+        return cls(entry.get("error_msg", entry["error"]))
+    return exceptions.WebDriverException(f"(replayed) {entry['error']}")
+
+
+def replay_driver(path, realtime=False):
+    """
+    A Chrome WebDriver whose commands are answered from `path` instead of
+    chromedriver. Chrome-specific calls (execute_cdp_cmd, get_log) work too.
+    The executor is on driver.command_executor for report()/summary().
+    """
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.webdriver import WebDriver as ChromeDriver
+    from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+    class ReplayChrome(ChromeDriver):
+        def __init__(self, executor):
+            self.service = None
+            RemoteWebDriver.__init__(self, command_executor=executor, options=Options())
+
+        def quit(self):
+            try:
+                RemoteWebDriver.quit(self)
+            except Exception:
+                pass
+
+    return ReplayChrome(ReplayExecutor(path, realtime=realtime))
@@ -0,0 +1,82 @@
+import os
+import time
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read_stat(pid):
+    """(ppid, utime + stime ticks, rss bytes) from /proc/<pid>/stat, or None."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read().decode("ascii", "replace")
+    except OSError:
+        return None
+    # comm may contain spaces/parens: split after the last ')'
+    fields = data[data.rfind(")") + 2:].split()
+    return int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21]) * _PAGE
+
+
+def process_tree(root_pid):
+    """{pid: (ticks, rss)} for root_pid and all its descendants (one /proc scan)."""
+    stats = {}
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit(): continue
+        st = _read_stat(int(name))
+        if st is None: continue
+        ppid, ticks, rss = st
+        stats[int(name)] = (ticks, rss)
+        children.setdefault(ppid, []).append(int(name))
+
+    tree = {}
+    todo = [root_pid]
+    while todo:
+        pid = todo.pop()
+        if pid in stats:
+            tree[pid] = stats[pid]
+        todo.extend(children.get(pid, []))
+    return tree
+
+
+class TreeSampler:
+    """
+    RSS and CPU of a process tree (chromedriver -> chrome -> renderers/GPU/...).
+    CPU% is averaged over the time since the previous sample; 100% = one core.
+    Linux only (/proc); elsewhere sample() returns None.
+    """
+    def __init__(self, root_pid):
+        self.root_pid = root_pid
+        self.last_ticks = None
+        self.last_time = None
+        self.peak_rss = 0
+        self.last = None
+
+    def sample(self, min_interval=1.0):
+        if not os.path.isdir("/proc"):
+            return None
+        # Shared browsers get sampled once per session: reuse a fresh reading
+        if self.last and time.monotonic() - self.last_time < min_interval:
+            return self.last
+        tree = process_tree(self.root_pid)
+        if not tree:
+            return None
+        now = time.monotonic()
+        ticks = sum(t for t, _ in tree.values())
+        rss = sum(r for _, r in tree.values())
+        cpu = 0.0
+        if self.last_ticks is not None and now > self.last_time:
+            cpu = max(0.0, (ticks - self.last_ticks) / _CLK_TCK / (now - self.last_time) * 100)
+        self.last_ticks, self.last_time = ticks, now
+        self.peak_rss = max(self.peak_rss, rss)
+        self.last = {"rss_mb": rss / 2**20, "cpu": cpu, "procs": len(tree)}
+        return self.last
+
+
+def format_usage(usage):
+    if not usage:
+        return "mem n/a"
+    text = f"mem {usage['rss_mb']:.0f}MB | cpu {usage['cpu']:.0f}% | {usage['procs']} procs"
+    if usage.get("shared", 1) > 1:
+        text += f" (shared by {usage['shared']})"
+    return text
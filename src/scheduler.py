@@ -0,0 +1,108 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from .logger import GlobalLogger
+from . import pacing
+
+
+@dataclass
+class State:
+    """
+    One worker state.
+    handler: runs one step and returns the next state name (None = stay).
+             Handlers block on their own wait condition instead of sleeping.
+    deadline: seconds allowed in this state without progress before the
+              machine jumps to `on_timeout`.
+    """
+    name: str
+    handler: Callable[[], Optional[str]]
+    deadline: float
+    on_timeout: str = "RECOVER"
+
+
+class StateMachine:
+    """
+    Explicit worker scheduler: runs the current state's handler, follows the
+    returned transitions, enforces per-state deadlines and accounts for the
+    wall-clock time spent in each state.
+    fatal_errors: exception types that go straight to error_state, no retries.
+    watchdog: watchdog(state_name) -> reason to go to error_state now, or None;
+              checked after every step.
+    """
+    MAX_CONSECUTIVE_ERRORS = 3
+
+    def __init__(self, name, states, initial, stop_event, error_state="RECOVER", fatal_errors=(), watchdog=None):
+        self.name = name
+        self.states: Dict[str, State] = {s.name: s for s in states}
+        self.current = initial
+        self.stop_event = stop_event
+        self.error_state = error_state
+        self.fatal_errors = tuple(fatal_errors)
+        self.watchdog = watchdog
+
+        self.entered_at = time.time()
+        self.deadline_start = self.entered_at
+        self.time_in_state = {s: 0.0 for s in self.states}
+        self.transitions = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.error_backoff = pacing.Backoff(start=0.1, cap=2.0) # don't spin on a broken page
+        self.last_error = None
+
+    def transition(self, target, reason=""):
+        if target not in self.states:
+            GlobalLogger.log(self.name, f"Unknown state '{target}', staying in {self.current}.")
+            return
+        if target == self.current:
+            return
+        GlobalLogger.log(self.name, f"{self.current} -> {target}" + (f" ({reason})" if reason else ""))
+        self.transitions += 1
+        self.current = target
+        self.entered_at = time.time()
+        self.deadline_start = self.entered_at
+
+    def progress(self):
+        """The current state made progress: restart its deadline clock."""
+        self.deadline_start = time.time()
+
+    def step(self):
+        state = self.states[self.current]
+        started = time.time()
+        try:
+            target = state.handler()
+            self.consecutive_errors = 0
+            self.error_backoff.reset()
+        except Exception as e:
+            self.errors += 1
+            self.consecutive_errors += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            GlobalLogger.log(self.name, f"Error in {state.name}: {self.last_error}")
+            fatal = isinstance(e, self.fatal_errors)
+            target = self.error_state if fatal or self.consecutive_errors >= self.MAX_CONSECUTIVE_ERRORS else None
+            if target: self.consecutive_errors = 0
+            if not fatal:
+                pacing.current().sleep(self.error_backoff.next(), self.stop_event)
+        finally:
+            self.time_in_state[state.name] += time.time() - started
+
+        if target is None and self.watchdog:
+            reason = self.watchdog(state.name)
+            if reason:
+                GlobalLogger.log(self.name, f"Stall in {state.name}: {reason}.")
+                target = self.error_state
+        if target is None and time.time() - self.deadline_start > state.deadline:
+            target = state.on_timeout
+            GlobalLogger.log(self.name, f"{state.name} deadline ({state.deadline:.0f}s) exceeded.")
+        if target is not None:
+            self.transition(target)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.step()
+
+    def breakdown(self) -> str:
+        total = sum(self.time_in_state.values())
+        if total <= 0: return "-"
+        parts = [f"{name} {secs / total:.0%}" for name, secs in
+                 sorted(self.time_in_state.items(), key=lambda kv: -kv[1]) if secs > 0]
+        return " | ".join(parts)
@@ -0,0 +1,58 @@
+from enum import Enum
+from .logger import GlobalLogger
+
+
+class GamePhase(Enum):
+    PLAYING = "playing"
+    LEVEL_COMPLETE = "level_complete"
+    GAME_OVER = "game_over"
+    DIFFICULTY_SELECT = "difficulty_select"
+    LOADING = "loading"
+
+
+# Page-side classifier, kept as a bare function expression so other scripts
+# (e.g. the events drain) can embed it and return the phase in the same call.
+PROBE_FN = """function () {
+    const visible = el => !!(el && el.getClientRects().length) && getComputedStyle(el).visibility !== 'hidden';
+    const body = document.body;
+    if (!body || document.readyState === 'loading') return 'loading';
+
+    if (body.textContent.includes("TIME'S UP")) return 'game_over';
+
+    for (const d of document.querySelectorAll('[role="dialog"]')) {
+        if (visible(d) && d.querySelector('button')) return 'level_complete';
+    }
+
+    const it = document.evaluate("//*[contains(text(), 'Go next')]", document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < it.snapshotLength; i++) {
+        if (visible(it.snapshotItem(i))) return 'level_complete';
+    }
+
+    const keywords = ['easy', 'normal', 'medium', 'regular', 'hard', 'expert'];
+    for (const b of document.querySelectorAll('button')) {
+        const label = b.textContent.trim().toLowerCase();
+        if (keywords.some(k => label.includes(k)) && visible(b)) return 'difficulty_select';
+    }
+
+    if (document.querySelector('div[class*="MemoryGame-module__k2AJWG__card"]')) return 'playing';
+    if (document.querySelector('div[style*="background-position"]')) return 'playing';
+    return 'loading';
+}"""
+
+PROBE_SCRIPT = f"return ({PROBE_FN})();"
+
+
+def parse_phase(value) -> GamePhase:
+    try:
+        return GamePhase(value)
+    except ValueError:
+        return GamePhase.LOADING
+
+
+def probe_state(driver) -> GamePhase:
+    """One small execute_script returning the current GamePhase."""
+    try:
+        return parse_phase(driver.execute_script(PROBE_SCRIPT))
+    except Exception as e:
+        GlobalLogger.log("State", f"Probe failed: {e}")
+        return GamePhase.LOADING
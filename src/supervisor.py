@@ -0,0 +1,259 @@
+import ctypes
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from .config import Config
+from .logger import GlobalLogger
+
+
+class StatusSlot(ctypes.Structure):
+    """One worker's stats in shared memory. Written by the child, read by the dashboard."""
+    _fields_ = [
+        ("worker_id", ctypes.c_int),
+        ("items_solved", ctypes.c_int),
+        ("last_activity", ctypes.c_double),
+        ("heartbeat", ctypes.c_double),
+        ("status", ctypes.c_char * 32),
+        ("breakdown", ctypes.c_char * 96),
+    ]
+
+
+def _child_main(slots, commands, parent_pid, group_id):
+    """
+    Entry point of a worker process. Hosts one or more GameWorkers and copies
+    their stats into the shared slots; commands arrive on a Queue:
+    ("add", slot_index, worker_id, game_type, difficulty) / ("stop", worker_id) / ("exit",).
+    """
+    from .logger import GlobalLogger
+    from .worker import GameWorker
+    from .metrics import MetricsServer
+    from .tabs import TabHost
+
+    # One log file per worker process: the writers would otherwise interleave and rotate the same file
+    root, ext = os.path.splitext(Config.LOG_FILE_PATH)
+    GlobalLogger.setup(f"{root}.proc{group_id}{ext}", truncate=False)
+    TabHost.use_slot_range(group_id)
+
+    # The dashboard process can't see our workers' metrics: serve them next to its port
+    server = None
+    if Config.METRICS_ENABLED:
+        server = MetricsServer(port=Config.METRICS_PORT + group_id)
+        server.start()
+
+    workers = {} # worker_id -> (slot_index, GameWorker)
+    running = True
+    while running:
+        try:
+            while True:
+                cmd = commands.get_nowait()
+                if cmd[0] == "add":
+                    _, idx, wid, game_type, difficulty = cmd
+                    w = GameWorker(worker_id=wid, game_type=game_type, difficulty=difficulty)
+                    w.start()
+                    workers[wid] = (idx, w)
+                elif cmd[0] == "stop":
+                    idx, w = workers.pop(cmd[1], (None, None))
+                    if w:
+                        w.stop()
+                        slots[idx].status = b"STOPPED"
+                elif cmd[0] == "exit":
+                    running = False
+        except queue.Empty:
+            pass
+
+        # Don't outlive the dashboard: orphaned Chromes would hold the profile locks
+        if os.getppid() != parent_pid:
+            running = False
+
+        now = time.time()
+        for wid, (idx, w) in workers.items():
+            slot = slots[idx]
+            slot.items_solved = w.items_solved
+            slot.last_activity = w.last_activity
+            slot.status = w.status.encode("utf-8", "replace")[:31]
+            slot.breakdown = w.state_breakdown().encode("utf-8", "replace")[:95]
+            slot.heartbeat = now
+        if running and workers and not any(w.is_running for _, w in workers.values()):
+            # Every thread in this process died: exit non-zero so the supervisor restarts us
+            GlobalLogger.log(f"Proc-{os.getpid()}", "All workers dead, exiting for restart.")
+            GlobalLogger.flush_and_stop() # os._exit skips atexit
+            os._exit(1)
+        time.sleep(0.5)
+
+    for _, w in workers.values():
+        w.stop()
+    if server:
+        server.stop()
+    GlobalLogger.flush_and_stop() # multiprocessing ends the child with os._exit too
+
+
+class ProcessWorkerHandle:
+    """Dashboard-facing view of a worker living in another process."""
+    def __init__(self, supervisor, worker_id, game_type, difficulty, slot_index):
+        self.supervisor = supervisor
+        self.worker_id = worker_id
+        self.game_type = game_type
+        self.difficulty = difficulty
+        self.slot_index = slot_index
+        self.group = None
+        self.solved_base = 0 # carried over process restarts
+        self.stopped = False
+
+    @property
+    def _slot(self):
+        return self.supervisor.slots[self.slot_index]
+
+    @property
+    def status(self):
+        return self._slot.status.decode("utf-8", "replace") or "STARTING"
+
+    @property
+    def items_solved(self):
+        return self.solved_base + self._slot.items_solved
+
+    @property
+    def last_activity(self):
+        return self._slot.last_activity
+
+    @property
+    def is_running(self):
+        return not self.stopped
+
+    def state_breakdown(self):
+        return self._slot.breakdown.decode("utf-8", "replace") or "-"
+
+    def stop(self):
+        self.supervisor.stop_worker(self)
+
+
+class ProcessGroup:
+    """One child process and the workers assigned to it."""
+    def __init__(self, supervisor, group_id):
+        self.supervisor = supervisor
+        self.group_id = group_id
+        self.handles = []
+        self.process = None
+        self.commands = None
+        self.restarts = 0
+
+    def launch(self):
+        ctx = self.supervisor.ctx
+        self.commands = ctx.Queue()
+        self.process = ctx.Process(target=_child_main, name=f"WorkerGroup-{self.group_id}",
+                                   args=(self.supervisor.slots, self.commands, os.getpid(), self.group_id))
+        self.process.start()
+        for h in self.handles:
+            self._add(h)
+
+    def _add(self, handle):
+        slot = self.supervisor.slots[handle.slot_index]
+        slot.worker_id = handle.worker_id
+        slot.items_solved = 0
+        slot.heartbeat = time.time()
+        slot.last_activity = time.time()
+        slot.status = b"STARTING"
+        self.commands.put(("add", handle.slot_index, handle.worker_id, handle.game_type, handle.difficulty))
+
+    def add(self, handle):
+        handle.group = self
+        self.handles.append(handle)
+        self._add(handle)
+
+    def remove(self, handle):
+        self.handles.remove(handle)
+        self.commands.put(("stop", handle.worker_id))
+
+    def alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def terminate(self, graceful=True):
+        if not self.process: return
+        if graceful and self.process.is_alive():
+            self.commands.put(("exit",))
+            self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+
+
+class ProcessSupervisor:
+    """
+    Runs workers in child processes (Config.WORKERS_PER_PROCESS each) and
+    restarts a process when it dies, stops heartbeating, or all its workers
+    stop making progress. Stats live in a shared ctypes array, so the
+    dashboard reads them without any IPC round trip.
+    """
+    def __init__(self, capacity=None):
+        self.ctx = multiprocessing.get_context("spawn")
+        self.capacity = capacity or Config.SUPERVISOR_MAX_WORKERS
+        self.slots = self.ctx.Array(StatusSlot, self.capacity, lock=False)
+        self.free_slots = list(range(self.capacity))
+        self.groups = []
+        self.next_group_id = 1
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.monitor = threading.Thread(target=self._monitor_loop, name="Supervisor", daemon=True)
+        self.monitor.start()
+
+    def spawn(self, worker_id, game_type, difficulty):
+        with self.lock:
+            if not self.free_slots:
+                raise RuntimeError("Supervisor is full (Config.SUPERVISOR_MAX_WORKERS)")
+            handle = ProcessWorkerHandle(self, worker_id, game_type, difficulty, self.free_slots.pop(0))
+            group = next((g for g in self.groups if len(g.handles) < Config.WORKERS_PER_PROCESS), None)
+            if group is None:
+                group = ProcessGroup(self, self.next_group_id)
+                self.next_group_id += 1
+                self.groups.append(group)
+                group.handles.append(handle)
+                handle.group = group
+                group.launch()
+            else:
+                group.add(handle)
+        return handle
+
+    def stop_worker(self, handle):
+        with self.lock:
+            if handle.stopped: return
+            handle.stopped = True
+            group = handle.group
+            if len(group.handles) == 1:
+                group.handles.remove(handle)
+                group.terminate()
+                self.groups.remove(group)
+            else:
+                group.remove(handle)
+            self.free_slots.append(handle.slot_index)
+
+    def _needs_restart(self, group):
+        if not group.alive():
+            return "process died"
+        now = time.time()
+        slots = [self.slots[h.slot_index] for h in group.handles]
+        if slots and all(now - s.heartbeat > Config.SUPERVISOR_HEARTBEAT_TIMEOUT for s in slots):
+            return "no heartbeat"
+        if slots and all(now - s.last_activity > Config.STUCK_TIMEOUT * 2 for s in slots):
+            return "no progress"
+        return None
+
+    def _monitor_loop(self):
+        while not self.stop_event.wait(1.0):
+            with self.lock:
+                for group in list(self.groups):
+                    reason = self._needs_restart(group)
+                    if not reason: continue
+                    group.restarts += 1
+                    GlobalLogger.log("Supervisor", f"Restarting group {group.group_id} ({reason}), restart #{group.restarts}.")
+                    for h in group.handles:
+                        h.solved_base += self.slots[h.slot_index].items_solved
+                    group.terminate(graceful=False)
+                    group.launch()
+
+    def shutdown(self):
+        self.stop_event.set()
+        with self.lock:
+            for group in self.groups:
+                group.terminate()
+            self.groups.clear()
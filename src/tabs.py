@@ -0,0 +1,233 @@
+import threading
+import time
+from .browser import BrowserManager
+from .config import Config
+from .logger import GlobalLogger
+
+# Shared hosts get their own profile slots, clear of workers and the pool;
+# each worker process (supervisor.py) gets its own range of them
+HOST_PROFILE_BASE = 2000
+HOST_SLOTS_PER_PROCESS = 100
+
+# Commands that manage window focus themselves and must not be re-targeted
+_FOCUS_COMMANDS = {"switchToWindow", "newWindow", "getWindowHandles", "quit"}
+
+
+class TabHost:
+    """
+    One Chrome (one BrowserManager, one cloned profile) hosting up to
+    Config.TABS_PER_BROWSER game sessions, each in its own window.
+
+    WebDriver only talks to one window at a time, so driver.execute is
+    wrapped: every command is sent under a lock, after switching to the
+    window bound to the calling thread (see TabSession.start). WebElements
+    and ActionChains go through driver.execute too, so solver code doesn't
+    need to know it is sharing a browser. The lock serialises the windows,
+    so nothing long may run under it: in this mode the event channel polls
+    instead of blocking (PageEvents blocking=False) and the Memory plan goes
+    out a couple of pairs per script.
+
+    Sessions are real windows rather than tabs: Chrome pauses
+    requestAnimationFrame in background tabs, while occluded windows keep
+    running with the flags get_options() already sets.
+    """
+    _hosts = []
+    _registry_lock = threading.Lock()
+    _next_slot = HOST_PROFILE_BASE + 1
+
+    @classmethod
+    def acquire(cls):
+        """Host with a free window slot; launches a new Chrome if all are full."""
+        with cls._registry_lock:
+            host = next((h for h in cls._hosts if h.alive and len(h.sessions) < Config.TABS_PER_BROWSER), None)
+            if host is None:
+                host = TabHost(cls._next_slot)
+                cls._next_slot += 1
+                cls._hosts.append(host)
+            host.reserved += 1
+            return host
+
+    @classmethod
+    def release(cls, host):
+        with cls._registry_lock:
+            if not host.sessions and host.reserved <= 0 and host in cls._hosts:
+                cls._hosts.remove(host)
+                host.shutdown()
+
+    def __init__(self, slot_id):
+        self.manager = BrowserManager(worker_id=slot_id)
+        self.sessions = {} # handle -> TabSession
+        self.reserved = 0
+        self.lock = threading.RLock()
+        self.local = threading.local()
+        self.current = None
+        self.switches = 0
+        self.alive = True
+        self.started = None # None = not launched yet, then True/False
+        self.start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self.start_lock:
+            if self.started is None:
+                self.started = self.manager.start()
+                if self.started:
+                    self.current = self.manager.driver.current_window_handle
+                    self._patch(self.manager.driver)
+                else:
+                    self.alive = False
+            return self.started
+
+    def _patch(self, driver):
+        original = driver.execute
+
+        def execute(command, params=None):
+            handle = getattr(self.local, "handle", None)
+            with self.lock:
+                if handle and handle != self.current and command not in _FOCUS_COMMANDS:
+                    original("switchToWindow", {"handle": handle})
+                    self.current = handle
+                    self.switches += 1
+                return original(command, params)
+
+        driver.execute = execute
+        self._original_execute = original
+
+    @classmethod
+    def use_slot_range(cls, index):
+        """Worker process `index` launches its hosts from its own profile slots."""
+        with cls._registry_lock:
+            cls._next_slot = HOST_PROFILE_BASE + index * HOST_SLOTS_PER_PROCESS + 1
+
+    def open(self, session):
+        """New window for `session`; the very first one reuses Chrome's initial window."""
+        if not self._ensure_started():
+            with self.lock:
+                self.reserved -= 1
+            return None
+        with self.lock:
+            self.reserved -= 1
+            if not self.sessions:
+                handle = self.current
+            else:
+                handle = self._original_execute("newWindow", {"type": "window"})["value"]["handle"]
+                self._original_execute("switchToWindow", {"handle": handle})
+                self.current = handle
+            self.sessions[handle] = session
+        GlobalLogger.log("Tabs", f"Host {self.manager.worker_id}: window {len(self.sessions)}/{Config.TABS_PER_BROWSER} "
+                                 f"for worker {session.worker_id}.")
+        return handle
+
+    def close(self, handle):
+        with self.lock:
+            self.sessions.pop(handle, None)
+            if self.sessions and self.alive:
+                try:
+                    self._original_execute("switchToWindow", {"handle": handle})
+                    self._original_execute("close", {})
+                except Exception:
+                    pass
+                # Park focus on a window that still exists
+                self.current = next(iter(self.sessions))
+                try:
+                    self._original_execute("switchToWindow", {"handle": self.current})
+                except Exception:
+                    pass
+            elif self.alive:
+                # Last session: keep the window so the host can be reused
+                self.current = handle
+                try:
+                    self._original_execute("switchToWindow", {"handle": handle})
+                    self._original_execute("get", {"url": "about:blank"})
+                except Exception:
+                    pass
+
+    def reopen(self, session):
+        """Fresh window for `session`, replacing (and closing) its current one. Returns the new handle."""
+        with self.lock:
+            old = session.handle
+            handle = self._original_execute("newWindow", {"type": "window"})["value"]["handle"]
+            self._original_execute("switchToWindow", {"handle": handle})
+            self.current = handle
+            self.sessions.pop(old, None)
+            self.sessions[handle] = session
+            try:
+                self._original_execute("switchToWindow", {"handle": old})
+                self._original_execute("close", {})
+            except Exception:
+                pass
+            self._original_execute("switchToWindow", {"handle": handle})
+        return handle
+
+    def shutdown(self):
+        self.alive = False
+        GlobalLogger.log("Tabs", f"Host {self.manager.worker_id} closed after {self.switches} window switches.")
+        self.manager.stop()
+
+
+class TabSession:
+    """
+    Stand-in for BrowserManager when Config.TABS_PER_BROWSER > 1: a worker
+    gets one window of a shared TabHost instead of a whole Chrome.
+    """
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.host = None
+        self.handle = None
+        self.warm_url = None
+        self.net_filtered = None
+        self.timings = {}
+
+    @property
+    def driver(self):
+        return self.host.manager.driver if self.host and self.handle else None
+
+    @property
+    def command_stats(self):
+        return self.host.manager.command_stats if self.host else None
+
+    def start(self):
+        """Call from the worker thread: commands from this thread go to our window."""
+        t = time.perf_counter()
+        self.host = TabHost.acquire()
+        self.handle = self.host.open(self)
+        if self.handle is None:
+            TabHost.release(self.host)
+            self.host = None
+            return False
+        self.host.local.handle = self.handle
+        self.timings = dict(self.host.manager.timings, window=time.perf_counter() - t)
+        return True
+
+    def stop(self):
+        if not self.host: return
+        host, self.host = self.host, None
+        host.close(self.handle)
+        self.handle = None
+        TabHost.release(host)
+
+    def resource_usage(self):
+        """Usage of the whole shared Chrome, plus how many sessions it hosts."""
+        usage = self.host.manager.resource_usage() if self.host else None
+        if usage:
+            usage = dict(usage, shared=len(self.host.sessions))
+        return usage
+
+    def healthy(self):
+        try:
+            return self.driver is not None and self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def mark_dead(self):
+        """Chrome behind this window is gone: keep new sessions off this host."""
+        if self.host:
+            self.host.alive = False
+
+    def navigate_to(self, url):
+        if self.driver:
+            self.driver.get(url)
+
+    def reopen_window(self):
+        self.handle = self.host.reopen(self)
+        self.host.local.handle = self.handle
+        self.net_filtered = None # the block list was on the old target
@@ -0,0 +1,180 @@
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import urllib3
+from urllib3.connection import HTTPConnection
+from .logger import GlobalLogger
+from . import metrics
+
+DEADLINE_GRACE = 5 # on top of the browser's own page-load / script timeouts
+_deadline = threading.local() # .seconds: current command's deadline, .override: see deadline()
+
+
+class CommandStats:
+    """Per-command WebDriver latency, fed by the instrumented executor."""
+    def __init__(self, window=2000):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.by_command = {} # command -> [count, total_seconds]
+        self.recent = deque(maxlen=window)
+
+    def record(self, command, seconds):
+        with self.lock:
+            self.count += 1
+            self.total += seconds
+            entry = self.by_command.setdefault(command, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            self.recent.append(seconds)
+
+    def percentile(self, pct) -> float:
+        with self.lock:
+            data = sorted(self.recent)
+        if not data: return 0.0
+        idx = min(len(data) - 1, int(round(pct / 100.0 * (len(data) - 1))))
+        return data[idx]
+
+    def summary(self) -> str:
+        if not self.count: return "no commands"
+        return (f"{self.count} cmds, avg {self.total / self.count * 1000:.2f}ms, "
+                f"p50 {self.percentile(50) * 1000:.2f}ms, p95 {self.percentile(95) * 1000:.2f}ms")
+
+
+class TunedPoolManager(urllib3.PoolManager):
+    """
+    Keep-alive pool for the local chromedriver link.
+    block=True caps the number of sockets at maxsize instead of opening and
+    discarding extra ones when several threads share a driver (connection churn).
+    """
+    def __init__(self, maxsize, timeout=None):
+        socket_options = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        retries = urllib3.Retry(total=2, connect=2, read=0, redirect=0, status=0)
+        super().__init__(num_pools=2, maxsize=maxsize, block=True, retries=retries,
+                         socket_options=socket_options, timeout=timeout)
+        self.command_timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        timeout = getattr(_deadline, "seconds", None) or self.command_timeout
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return super().request(method, url, *args, **kwargs)
+
+
+def instrument(driver) -> CommandStats:
+    """Wraps the driver's command executor to time every WebDriver command."""
+    stats = CommandStats()
+    executor = driver.command_executor
+    original = executor.execute
+
+    def timed_execute(command, params):
+        start = time.perf_counter()
+        try:
+            return original(command, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.record(command, elapsed)
+            metrics.current().observe("webdriver_command_seconds", elapsed)
+
+    executor.execute = timed_execute
+    return stats
+
+
+class CommandTimeout(Exception):
+    """A WebDriver command outlived its deadline (hung renderer or chromedriver)."""
+    def __init__(self, command, seconds):
+        super().__init__(f"{command} got no answer within {seconds:.0f}s")
+        self.command = command
+        self.seconds = seconds
+
+
+class CommandDeadlines:
+    """
+    How long each WebDriver command may take. Navigation and async scripts
+    get the browser's own timeouts (tracked from setTimeouts) plus
+    DEADLINE_GRACE, everything else `default` seconds.
+    """
+    NAVIGATION = {"get", "refresh", "goBack", "goForward"}
+
+    def __init__(self, default):
+        self.default = default
+        self.page_load = 300.0 # WebDriver defaults until setTimeouts says otherwise
+        self.script = 30.0
+        self.timeouts = 0
+
+    def seconds(self, command) -> float:
+        if command in self.NAVIGATION:
+            return self.page_load + DEADLINE_GRACE
+        if command == "executeAsyncScript":
+            return self.script + DEADLINE_GRACE
+        return self.default
+
+    def observe(self, command, params):
+        if command == "setTimeouts" and params:
+            if params.get("pageLoad") is not None:
+                self.page_load = params["pageLoad"] / 1000.0
+            if params.get("script") is not None:
+                self.script = params["script"] / 1000.0
+
+
+@contextmanager
+def deadline(seconds):
+    """Deadline for the commands this thread sends inside the block (e.g. a wait with a known length)."""
+    previous = getattr(_deadline, "override", None)
+    _deadline.override = seconds
+    try:
+        yield
+    finally:
+        _deadline.override = previous
+
+
+def apply_deadlines(driver, default) -> CommandDeadlines:
+    """
+    Wraps the driver's command executor so every command carries a deadline
+    down to TunedPoolManager. A command that runs past it raises
+    CommandTimeout instead of blocking the thread on a frozen page.
+    """
+    deadlines = CommandDeadlines(default)
+    executor = driver.command_executor
+    original = executor.execute
+
+    def execute_with_deadline(command, params):
+        seconds = getattr(_deadline, "override", None) or deadlines.seconds(command)
+        _deadline.seconds = seconds
+        try:
+            response = original(command, params)
+        except (urllib3.exceptions.TimeoutError, urllib3.exceptions.MaxRetryError) as e:
+            if isinstance(e, urllib3.exceptions.MaxRetryError) and not isinstance(e.reason, urllib3.exceptions.TimeoutError):
+                raise
+            deadlines.timeouts += 1
+            metrics.current().inc("command_timeouts_total", command=command)
+            raise CommandTimeout(command, seconds) from e
+        finally:
+            _deadline.seconds = None
+        deadlines.observe(command, params)
+        return response
+
+    executor.execute = execute_with_deadline
+    return deadlines
+
+
+def apply_pooled_transport(driver, pool_size, timeout=None) -> bool:
+    """
+    Swaps Selenium's default urllib3 pool (maxsize 1, non-blocking) for a
+    TunedPoolManager. Works on any Selenium 4 keep-alive connection.
+    """
+    executor = driver.command_executor
+    if not hasattr(executor, "_conn"):
+        GlobalLogger.log("Transport", "Executor has no keep-alive pool, keeping default transport.")
+        return False
+    old = executor._conn
+    executor._conn = TunedPoolManager(maxsize=pool_size, timeout=timeout)
+    try:
+        old.clear()
+    except Exception:
+        pass
+    return True
@@ -1,13 +1,22 @@
 import threading
 import time
-import queue
 import random
-from selenium.webdriver.common.by import By
+from selenium.webdriver.common.action_chains import ActionChains
 from .browser import BrowserManager
 from .config import Config
 from .puzzle import PuzzleSolver
 from .memory import MemorySolver
 from .logger import GlobalLogger
+from .events import PageEvents
+from .state import GamePhase, probe_state
+from .scheduler import State, StateMachine
+from .pool import BrowserPool
+from .tabs import TabSession
+from .netfilter import NetworkStats, attach
+from .elements import ElementCache
+from .transport import CommandTimeout, deadline
+from . import metrics
+from . import pacing
 
 class GameWorker:
     """
@@ -19,8 +28,15 @@ class GameWorker:
         self.game_type = game_type # PUZZLE or MEMORY
         self.difficulty = difficulty
         
-        self.browser = BrowserManager(worker_id=worker_id)
+        self.tabbed = Config.TABS_PER_BROWSER > 1
+        # Pool profile slots are per process, so only the thread engine may share them
+        self.pooled = Config.POOL_SIZE > 0 and not self.tabbed and Config.WORKER_ENGINE == "thread"
+        self.browser = self._new_browser()
         self.solver = None
+        self.events = None
+        self.elements = None
+        self.machine = None
+        self.nudged = False
         self.thread = None
         self.stop_event = threading.Event()
         self.is_running = False
@@ -28,13 +44,26 @@ class GameWorker:
         
         # Stats
         self.items_solved = 0
+        self.recoveries = 0
+        self.escalation = 0 # next RECOVERY_LADDER step; back to 0 when a level completes
+        self.netstats = NetworkStats()
+        self.metrics = metrics.WorkerMetrics(worker=worker_id, game=game_type, difficulty=difficulty)
+        self.pacer = pacing.Pacer() # learned delays + idle share, kept across levels and recoveries
+        self.poll_backoff = pacing.Backoff(start=0.05, cap=0.5) # pages without the event channel
+        self.acquire_backoff = pacing.Backoff(start=2, cap=30)
+        self.picked_difficulty = None # what _select_difficulty last clicked (RANDOM varies per level)
+        self.netfilter = None
         self.last_activity = time.time()
+        self.started_at = None
+        self.ready_after = None # seconds from start() to a usable browser
         
     def start(self):
         """Spawns the worker thread"""
         if self.is_running: return
         
         self.stop_event.clear()
+        self.started_at = time.time()
+        metrics.register(self.metrics)
         self.thread = threading.Thread(target=self._run_loop, name=f"Worker-{self.worker_id}")
         self.thread.daemon = True
         self.thread.start()
@@ -50,142 +79,344 @@ class GameWorker:
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=5.0)
         
-        self.browser.stop()
+        self._release_browser()
+        metrics.unregister(self.metrics)
         self.is_running = False
         self.status = "STOPPED"
 
     def _run_loop(self):
         """Main Thread Entrypoint"""
+        metrics.bind(self.metrics) # transport + solvers report through this thread's metrics
+        pacing.bind(self.pacer)
         try:
-            if not self.browser.start():
+            if not self._acquire_browser():
                 self.status = "BROWSER FAILED"
                 GlobalLogger.log(f"Worker-{self.worker_id}", "Browser failed to start.")
                 return
+            self.ready_after = time.time() - self.started_at
 
             GlobalLogger.log(f"Worker-{self.worker_id}", f"Started {self.game_type} routine.")
-
-            # Navigate based on game type
-            if self.game_type == "PUZZLE":
-                self._puzzle_routine()
-            elif self.game_type == "MEMORY":
-                self._memory_routine()
+            self.machine = self._build_machine()
+            self.machine.run()
                 
         except Exception as e:
             self.status = f"ERROR: {str(e)[:20]}"
             GlobalLogger.log(f"Worker-{self.worker_id}", f"CRASH: {e}")
         finally:
-            self.browser.stop()
+            self._release_browser()
             self.is_running = False
+            if self.machine:
+                GlobalLogger.log(f"Worker-{self.worker_id}", f"Time per state: {self.machine.breakdown()}")
+            GlobalLogger.log(f"Worker-{self.worker_id}", f"Pacing: {self.pacer.summary()}")
             GlobalLogger.log(f"Worker-{self.worker_id}", "Stopped.")
 
-    def _puzzle_routine(self):
+    def _new_browser(self):
+        return TabSession(self.worker_id) if self.tabbed else BrowserManager(worker_id=self.worker_id)
+
+    def _acquire_browser(self):
+        if not self.pooled:
+            return self.browser.start()
+        browser = BrowserPool.instance().checkout(self.game_type)
+        if browser is None:
+            return False
+        self.browser = browser
+        return True
+
+    def _release_browser(self):
+        # Idempotent: stop() and the thread's own cleanup can both get here
+        browser, self.browser = self.browser, self._new_browser()
+        if self.pooled:
+            BrowserPool.instance().checkin(browser)
+        else:
+            browser.stop()
+
+    # --- State machine -------------------------------------------------
+    # NAVIGATE -> SELECT_DIFFICULTY -> SOLVE -> ADVANCE -> (SELECT_DIFFICULTY | SOLVE)
+    # Any deadline miss, stall (page heartbeat / command deadline) or repeated
+    # error -> RECOVER, which escalates reload -> new window -> new browser -> NAVIGATE.
+    # Handlers block on the page event channel instead of fixed sleeps.
+
+    ROUTES = {
+        GamePhase.PLAYING: "SOLVE",
+        GamePhase.DIFFICULTY_SELECT: "SELECT_DIFFICULTY",
+        GamePhase.LEVEL_COMPLETE: "ADVANCE",
+        GamePhase.GAME_OVER: "ADVANCE",
+    }
+    RECOVERY_LADDER = ("reload", "new_window", "restart")
+    WATCHED = {"SELECT_DIFFICULTY", "SOLVE", "ADVANCE"} # states with a live game page
+
+    def _build_machine(self):
+        states = [
+            State("NAVIGATE", self._state_navigate, deadline=Config.PAGE_LOAD_TIMEOUT + 10),
+            State("SELECT_DIFFICULTY", self._state_select_difficulty, deadline=15),
+            State("SOLVE", self._state_solve, deadline=Config.STUCK_TIMEOUT),
+            State("ADVANCE", self._state_advance, deadline=15),
+            State("RECOVER", self._state_recover, deadline=30),
+        ]
+        return StateMachine(f"Worker-{self.worker_id}", states, "NAVIGATE", self.stop_event,
+                            fatal_errors=(CommandTimeout,), watchdog=self._stalled)
+
+    def resource_usage(self):
+        return self.browser.resource_usage()
+
+    def state_breakdown(self):
+        return self.machine.breakdown() if self.machine else "-"
+
+    def _progress(self):
+        self.poll_backoff.reset()
+        self.last_activity = time.time()
+        self.metrics.set("last_activity_timestamp_seconds", self.last_activity)
+        if self.machine:
+            self.machine.progress()
+
+    def _stalled(self, state):
+        """StateMachine watchdog: reads the heartbeat the event channel sampled during the step."""
+        if state not in self.WATCHED or not self.events:
+            return None
+        beat = self.events.heartbeat
+        if beat.frozen_for() > Config.HEARTBEAT_TIMEOUT:
+            self.metrics.inc("stalls_total", reason="frozen")
+            return f"no frames or DOM changes for {beat.frozen_for():.0f}s"
+        if state == "SOLVE" and beat.quiet_for() > Config.STALL_TIMEOUT:
+            self.metrics.inc("stalls_total", reason="board")
+            return f"board unchanged for {beat.quiet_for():.0f}s"
+        return None
+
+    def _route(self, phase):
+        # LOADING (or unknown) -> stay where we are
+        return self.ROUTES.get(phase)
+
+    def _leave(self, phase):
+        """Route away from the current state; if the page is still loading, block until it changes."""
+        target = self._route(phase)
+        if target is None:
+            self._wait_for_change()
+        return target
+
+    def _page(self):
+        """One call: event snapshot + phase. Falls back to a bare probe."""
+        page = self.events.drain()
+        if page is None:
+            return None, probe_state(self.browser.driver)
+        return page, PageEvents.phase(page)
+
+    def _wait_for_change(self, timeout=1.0):
+        if self.events.wait(timeout) is None:
+            # No event channel on this page: nothing to block on, poll with backoff
+            self.pacer.sleep(min(timeout, self.poll_backoff.next()), self.stop_event)
+
+    def _state_navigate(self):
         self.status = "NAVIGATING"
-        self.browser.navigate_to(Config.PUZZLE_URL)
-        
-        self.solver = PuzzleSolver(self.browser.driver)
-        self.status = "RUNNING"
-        
-        while not self.stop_event.is_set():
-            # 1. Watchdog
-            if time.time() - self.last_activity > Config.STUCK_TIMEOUT:
-                self.status = "STUCK REFRESH"
-                try:
-                    self.browser.driver.execute_script("location.reload()")
-                    time.sleep(3)
-                    self.last_activity = time.time()
-                except:
-                    pass
-                self.status = "RUNNING"
-
-            # 2. Logic Step
+        url = Config.PUZZLE_URL if self.game_type == "PUZZLE" else Config.MEMORY_URL
+        if Config.NETWORK_FILTER:
+            self._collect_net(force=True) # whatever the previous browser/page still holds
             try:
-                # Check "Next"
-                if self._check_puzzle_next():
-                    self.items_solved += 1
-                    self.last_activity = time.time()
-                    continue
-                
-                # Check Difficulty
-                if self._select_difficulty():
-                    self.last_activity = time.time()
-                    time.sleep(1)
-                    continue
-
-                # Solve
-                if self.solver.solve():
-                    self.last_activity = time.time()
-                    
+                self.netfilter = attach(self.browser, self.game_type, self.netstats)
             except Exception as e:
-                pass
-                
-            time.sleep(0.1)
+                GlobalLogger.log(f"Worker-{self.worker_id}", f"Network filter not applied: {e}")
+                self.netfilter = None
+        if self.browser.warm_url != url:
+            self.browser.navigate_to(url)
+        self.browser.warm_url = None # Pool already parked it here; only skip the first load
 
-    def _memory_routine(self):
-        self.status = "NAVIGATING"
-        self.browser.navigate_to("https://tarabean.com/memory")
-        
-        self.solver = MemorySolver(self.browser)
-        self.status = "RUNNING"
-        
-        while not self.stop_event.is_set():
-            if time.time() - self.last_activity > Config.STUCK_TIMEOUT:
-                self.browser.driver.execute_script("location.reload()")
-                self.last_activity = time.time()
-                time.sleep(3)
-                continue
-                
+        if self.elements:
+            GlobalLogger.debug(f"Worker-{self.worker_id}", self.elements.summary())
+        self.elements = ElementCache(self.browser.driver)
+        if self.game_type == "PUZZLE":
+            self.solver = PuzzleSolver(self.browser.driver)
+        else:
+            self.solver = MemorySolver(self.browser, self.elements)
+        self.events = PageEvents(self.browser.driver, blocking=not self.tabbed)
+        self.nudged = False
+
+        page = self.events.wait_for_phase(set(self.ROUTES), Config.PAGE_LOAD_TIMEOUT, self.stop_event)
+        phase = PageEvents.phase(page) if page is not None else probe_state(self.browser.driver)
+        self._progress()
+        return self._route(phase) or "RECOVER"
+
+    def _state_select_difficulty(self):
+        self.status = "SELECTING"
+        page, phase = self._page()
+        if phase != GamePhase.DIFFICULTY_SELECT:
+            return self._leave(phase)
+
+        if self._select_difficulty(page.get("difficulty") if page else None):
+            self._progress()
+            page = self.events.wait_for_phase({GamePhase.PLAYING, GamePhase.LEVEL_COMPLETE}, 5, self.stop_event)
+            return self._route(PageEvents.phase(page))
+
+        self._wait_for_change()
+        return None
+
+    def _state_solve(self):
+        page, phase = self._page()
+        if phase != GamePhase.PLAYING:
+            return self._leave(phase)
+
+        if self.game_type == "PUZZLE":
+            self.status = "RUNNING"
+            if "board" in PageEvents.types(page):
+                self.solver.reset() # board replaced under us: the model is for another board
+            if self.solver.solve(phase):
+                self._progress()
+                self.nudged = False
+                return None
+            # Board done: hover once so "Go next" can show up
+            if not self.nudged:
+                self._hover_board()
+                self.nudged = True
+        else:
+            self.status = "SCANNING"
+            if self.solver.solve_level():
+                self.status = "MATCHING"
+                self._progress()
+                return None
+
+        self._wait_for_change()
+        return None
+
+    def _state_advance(self):
+        page, phase = self._page()
+
+        if phase == GamePhase.LEVEL_COMPLETE:
+            self.status = "WAITING"
+            if self.game_type == "PUZZLE":
+                clicked = (page and page.get("go_next") and self._click(page["go_next"])) or self._check_puzzle_next()
+            else:
+                clicked = self.solver.wait_for_next_level(phase)
+            if clicked:
+                self._new_level()
+                self._collect_net()
+                self.items_solved += 1
+                self.escalation = 0
+                self.metrics.inc("levels_solved_total", level=self.picked_difficulty or self.difficulty)
+                self.nudged = False
+                self._progress()
+                page = self.events.wait_for_phase({GamePhase.PLAYING, GamePhase.DIFFICULTY_SELECT}, 10, self.stop_event)
+                return self._route(PageEvents.phase(page))
+
+        elif phase == GamePhase.GAME_OVER:
+            self.status = "RESTARTING"
+            self._new_level()
+            self._restart_game()
+            self._progress()
+            page = self.events.wait_for_phase({GamePhase.PLAYING, GamePhase.DIFFICULTY_SELECT}, 10, self.stop_event)
+            return self._route(PageEvents.phase(page))
+
+        else:
+            return self._leave(phase)
+
+        self._wait_for_change()
+        return None
+
+    def _new_level(self):
+        if self.game_type == "PUZZLE" and self.solver:
+            self.solver.reset()
+        if self.elements:
+            # Per-level widgets: don't keep a hidden leftover from the level we just left
+            self.elements.invalidate("go_next")
+            self.elements.invalidate("dialog_buttons")
+
+    def _collect_net(self, force=False):
+        # In tab mode the performance log is per Chrome, so counts land on whichever session drains it
+        if self.netfilter and self.netfilter.driver is self.browser.driver:
+            self.netfilter.collect(force)
+
+    def _state_recover(self):
+        self.status = "STUCK REFRESH"
+        self.recoveries += 1
+        self.metrics.inc("stuck_reloads_total")
+        name = f"Worker-{self.worker_id}"
+        if self.pooled:
+            # A parked browser is as cheap as a reload: skip the in-place steps
+            self.escalation = len(self.RECOVERY_LADDER) - 1
+        if self.tabbed and not self.browser.healthy():
+            # Shared Chrome died under us: move this session to a fresh host
+            GlobalLogger.log(name, f"Recovering (#{self.recoveries}), shared browser is gone.")
+            self.browser.mark_dead()
+            self.escalation = len(self.RECOVERY_LADDER) - 1
+
+        url = Config.PUZZLE_URL if self.game_type == "PUZZLE" else Config.MEMORY_URL
+        while True:
+            step = self.RECOVERY_LADDER[min(self.escalation, len(self.RECOVERY_LADDER) - 1)]
+            self.escalation += 1
+            self.metrics.inc("recovery_steps_total", step=step)
+            GlobalLogger.log(name, f"Recovering (#{self.recoveries}), {step.replace('_', ' ')}.")
+            if step == "restart":
+                return self._restart_browser()
             try:
-                # A. Move
-                self.status = "SCANNING"
-                if self.solver.solve_level():
-                    self.status = "MATCHING"
-                    self.last_activity = time.time()
-                    
-                # B. Next Level
-                self.status = "WAITING"
-                if self.solver.wait_for_next_level():
-                    self.items_solved += 1 
-                    self.last_activity = time.time()
-                    time.sleep(2)
-                    
-                # C. Game Over
-                if self.solver.is_game_over():
-                    self.status = "RESTARTING"
-                    try:
-                         # Try to find replay button first
-                         btns = self.browser.driver.find_elements(By.XPATH, "//div[@role='dialog']//button")
-                         if btns: btns[0].click()
-                         else: self.browser.driver.refresh()
-                    except: 
-                        self.browser.driver.refresh()
-                    self.last_activity = time.time()
-                    time.sleep(2)
-                    
-            except:
-                pass
-            time.sleep(0.5)
+                with deadline(Config.RELOAD_DEADLINE):
+                    if step == "new_window":
+                        self.browser.reopen_window() # NAVIGATE loads it (and filters the new target)
+                    else:
+                        self.browser.navigate_to(url)
+                        self.browser.warm_url = url # NAVIGATE only rebuilds the solvers
+                return "NAVIGATE"
+            except Exception as e:
+                GlobalLogger.log(name, f"{step} failed: {str(e)[:80]}")
+
+    def _restart_browser(self):
+        # Pooled: swap in a parked browser; the pool resets (or discards) this one in the background
+        self._release_browser()
+        self.metrics.inc("browser_restarts_total")
+        if not self._acquire_browser():
+            self.pacer.sleep(self.acquire_backoff.next(), self.stop_event)
+            return None
+        self.acquire_backoff.reset()
+        self.escalation = 0
+        return "NAVIGATE"
+
+    def _restart_game(self):
+        def click_first(btns):
+            if not btns: return False
+            btns[0].click()
+            return True
+        try:
+             # Try to find replay button first
+             if not self.elements.use("dialog_buttons", click_first):
+                 self.browser.driver.refresh()
+        except: 
+            self.browser.driver.refresh()
+
+    def _click(self, element):
+        try:
+            self.browser.driver.execute_script("arguments[0].click();", element)
+            return True
+        except:
+            return False
+
+    def _hover_board(self):
+        # Hover trick
+        def hover(containers):
+            ActionChains(self.browser.driver)\
+                .move_to_element(containers[0])\
+                .move_by_offset(10, 0)\
+                .move_by_offset(-10, 0)\
+                .perform()
+            return True
+        try:
+            self.elements.use("board", hover)
+        except: pass
+
+    def _click_visible(self, btns):
+        for btn in btns:
+            if btn.is_displayed():
+                self.browser.driver.execute_script("arguments[0].click();", btn)
+                return True
+        return False
 
     def _check_puzzle_next(self):
         try:
-             # Hover trick
-             try:
-                 container = self.browser.driver.find_element(By.XPATH, "//div[contains(@style, 'background-position')]")
-                 actions = ActionChains(self.browser.driver)
-                 actions.move_to_element(container).perform()
-                 actions.move_by_offset(10, 0).perform()
-                 actions.move_by_offset(-10, 0).perform()
-             except: pass
-
-             xpath = "//*[contains(text(), 'Go next')]"
-             btns = self.browser.driver.find_elements(By.XPATH, xpath)
-             for btn in btns:
-                 if btn.is_displayed():
-                     self.browser.driver.execute_script("arguments[0].click();", btn)
-                     return True
+             self._hover_board()
+             return self.elements.use("go_next", self._click_visible)
         except: pass
         return False
         
-    def _select_difficulty(self):
+    def _select_difficulty(self, visible_buttons=None):
+        """
+        visible_buttons: [label, element] pairs from the event channel snapshot.
+        Without it we fall back to one XPath query per keyword.
+        """
         difficulty_keywords = {
             "Easy": ["easy"],
             "Normal": ["normal", "medium", "regular"], 
@@ -204,13 +435,16 @@ class GameWorker:
 
         for diff_name in target_list:
             keywords = difficulty_keywords.get(diff_name, [diff_name.lower()])
+            if visible_buttons is not None:
+                for label, btn in visible_buttons:
+                    if any(kw in label for kw in keywords) and self._click(btn):
+                        self.picked_difficulty = diff_name
+                        return True
+                continue
             for kw in keywords:
                 try:
-                    xpath = f"//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{kw}')]"
-                    btns = self.browser.driver.find_elements(By.XPATH, xpath)
-                    for btn in btns:
-                        if btn.is_displayed():
-                            self.browser.driver.execute_script("arguments[0].click();", btn)
-                            return True
+                    if self.elements.use(f"difficulty:{kw}", self._click_visible):
+                        self.picked_difficulty = diff_name
+                        return True
                 except: pass
         return False
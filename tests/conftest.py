@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.config import Config
+from src.logger import GlobalLogger
+
+
+@pytest.fixture(autouse=True)
+def _log_to_tmp(tmp_path, monkeypatch):
+    # Keep test runs out of the working tree's loginfo.txt; Config.LOG_FILE_PATH is put back afterwards
+    monkeypatch.setattr(Config, "LOG_FILE_PATH", Config.LOG_FILE_PATH)
+    GlobalLogger.setup(str(tmp_path / "loginfo.txt"))
+    yield
+    GlobalLogger.flush_and_stop()
@@ -0,0 +1,103 @@
+import random
+from types import SimpleNamespace
+
+from src.board import BoardModel, decode_grid, fnv1a
+from src.planner import SwapPlan
+
+
+def piece(home, n):
+    col, row = home % n, home // n
+    return SimpleNamespace(element=f"el{home}", target_col=col, target_row=row, bg_position=f"{col}% {row}%")
+
+
+def shuffled_board(n, seed=3):
+    homes = list(range(n * n))
+    random.Random(seed).shuffle(homes)
+    return BoardModel([piece(h, n) for h in homes])
+
+
+class FakeDriver:
+    def __init__(self, result):
+        self.result = result
+
+    def execute_script(self, script, *args):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_targets_use_grid_width():
+    board = BoardModel([piece(h, 3) for h in (8, 0, 4)] + [piece(h, 3) for h in (1, 2, 3, 5, 6, 7)])
+    assert board.cols == 3
+    assert board.targets()[:3] == [8, 0, 4]
+
+
+def test_swaps_move_pieces_with_their_elements():
+    board = shuffled_board(4)
+    a, b = board.pieces[0], board.pieces[5]
+    board.apply_swap(0, 5)
+    assert board.pieces[0] is b and board.pieces[5] is a
+
+
+def test_plan_applied_to_model_solves_it():
+    board = shuffled_board(5)
+    plan = SwapPlan.from_targets(board.targets())
+    while plan:
+        for src, dst in plan.take(7):
+            board.apply_swap(src, dst)
+    assert board.targets() == list(range(25))
+    assert [p.element for p in board.pieces] == [f"el{i}" for i in range(25)]
+
+
+def test_checksum_follows_the_board_order():
+    board = shuffled_board(3)
+    before = board.checksum()
+    assert before == fnv1a("|".join(p.bg_position for p in board.pieces))
+    board.apply_swap(0, 1)
+    assert board.checksum() != before
+    board.apply_swap(0, 1)
+    assert board.checksum() == before
+
+
+def test_matches_compares_page_hash():
+    board = shuffled_board(3)
+    assert board.matches(FakeDriver(board.checksum()))
+    assert not board.matches(FakeDriver(board.checksum() ^ 1))
+    assert not board.matches(FakeDriver(RuntimeError("page gone")))
+
+
+def noisy_scan(n, seed=11, tile=64):
+    """Shuffled n x n board as SCAN_SCRIPT reports it: jittered rects, percentages rounded to 3 or 4 digits."""
+    rng = random.Random(seed)
+    homes = list(range(n * n))
+    rng.shuffle(homes)
+    pct = lambda k: k / (n - 1) * 100 if n > 1 else 0.0
+    xs, ys, bg_x, bg_y = [], [], [], []
+    for slot, home in enumerate(homes):
+        xs.append((slot % n) * (tile + 2) + rng.uniform(-0.4, 0.4))
+        ys.append((slot // n) * (tile + 2) + rng.uniform(-0.4, 0.4))
+        digits = rng.choice((3, 4))
+        bg_x.append(round(pct(home % n), digits))
+        bg_y.append(round(pct(home // n), digits))
+    return homes, xs, ys, bg_x, bg_y
+
+
+def test_decode_grid_recovers_noisy_boards():
+    for n in (3, 12, 30):
+        homes, xs, ys, bg_x, bg_y = noisy_scan(n)
+        # hand the pieces over in a scrambled order, decode_grid has to restore the visual one
+        scramble = list(range(n * n))
+        random.Random(n).shuffle(scramble)
+        layout = decode_grid([xs[i] for i in scramble], [ys[i] for i in scramble],
+                             [bg_x[i] for i in scramble], [bg_y[i] for i in scramble], [64] * (n * n))
+        assert layout.exact and (layout.rows, layout.cols) == (n, n)
+        assert [scramble[i] for i in layout.order] == list(range(n * n))
+        targets = (layout.target_row * layout.cols + layout.target_col)[layout.order].tolist()
+        assert targets == homes
+
+
+def test_decode_grid_falls_back_on_odd_piece_counts():
+    homes, xs, ys, bg_x, bg_y = noisy_scan(4)
+    layout = decode_grid(xs[:-1], ys[:-1], bg_x[:-1], bg_y[:-1], [64] * 15)
+    assert not layout.exact
+    assert (layout.rows, layout.cols) == (4, 4)
@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("selenium.webdriver")
+
+from types import SimpleNamespace
+
+from src.input_backend import JSEventBackend
+
+
+class ScriptDriver:
+    def __init__(self):
+        self.args = None
+
+    def execute_async_script(self, script, *args):
+        self.args = args
+        return len(args[0])
+
+
+def test_js_events_waits_the_tuned_drag_pause():
+    driver = ScriptDriver()
+    backend = JSEventBackend(driver)
+    backend.drag_pause = 0.025 # what PuzzleSolver sets from pacing
+    swap = (SimpleNamespace(element="a"), SimpleNamespace(element="b"))
+    assert backend.perform_swaps([swap]) == 1
+    assert driver.args == ([["a", "b"]], 25)
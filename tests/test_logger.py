@@ -0,0 +1,39 @@
+import os
+
+from src.logger import GlobalLogger
+
+
+def read(path):
+    return path.read_text(encoding="utf-8")
+
+
+def test_setup_moves_the_writer_to_the_new_path(tmp_path):
+    first, second = tmp_path / "first.txt", tmp_path / "second.txt"
+    GlobalLogger.setup(str(first))
+    GlobalLogger.log("Test", "to first")
+    GlobalLogger.setup(str(second))
+    GlobalLogger.log("Test", "to second")
+    GlobalLogger.flush_and_stop()
+    assert "to first" in read(first) and "to second" not in read(first)
+    assert "to second" in read(second)
+
+
+def test_log_restarts_a_stopped_writer(tmp_path):
+    path = tmp_path / "log.txt"
+    GlobalLogger.setup(str(path))
+    GlobalLogger.flush_and_stop()
+    assert not GlobalLogger._writer.is_alive()
+    GlobalLogger.log("Test", "after stop")
+    assert GlobalLogger._writer.is_alive()
+    GlobalLogger.flush_and_stop()
+    assert "after stop" in read(path)
+
+
+def test_tests_do_not_write_the_repo_log(tmp_path):
+    repo = os.path.join(os.path.dirname(__file__), "..")
+    logs = {os.path.abspath(os.path.join(base, "loginfo.txt")) for base in (repo, os.getcwd())}
+    before = {p: os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in logs}
+    GlobalLogger.log("Test", "stays in tmp")
+    GlobalLogger.flush_and_stop()
+    assert "stays in tmp" in read(tmp_path / "loginfo.txt")
+    assert {p: os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in logs} == before
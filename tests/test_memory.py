@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip("selenium.common.exceptions")
+
+from types import SimpleNamespace
+
+from src.memory import MemoryCache, MemorySolver, back_images, group_pairs
+
+BACK = "back.png"
+
+
+def board(faces, back=BACK, face_down=()):
+    """Two cards per face; cards listed in face_down only show the back."""
+    slots = []
+    for face in faces:
+        for _ in range(2):
+            idx = len(slots)
+            srcs = [back] if idx in face_down else [back, face]
+            slots.append({"element": idx, "srcs": srcs})
+    return slots
+
+
+def scan(slots, backs_seen=True):
+    return {"slots": slots, "filtered": len(slots), "backs_seen": backs_seen}
+
+
+def test_back_image_and_pairs():
+    slots = board(["a.png", "b.png", "c.png"], face_down={4, 5})
+    assert back_images(slots) == {BACK}
+    assert group_pairs(slots) == {"a.png": [0, 1], "b.png": [2, 3]}
+
+
+def test_group_keys_by_stable_face_id():
+    cache = MemoryCache()
+    first = cache.group(scan(board(["a.png", "b.png", "c.png"])))
+    assert first == {0: [0, 1], 1: [2, 3], 2: [4, 5]}
+    second = cache.group(scan(board(["c.png", "d.png", "a.png"])))
+    assert second == {2: [0, 1], 3: [2, 3], 0: [4, 5]}
+    assert cache.hits["faces"] == 2
+
+
+def test_face_id_overflow_never_merges_pairs():
+    cache = MemoryCache()
+    cache.MAX_FACE_IDS = 4
+    cache.group(scan(board(["a.png", "b.png", "c.png"])))
+    # a is known (id 0), d and e are new: 3 + 2 > 4, so the table is reset once,
+    # before numbering this board; a reset after a was placed would hand e id 0 too
+    pairs = cache.group(scan(board(["a.png", "d.png", "e.png"])))
+    assert sorted(pairs.values()) == [[0, 1], [2, 3], [4, 5]]
+    assert cache.invalidations["faces"] == 1
+    assert set(cache.face_ids) == {"a.png", "d.png", "e.png"}
+
+
+def test_known_backs_dropped_when_page_disagrees():
+    cache = MemoryCache()
+    cache.group(scan(board(["a.png", "b.png", "c.png"])))
+    new_back = "back2.png"
+    pairs = cache.group(scan(board(["a.png", "b.png", "c.png"], back=new_back), backs_seen=False))
+    assert cache.back_srcs == {new_back}
+    assert len(pairs) == 3 and cache.invalidations["backs"] == 1
+
+
+class DialogDriver:
+    """The page clicks one pair, then the level-complete dialog opens."""
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        flip = {"first_ms": 200, "first_via": "transitionend", "second_ms": 200, "second_via": "transitionend"}
+        return {"timings": [flip], "stopped": "dialog"}
+
+
+def test_dialog_mid_plan_is_left_to_advance(monkeypatch):
+    solver = MemorySolver(SimpleNamespace(driver=DialogDriver()), elements=object())
+    monkeypatch.setattr(solver, "wait_for_next_level", lambda *a: pytest.fail("clicked the dialog itself"))
+    # False: the worker waits for the page to change and routes LEVEL_COMPLETE to ADVANCE
+    assert solver._click_pairs_scheduled([[0, 1], [2, 3]]) is False
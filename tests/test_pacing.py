@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from src import pacing
+from src.pacing import AdaptiveDelay, Backoff, Pacer
+
+
+def test_backoff_doubles_to_cap_and_resets():
+    b = Backoff(start=0.05, cap=0.3)
+    assert [b.next() for _ in range(5)] == pytest.approx([0.05, 0.1, 0.2, 0.3, 0.3])
+    b.reset()
+    assert b.next() == pytest.approx(0.05)
+
+
+def test_failure_doubles_within_ceiling():
+    d = AdaptiveDelay(0.04, floor=0.01, ceiling=0.1)
+    d.failure()
+    assert d.value == pytest.approx(0.08)
+    d.failure()
+    assert d.value == pytest.approx(0.1)
+    assert d.failures == 2 and d.failure_rate > 0
+
+
+def test_success_steps_down_to_floor():
+    d = AdaptiveDelay(0.02, floor=0.01, ceiling=0.1, step=0.004)
+    for _ in range(10):
+        d.success()
+    assert d.value == pytest.approx(0.01)
+
+
+def test_success_stays_above_last_failure():
+    d = AdaptiveDelay(0.04, floor=0.001, ceiling=0.1, step=0.005)
+    d.failure() # failed at 40ms
+    for _ in range(50):
+        d.success()
+    assert d.value == pytest.approx(0.04 * AdaptiveDelay.MARGIN)
+
+
+def test_converges_above_a_hidden_limit():
+    # Anything below 6ms fails: the delay should settle just above that, rarely failing
+    limit = 0.006
+    d = AdaptiveDelay(0.01, floor=0.002, ceiling=0.1)
+    failures = 0
+    for _ in range(2000):
+        if d.value < limit:
+            d.failure()
+            failures += 1
+        else:
+            d.success()
+    assert limit <= d.value <= 0.01
+    assert failures < 40
+
+
+def test_measured_follows_the_peak():
+    d = AdaptiveDelay(0.4, floor=0.1, ceiling=0.4)
+    for i in range(200):
+        d.measured(0.31 if i % 10 == 0 else 0.28)
+    # never below what the slow flips really take
+    assert 0.31 <= d.value <= 0.4
+    for _ in range(300):
+        d.measured(0.12)
+    assert d.value == pytest.approx(0.12 * AdaptiveDelay.MARGIN)
+    d.measured(5.0)
+    assert d.value == 0.4 # ceiling
+
+
+def test_measured_keeps_floor():
+    d = AdaptiveDelay(0.4, floor=0.1, ceiling=0.4)
+    d.measured(0.01)
+    assert d.value == pytest.approx(0.1)
+
+
+def test_pacer_learns_per_key():
+    p = Pacer()
+    p.failure("puzzle.drag_pause")
+    assert p.value("puzzle.drag_pause") == pytest.approx(0.02)
+    assert p.value("memory.flip_first") == pytest.approx(0.4)
+
+
+def test_poll_returns_first_truthy_result():
+    pacing.bind(Pacer())
+    results = iter([None, 0, "ready"])
+    assert pacing.poll(lambda: next(results), timeout=1.0, backoff=Backoff(start=0.001, cap=0.002)) == "ready"
+
+
+def test_poll_gives_up_after_timeout():
+    pacing.bind(Pacer())
+    stop = threading.Event()
+    assert pacing.poll(lambda: None, timeout=0.02, backoff=Backoff(start=0.005), stop_event=stop) is None
+    assert pacing.current().idle_time > 0
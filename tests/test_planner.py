@@ -0,0 +1,44 @@
+import random
+
+from src.planner import SwapPlan, build_permutation, count_cycles, plan_swaps
+
+
+def solve(targets, swaps):
+    """Applies swaps the way the board does: the pieces in src and dst trade slots."""
+    board = list(targets)
+    for src, dst in swaps:
+        assert board[src] == dst # each swap sends the piece in src home
+        board[src], board[dst] = board[dst], board[src]
+    return board
+
+
+def test_plan_sorts_board_in_minimum_swaps():
+    rng = random.Random(7)
+    for n in (1, 2, 9, 25, 100):
+        targets = list(range(n))
+        rng.shuffle(targets)
+        swaps = plan_swaps(targets)
+        assert solve(targets, swaps) == list(range(n))
+        assert len(swaps) == n - count_cycles(targets)
+
+
+def test_solved_board_needs_no_swaps():
+    assert plan_swaps([0, 1, 2, 3]) == []
+    assert not SwapPlan.from_targets([0, 1, 2, 3])
+
+
+def test_noisy_targets_become_a_permutation():
+    # duplicate 1 and out-of-range 7 get the free slots 0 and 3, in order
+    assert build_permutation([1, 1, 2, 7]) == [1, 0, 2, 3]
+    assert sorted(build_permutation([5, 5, 5, -1])) == [0, 1, 2, 3]
+
+
+def test_swap_plan_survives_batches():
+    targets = [3, 0, 1, 2, 5, 4]
+    plan = SwapPlan.from_targets(targets)
+    assert plan.total == len(plan) == 4
+    first = plan.take(3)
+    rest = plan.take(3)
+    assert len(first) == 3 and len(rest) == 1
+    assert not plan and plan.take(3) == []
+    assert solve(targets, first + rest) == list(range(6))
@@ -0,0 +1,114 @@
+import pytest
+
+pytest.importorskip("selenium.webdriver")
+
+from types import SimpleNamespace
+
+from src import pacing
+from src.board import CHECKSUM_SCRIPT, BoardModel, fnv1a
+from src.pacing import Pacer
+from src.puzzle import PuzzleSolver
+from src.state import PROBE_SCRIPT, GamePhase
+
+
+class FakeDriver:
+    """Answers the checksum and phase probe; the board scan finds nothing."""
+    def __init__(self, checksum, phase):
+        self.checksum = checksum
+        self.phase = phase
+
+    def execute_script(self, script, *args):
+        if script == CHECKSUM_SCRIPT:
+            return self.checksum
+        if script == PROBE_SCRIPT:
+            return self.phase.value
+        return []
+
+
+def solver_after_batch(driver):
+    solver = PuzzleSolver(driver)
+    piece = SimpleNamespace(element=None, target_col=0, target_row=0, bg_position="0% 0%")
+    solver.board = BoardModel([piece])
+    solver.paced = True # a batch went out since the last checksum
+    return solver
+
+
+@pytest.fixture
+def pacer():
+    p = Pacer()
+    pacing.bind(p)
+    return p
+
+
+def test_mismatch_while_playing_slows_drag_pause(pacer):
+    solver = solver_after_batch(FakeDriver(checksum=-1, phase=GamePhase.PLAYING))
+    solver.solve(GamePhase.PLAYING)
+    assert pacer.delay("puzzle.drag_pause").failures == 1
+
+
+def test_mismatch_after_level_change_is_not_a_pacing_failure(pacer):
+    solver = solver_after_batch(FakeDriver(checksum=-1, phase=GamePhase.LEVEL_COMPLETE))
+    solver.solve(GamePhase.PLAYING)
+    assert pacer.delay("puzzle.drag_pause").failures == 0
+
+
+def test_reset_drops_pending_feedback(pacer):
+    solver = solver_after_batch(FakeDriver(checksum=-1, phase=GamePhase.PLAYING))
+    solver.reset()
+    assert solver.board is None and solver.plan is None and not solver.paced
+    solver.solve(GamePhase.PLAYING) # next level's first turn: nothing to judge
+    assert pacer.delay("puzzle.drag_pause").failures == 0
+
+
+class FakePage:
+    """A 3x3 board whose tile nodes move with their pieces, like the real page."""
+    SCAN = PuzzleSolver.SCAN_SCRIPT
+
+    def __init__(self, order):
+        # order[slot] = home index of the tile shown there
+        self.nodes = [SimpleNamespace(home=h, bg=f"{h % 3 * 50}% {h // 3 * 50}%") for h in order]
+
+    def execute_script(self, script, *args):
+        if script == CHECKSUM_SCRIPT:
+            return fnv1a("|".join(n.bg for n in self.nodes))
+        if script == PROBE_SCRIPT:
+            return GamePhase.PLAYING.value
+        if script == self.SCAN:
+            return [dict(element=n, rect_x=i % 3 * 100, rect_y=i // 3 * 100, rect_h=100, style_bg=n.bg)
+                    for i, n in enumerate(self.nodes)]
+        return []
+
+    def solved(self):
+        return [n.home for n in self.nodes] == list(range(9))
+
+
+class NodeSwapInput:
+    """Drags by element: the two nodes trade places on the page."""
+    def __init__(self, page):
+        self.page = page
+        self.drag_pause = 0.0
+
+    def perform_swaps(self, swaps):
+        nodes = self.page.nodes
+        for src, dst in swaps:
+            a, b = nodes.index(src.element), nodes.index(dst.element)
+            nodes[a], nodes[b] = nodes[b], nodes[a]
+        return len(swaps)
+
+    def report(self):
+        return ""
+
+
+def test_batch_with_cycles_solves_the_page(pacer):
+    # One 3-cycle, one 4-cycle and a fixed point: later swaps of a cycle
+    # have to drag whatever the earlier ones left in their slots
+    page = FakePage([1, 2, 0, 4, 5, 6, 3, 7, 8])
+    solver = PuzzleSolver(page)
+    solver.input = NodeSwapInput(page)
+    solver.BATCH_SIZE = 16
+
+    assert solver.solve(GamePhase.PLAYING)
+    assert page.solved()
+    assert solver.board.matches(page)
+    assert not solver.solve(GamePhase.PLAYING) # nothing left to do, no rescan
+    assert pacer.delay("puzzle.drag_pause").failures == 0
@@ -0,0 +1,173 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.replay import CommandRecorder, ReplayExecutor, load
+
+
+def write_recording(path, commands):
+    """commands: (command, params, value) triples, in order."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "session", "capabilities": {"browserName": "chrome"}}) + "\n")
+        for seq, (command, params, value) in enumerate(commands, 1):
+            f.write(json.dumps({"type": "command", "seq": seq, "t": seq * 0.01, "thread": "MainThread",
+                                "command": command, "params": params, "response": {"value": value},
+                                "seconds": 0.001}) + "\n")
+    return str(path)
+
+
+def test_recorder_writes_what_replay_reads(tmp_path):
+    class Executor:
+        def execute(self, command, params):
+            return {"value": f"{command}:{params.get('script')}"}
+
+    driver = SimpleNamespace(caps={"browserName": "chrome"}, command_executor=Executor())
+    path = str(tmp_path / "rec.jsonl")
+    recorder = CommandRecorder(driver, path)
+    driver.command_executor.execute("executeScript", {"sessionId": "abc", "script": "return 1", "args": []})
+    recorder.mark("level 1")
+    recorder.close()
+
+    caps, commands, marks = load(path)
+    assert caps == {"browserName": "chrome"}
+    assert commands[0]["params"] == {"script": "return 1", "args": []} # session id stripped
+    assert marks[0]["label"] == "level 1"
+    replay = ReplayExecutor(path)
+    assert replay.execute("executeScript", {"sessionId": "xyz", "script": "return 1", "args": []}) == \
+        {"value": "executeScript:return 1"}
+    assert replay.exact == 1 and replay.exhausted
+
+
+def test_exact_params_win_over_earlier_entry(tmp_path):
+    path = write_recording(tmp_path / "r.jsonl", [
+        ("executeScript", {"script": "a"}, 1),
+        ("executeScript", {"script": "b"}, 2),
+    ])
+    replay = ReplayExecutor(path)
+    assert replay.execute("executeScript", {"script": "b"})["value"] == 2
+    assert replay.execute("executeScript", {"script": "a"})["value"] == 1
+    r = replay.report()
+    assert (r["exact"], r["loose"], r["unrecorded"], r["unused"]) == (2, 0, 0, 0)
+
+
+def test_changed_params_are_counted_as_loose(tmp_path):
+    path = write_recording(tmp_path / "r.jsonl", [("executeScript", {"script": "a"}, 1)])
+    replay = ReplayExecutor(path)
+    assert replay.execute("executeScript", {"script": "changed"})["value"] == 1
+    assert replay.report()["loose"] == 1
+
+
+def test_extra_calls_are_unrecorded_and_get_last_response(tmp_path):
+    path = write_recording(tmp_path / "r.jsonl", [("findElements", {"using": "xpath", "value": "//b"}, ["e1"])])
+    replay = ReplayExecutor(path)
+    replay.execute("findElements", {"using": "xpath", "value": "//b"})
+    assert replay.execute("findElements", {"using": "xpath", "value": "//b"})["value"] == ["e1"]
+    assert replay.execute("getTitle", {}) == {"value": None}
+    r = replay.report()
+    assert r["unrecorded"] == 2
+    assert r["unrecorded_by_command"] == {"findElements": 1, "getTitle": 1}
+
+
+def test_matching_looks_only_window_entries_ahead(tmp_path):
+    path = write_recording(tmp_path / "r.jsonl", [("getTitle", {}, i) for i in range(5)] +
+                           [("executeScript", {"script": "late"}, "late")])
+    replay = ReplayExecutor(path, window=3)
+    replay.execute("executeScript", {"script": "late"})
+    assert replay.report()["unrecorded"] == 1 # 5 entries ahead, outside the window
+    for i in range(5):
+        assert replay.execute("getTitle", {})["value"] == i
+    assert replay.execute("executeScript", {"script": "late"})["value"] == "late"
+    assert replay.exhausted
+
+
+def test_new_session_is_answered_from_capabilities(tmp_path):
+    path = write_recording(tmp_path / "r.jsonl", [])
+    replay = ReplayExecutor(path)
+    assert replay.execute("newSession", {})["value"]["capabilities"] == {"browserName": "chrome"}
+    assert replay.report()["calls"] == 0
+
+
+def test_responses_are_fresh_copies(tmp_path):
+    path = write_recording(tmp_path / "r.jsonl", [("executeScript", {}, {"a": 1})] * 2)
+    replay = ReplayExecutor(path)
+    first = replay.execute("executeScript", {})
+    first["value"]["a"] = 99 # selenium unwraps responses in place
+    assert replay.execute("executeScript", {})["value"] == {"a": 1}
+
+
+class CommandDriver:
+    """Just enough of WebDriver for ElementCache: every call is one executor command."""
+    def __init__(self, executor):
+        self.caps = {"browserName": "chrome"}
+        self.command_executor = executor
+
+    def find_elements(self, by, value):
+        return self.command_executor.execute("findElements", {"using": by, "value": value})["value"]
+
+    def execute_script(self, script, *args):
+        return self.command_executor.execute("executeScript", {"script": script, "args": list(args)})["value"]
+
+
+class GoNextPage:
+    """The "Go next" button gets re-rendered after the first click: the old handle goes stale."""
+    def __init__(self):
+        self.button = "btn-1"
+        self.clicks = []
+
+    def execute(self, command, params):
+        from selenium.common.exceptions import StaleElementReferenceException
+        if command == "findElements":
+            return {"value": [self.button]}
+        handle = params["args"][0][0]
+        if handle != self.button:
+            raise StaleElementReferenceException("stale element reference: node is detached")
+        self.clicks.append(handle)
+        self.button = "btn-2"
+        return {"value": True}
+
+
+def click_go_next(driver):
+    from src.elements import ElementCache
+    cache = ElementCache(driver)
+    click = lambda btns: driver.execute_script("arguments[0].click();", btns)
+    return [cache.use("go_next", click) for _ in range(2)], cache.stats["go_next"]
+
+
+def test_stale_handle_sequence_replays_the_same_way(tmp_path):
+    pytest.importorskip("selenium.common.exceptions")
+    path = str(tmp_path / "rec.jsonl")
+    page = GoNextPage()
+    driver = CommandDriver(page)
+    recorder = CommandRecorder(driver, path)
+    live = click_go_next(driver)
+    recorder.close()
+    assert page.clicks == ["btn-1", "btn-2"]
+    assert live == ([True, True], [1, 2, 1]) # hit, misses, stale
+
+    replay = ReplayExecutor(path)
+    # The stale error comes back as StaleElementReferenceException, so the cache retries as it did live
+    assert click_go_next(CommandDriver(replay)) == live
+    r = replay.report()
+    assert (r["exact"], r["loose"], r["unrecorded"], r["unused"]) == (r["recorded"], 0, 0, 0)
+
+
+def test_replay_raises_the_recorded_exception_type(tmp_path):
+    exceptions = pytest.importorskip("selenium.common.exceptions")
+    path = tmp_path / "r.jsonl"
+    entries = [
+        {"command": "executeScript", "error": "TimeoutException: script timed out",
+         "error_type": "TimeoutException", "error_msg": "script timed out"},
+        {"command": "executeScript", "error": "StaleElementReferenceException: gone"}, # before error_type
+        {"command": "executeScript", "error": "CommandTimeout: executeScript got no answer within 30s",
+         "error_type": "CommandTimeout"},
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        for seq, entry in enumerate(entries, 1):
+            f.write(json.dumps(dict(entry, type="command", seq=seq, params={})) + "\n")
+    replay = ReplayExecutor(str(path))
+    for expected in (exceptions.TimeoutException, exceptions.StaleElementReferenceException,
+                     exceptions.WebDriverException):
+        with pytest.raises(exceptions.WebDriverException) as err:
+            replay.execute("executeScript", {})
+        assert type(err.value) is expected